@@ -0,0 +1,150 @@
+"""Render time of the DOCX reports: python-docx object model (Document() and
+add_row().cells, as the routes used to do) versus the cached template renderer,
+the PDF renderer (in-process, without the pool), and the server-side evolution
+chart with and without its cache.
+
+Usage: python -m backend.benchmarks.reports [--rows 1000] [--repeat 5]
+"""
+import argparse
+import io
+import os
+import time
+from datetime import date, timedelta
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend.commands.migrate import migrate
+from backend.core import ownership
+from backend.models.users import User
+from backend.models.classes import Class
+from backend.models.students import Student
+from backend.models.payments import Payment
+from backend.models.attendance import AttendanceSession, AttendanceLog
+from backend.crud import students as student_crud
+from backend.crud import payments as payment_crud
+from backend.reports import charts, documents
+from backend.reports.docx_renderer import render_docx
+from backend.reports.pdf_renderer import render_pdf
+from backend.reports.layout import Heading, Image, Paragraph, Table
+
+def seed(rows: int):
+    """rows students (half paid), rows sessions; student 1 attends every session and session 1 has every student."""
+    engine = create_engine("sqlite://")
+    migrate(bind=engine)
+    db = sessionmaker(bind=engine)()
+    owner = User(email="bench@example.com", hashed_password="-")
+    db.add(owner)
+    db.flush()
+    course = Class(name="Turma A", schedule="Segunda 18:30", owner_id=owner.id)
+    students = [
+        Student(name=f"Aluno {i:05d}", parent_name=f"Responsável {i}", school_year="3º ano", class_type="Online", owner_id=owner.id)
+        for i in range(rows)
+    ]
+    db.add(course)
+    db.add_all(students)
+    db.flush()
+    sessions = [
+        AttendanceSession(class_id=course.id, date=date(2026, 1, 1) + timedelta(days=i), description=f"Aula {i + 1:02d}", lesson_number=i + 1, owner_id=owner.id)
+        for i in range(rows)
+    ]
+    db.add_all(sessions)
+    db.flush()
+    db.add_all([
+        AttendanceLog(session_id=s.id, student_id=students[0].id, status="present" if i % 4 else "absent", grade=7.5, observation="Participou bem", owner_id=owner.id)
+        for i, s in enumerate(sessions)
+    ])
+    db.add_all([
+        AttendanceLog(session_id=sessions[0].id, student_id=s.id, status="present", grade=8.0 if i % 3 else None, owner_id=owner.id)
+        for i, s in enumerate(students[1:])
+    ])
+    db.add_all([Payment(owner_id=owner.id, student_id=s.id, month=1, year=2026, status="PAID", amount=150.0) for s in students[::2]])
+    db.commit()
+    return db, owner.id, students[0].id, sessions[0].id
+
+def render_python_docx(blocks) -> bytes:
+    from docx import Document
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.shared import Inches
+
+    document = Document()
+    for block in blocks:
+        if isinstance(block, Heading):
+            paragraph = document.add_heading(block.text, block.level)
+        elif isinstance(block, Paragraph):
+            paragraph = document.add_paragraph()
+            for value, bold in block.runs:
+                paragraph.add_run(value).bold = bold
+        elif isinstance(block, Table):
+            table = document.add_table(rows=1, cols=len(block.header))
+            if block.grid:
+                table.style = 'Table Grid'
+            for cell, value in zip(table.rows[0].cells, block.header):
+                cell.text = value
+                cell.paragraphs[0].runs[0].bold = block.bold_header
+            for values in block.rows:
+                for cell, value in zip(table.add_row().cells, values):
+                    cell.text = value
+            continue
+        elif isinstance(block, Image):
+            document.add_picture(io.BytesIO(block.data), width=Inches(block.width_inches))
+            paragraph = document.paragraphs[-1]
+        if block.center:
+            paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    output = io.BytesIO()
+    document.save(output)
+    return output.getvalue()
+
+def content(data: bytes):
+    """Paragraph and table text as python-docx reads it back, to check both outputs match."""
+    from docx import Document
+    document = Document(io.BytesIO(data))
+    return (
+        [(p.style.name, p.text) for p in document.paragraphs],
+        [[[cell.text for cell in row.cells] for row in table.rows] for table in document.tables],
+        len(document.inline_shapes),
+    )
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark DOCX report rendering.")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    db, owner_id, student_id, session_id = seed(args.rows)
+    def student_blocks():
+        stats = student_crud.get_student_report_stats(db, student_id=student_id)
+        chart = charts.evolution_chart(student_id, [(log.session.date, log.grade) for log in stats["logs"]])
+        return documents.student_report(stats, chart=chart)[0]
+
+    builders = (
+        ("student", student_blocks),
+        ("session", lambda: documents.session_report(ownership.owned_session(db, session_id, owner_id, with_logs=True))[0]),
+        ("financial", lambda: documents.financial_report(payment_crud.get_monthly_report_rows(db, owner_id, 2026, 1, limit=args.rows), 1, 2026)[0]),
+    )
+
+    print(f"{args.rows} table rows per report, best of {args.repeat}")
+    for label, build in builders:
+        blocks = build()
+        assert content(render_docx(blocks)) == content(render_python_docx(blocks)), label
+        baseline = timed(lambda: render_python_docx(build()), args.repeat)
+        rendered = timed(lambda: render_docx(build()), args.repeat)
+        pdf = timed(lambda: render_pdf(build()), args.repeat)
+        print(f"  {label:<10} python-docx {baseline * 1000:8.1f} ms | template renderer {rendered * 1000:7.1f} ms | {baseline / rendered:5.1f}x | pdf {pdf * 1000:7.1f} ms")
+
+    points = [(point["date"], point["grade"]) for point in student_crud.get_student_evolution(db, student_id=student_id, limit=args.rows)]
+    render = timed(lambda: charts.render_evolution_chart(points), args.repeat)
+    cached = timed(lambda: charts.evolution_chart(student_id, points), args.repeat)
+    print(f"  evolution chart ({len(points)} points) render {render * 1000:.1f} ms | cached {cached * 1000:.3f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Per-row cost of the list endpoints: ORM + response_model validation + stdlib json
+versus plain column rows + orjson (FAST_JSON_LISTS).
+
+Usage: python -m backend.benchmarks.serialization [--rows 1000] [--repeat 20]
+"""
+import argparse
+import json
+import os
+import time
+from typing import List
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend.core.serialization import dumps
+from backend.commands.migrate import migrate
+from backend.models.users import User
+from backend.models.students import Student
+from backend.models.payments import Payment
+from backend.schemas import students as student_schemas
+from backend.schemas import payments as payment_schemas
+from backend.crud import students as student_crud
+from backend.crud import payments as payment_crud
+
+def seed(rows: int):
+    engine = create_engine("sqlite://")
+    migrate(bind=engine)
+    db = sessionmaker(bind=engine)()
+    owner = User(email="bench@example.com", hashed_password="-")
+    db.add(owner)
+    db.flush()
+    students = [
+        Student(
+            name=f"Aluno {i:05d}", phone="11999990000", parent_name=f"Responsável {i}",
+            parent_phone="11988880000", parent_email=f"parent{i}@example.com",
+            school_year="3º ano", class_type="Online", owner_id=owner.id
+        )
+        for i in range(rows)
+    ]
+    db.add_all(students)
+    db.flush()
+    db.add_all([Payment(owner_id=owner.id, student_id=s.id, month=1, year=2026, status="PAID", amount=150.0) for s in students])
+    db.commit()
+    return db, owner.id
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark list endpoint serialization paths.")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    db, owner_id = seed(args.rows)
+    student_adapter = TypeAdapter(List[student_schemas.Student])
+    payment_adapter = TypeAdapter(List[payment_schemas.Payment])
+
+    def students_orm():
+        db.expunge_all()
+        objs = student_crud.get_students(db, user_id=owner_id, limit=args.rows)
+        return json.dumps(jsonable_encoder(student_adapter.validate_python(objs, from_attributes=True))).encode()
+
+    def students_fast():
+        return dumps(student_crud.get_student_rows(db, user_id=owner_id, limit=args.rows))
+
+    def payments_orm():
+        db.expunge_all()
+        objs = payment_crud.get_payments(db, user_id=owner_id, year=2026, month=1, limit=args.rows)
+        return json.dumps(jsonable_encoder(payment_adapter.validate_python(objs, from_attributes=True))).encode()
+
+    def payments_fast():
+        return dumps(payment_crud.get_payment_rows(db, user_id=owner_id, year=2026, month=1, limit=args.rows))
+
+    assert json.loads(students_orm()) == json.loads(students_fast())
+    assert json.loads(payments_orm()) == json.loads(payments_fast())
+
+    print(f"{args.rows} rows, best of {args.repeat}")
+    for label, orm, fast in (("/students/", students_orm, students_fast), ("/payments/", payments_orm, payments_fast)):
+        orm_time, fast_time = timed(orm, args.repeat), timed(fast, args.repeat)
+        print(f"  {label:<11} orm+pydantic+json {orm_time / args.rows * 1e6:7.2f} us/row | "
+              f"columns+orjson {fast_time / args.rows * 1e6:7.2f} us/row | {orm_time / fast_time:4.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Measure cold import time of the ASGI app, i.e. what every worker pays at boot.
+
+Usage: python -m backend.benchmarks.startup [--runs 10]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+PROBE = (
+    "import sys, time\n"
+    "start = time.perf_counter()\n"
+    "import backend.server\n"
+    "elapsed = (time.perf_counter() - start) * 1000\n"
+    "print(f'{elapsed:.3f} {int(\"docx\" in sys.modules)}')\n"
+)
+
+def measure(runs: int):
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env = dict(os.environ)
+    env.setdefault("SECRET_KEY", "benchmark")
+    env["PYTHONPATH"] = root + os.pathsep + env.get("PYTHONPATH", "")
+
+    timings = []
+    docx_loaded = False
+    for _ in range(runs):
+        # Fresh interpreter each time: module caches must not hide the real cost
+        out = subprocess.run([sys.executable, "-c", PROBE], env=env, cwd=root, capture_output=True, text=True, check=True)
+        elapsed, docx_flag = out.stdout.strip().splitlines()[-1].split()
+        timings.append(float(elapsed))
+        docx_loaded = docx_loaded or docx_flag == "1"
+    return timings, docx_loaded
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark 'import backend.server' in fresh interpreters.")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    timings, docx_loaded = measure(args.runs)
+    print(f"import backend.server over {args.runs} runs")
+    print(f"  median {statistics.median(timings):.1f} ms | min {min(timings):.1f} ms | max {max(timings):.1f} ms")
+    print(f"  python-docx imported at startup: {'yes' if docx_loaded else 'no'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Fill the denormalized owner_id of payments, attendance sessions and logs.
+
+Run after `migrate` added the columns, and again after any import that wrote
+rows without them (it only touches rows where owner_id is NULL):
+    python -m backend.commands.backfill_owners
+"""
+from sqlalchemy import select, update
+from backend.core import database
+from backend.models import users, classes, students, enrollments, attendance, payments, schedules, billing, sync
+
+def _fill(connection, model, owner_source):
+    # updated_at kept as is: a backfilled row is not a change clients need to sync
+    result = connection.execute(
+        update(model)
+        .where(model.owner_id.is_(None))
+        .values(owner_id=owner_source.scalar_subquery(), updated_at=model.updated_at)
+    )
+    return result.rowcount
+
+def backfill(bind=None):
+    engine = bind or database.engine
+    Payment = payments.Payment
+    AttendanceSession, AttendanceLog = attendance.AttendanceSession, attendance.AttendanceLog
+    with engine.begin() as connection:
+        # Sessions before logs: logs copy the owner from their (now filled) session
+        return {
+            "payments": _fill(connection, Payment, select(students.Student.owner_id).where(students.Student.id == Payment.student_id)),
+            "attendance_sessions": _fill(connection, AttendanceSession, select(classes.Class.owner_id).where(classes.Class.id == AttendanceSession.class_id)),
+            "attendance_logs": _fill(connection, AttendanceLog, select(AttendanceSession.owner_id).where(AttendanceSession.id == AttendanceLog.session_id)),
+        }
+
+def main():
+    totals = {}
+    for engine in database.tenant_engines():
+        for table, count in backfill(engine).items():
+            totals[table] = totals.get(table, 0) + count
+    for table, count in totals.items():
+        print(f"Backfilled owner_id on {count} {table} rows")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""Open a billing month for every owner.
+
+Usage: python -m backend.commands.billing --year 2026 --month 3 [--owner-id 1] [--default-amount 150]
+"""
+import argparse
+from datetime import date
+from backend.core import database
+from backend.models import users, classes, students, enrollments, attendance, payments, schedules, billing, sync
+from backend.crud import billing as billing_crud
+
+def main(argv=None):
+    today = date.today()
+    parser = argparse.ArgumentParser(description="Create missing PENDING payments for a month.")
+    parser.add_argument("--year", type=int, default=today.year)
+    parser.add_argument("--month", type=int, default=today.month, choices=range(1, 13))
+    parser.add_argument("--owner-id", type=int, default=None, help="Bill a single owner (default: all owners)")
+    parser.add_argument("--default-amount", type=float, default=0.0, help="Amount used when no billing rate matches")
+    args = parser.parse_args(argv)
+
+    created = 0
+    for db in database.tenant_sessions():
+        created += billing_crud.generate_monthly_payments(
+            db, year=args.year, month=args.month, user_id=args.owner_id, default_amount=args.default_amount
+        )
+    print(f"Billing {args.month:02d}/{args.year}: {created} payments created")
+
+if __name__ == "__main__":
+    main()
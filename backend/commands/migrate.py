@@ -0,0 +1,83 @@
+"""Create missing tables, columns and indexes.
+
+Run once per deploy, before starting the server:
+    python -m backend.commands.migrate
+
+create_all only creates whole tables, so columns and indexes added to
+existing models later are applied here with ALTER TABLE / CREATE INDEX.
+New columns are added as nullable without defaults.
+In sharded SQLite mode the catalog and every owner file are migrated.
+"""
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import DBAPIError
+from backend.core import database
+# All models must be imported so their tables are registered on Base.metadata
+from backend.models import users, classes, students, enrollments, attendance, payments, schedules, billing, sync
+
+def _add_missing_columns(connection, tables):
+    inspector = inspect(connection)
+    preparer = connection.dialect.identifier_preparer
+    added = []
+    for table in tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=connection.dialect)
+            connection.execute(text(
+                f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {preparer.format_column(column)} {column_type}"
+            ))
+            added.append(f"{table.name}.{column.name}")
+    return added
+
+def _create_missing_indexes(connection, tables):
+    inspector = inspect(connection)
+    created, skipped = [], []
+    for table in tables:
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            try:
+                # Savepoint: a unique index rejected by existing duplicates must not abort the rest
+                with connection.begin_nested():
+                    index.create(bind=connection)
+                created.append(index.name)
+            except DBAPIError as e:
+                skipped.append((index.name, str(e.orig)))
+    return created, skipped
+
+def migrate(bind=None, tables=None):
+    engine = bind or database.engine
+    tables = tables or database.Base.metadata.sorted_tables
+    database.Base.metadata.create_all(bind=engine, tables=tables)
+    with engine.begin() as connection:
+        added = _add_missing_columns(connection, tables)
+        created, skipped = _create_missing_indexes(connection, tables)
+        # Not an Index on the model: FTS5 table + triggers on SQLite, expression GIN index on PostgreSQL
+        if attendance.AttendanceLog.__table__ in tables and attendance.create_observation_index(connection):
+            created.append("observation search index")
+    return added, created, skipped
+
+def _targets():
+    if not database.SHARDED:
+        return [("", database.engine, None)]
+    shards = [(f"shard {owner_id}", database.get_shard_engine(owner_id), database.shard_tables()) for owner_id in database.shard_owner_ids()]
+    return [("catalog", database.engine, database.catalog_tables())] + shards
+
+def main():
+    for label, engine, tables in _targets():
+        prefix = f"[{label}] " if label else ""
+        added, created, skipped = migrate(engine, tables)
+        for name in added:
+            print(f"{prefix}Added column {name}")
+        for name in created:
+            print(f"{prefix}Created index {name}")
+        for name, reason in skipped:
+            print(f"{prefix}Skipped index {name} (fix the existing rows and rerun): {reason}")
+    print(f"Schema up to date ({len(database.Base.metadata.tables)} tables)")
+
+if __name__ == "__main__":
+    main()
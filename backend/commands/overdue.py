@@ -0,0 +1,25 @@
+"""Mark overdue payments as LATE.
+
+Usage: python -m backend.commands.overdue [--due-day 10]
+"""
+import argparse
+from backend.core import database
+from backend.core.config import settings
+from backend.models import users, classes, students, enrollments, attendance, payments, schedules, billing, sync
+from backend.crud import payments as payment_crud
+
+def run(due_day: int = None) -> int:
+    return sum(
+        payment_crud.mark_overdue_payments(db, due_day=due_day or settings.PAYMENT_DUE_DAY)
+        for db in database.tenant_sessions()
+    )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Flip PENDING payments past their due day to LATE.")
+    parser.add_argument("--due-day", type=int, default=settings.PAYMENT_DUE_DAY)
+    args = parser.parse_args(argv)
+    updated = run(due_day=args.due_day)
+    print(f"Overdue check: {updated} payments marked as LATE")
+
+if __name__ == "__main__":
+    main()
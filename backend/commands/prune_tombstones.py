@@ -0,0 +1,26 @@
+"""Delete sync tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS.
+
+Usage: python -m backend.commands.prune_tombstones [--days 30]
+"""
+import argparse
+from datetime import timedelta
+from backend.core import database
+from backend.core.config import settings
+from backend.models import users, classes, students, enrollments, attendance, payments, schedules, billing, sync
+from backend.crud import sync as sync_crud
+
+def run(days: int = None) -> int:
+    retention = timedelta(days=days) if days else sync_crud.tombstone_retention()
+    if retention is None:
+        return 0
+    return sum(sync_crud.prune_tombstones(db, retention) for db in database.tenant_sessions())
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Delete tombstones no sync client can still need.")
+    parser.add_argument("--days", type=int, default=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+    args = parser.parse_args(argv)
+    deleted = run(days=args.days)
+    print(f"Tombstone pruning: {deleted} tombstones deleted")
+
+if __name__ == "__main__":
+    main()
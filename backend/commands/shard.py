@@ -0,0 +1,107 @@
+"""Split a single SQLite database into the sharded layout.
+
+Usage: python -m backend.commands.shard --source /app/db/student_management.db --target /app/db/shards
+
+Users go to <target>/catalog.db and each owner's rows to <target>/owner_<id>.db,
+keeping their ids. A copy of the source is migrated and backfilled first so
+every tenant row carries its owner_id; the source file itself is only read.
+Stop the server while it runs, then start it with DB_SHARD_DIR=<target>.
+"""
+import argparse
+import os
+import pathlib
+import sqlite3
+import tempfile
+from sqlalchemy import func, select
+from backend.core import database
+from backend.models import users, classes, students, enrollments, attendance, payments, schedules, billing, sync
+from backend.commands.migrate import migrate
+from backend.commands.backfill_owners import backfill
+
+def _owner_rows(table, owner_id: int):
+    if "owner_id" in table.c:
+        return select(table).where(table.c.owner_id == owner_id)
+    if "class_id" in table.c:
+        # Enrollments and schedules belong to the owner of their class
+        owned_classes = select(classes.Class.id).where(classes.Class.owner_id == owner_id)
+        return select(table).where(table.c.class_id.in_(owned_classes))
+    raise ValueError(f"Don't know how to find the owner of {table.name} rows")
+
+def _copy(source, target, table, query, batch_size: int) -> int:
+    copied = 0
+    result = source.execute(query)
+    with target.begin() as connection:
+        while rows := result.fetchmany(batch_size):
+            connection.execute(table.insert(), [row._asdict() for row in rows])
+            copied += len(rows)
+    return copied
+
+def _snapshot(source_path: str, copy_path: str):
+    # Read-only connection: not even the journal mode of the source is changed
+    source = sqlite3.connect(pathlib.Path(source_path).resolve().as_uri() + "?mode=ro", uri=True)
+    copy = sqlite3.connect(copy_path)
+    try:
+        source.backup(copy)
+    finally:
+        copy.close()
+        source.close()
+
+def split(source_path: str, target_dir: str, batch_size: int = 1000):
+    if os.path.exists(database.catalog_path(target_dir)):
+        raise SystemExit(f"{target_dir} already holds a catalog; remove it or pick another directory")
+    os.makedirs(target_dir, exist_ok=True)
+
+    # Next to the shards rather than in /tmp: the copy is as large as the source
+    with tempfile.TemporaryDirectory(dir=target_dir) as work_dir:
+        work_path = os.path.join(work_dir, "source.db")
+        _snapshot(source_path, work_path)
+        return _split(work_path, target_dir, batch_size)
+
+def _split(work_path: str, target_dir: str, batch_size: int):
+    source_engine = database.sqlite_engine(work_path)
+    migrate(source_engine)
+    backfill(source_engine)
+
+    catalog = database.sqlite_engine(database.catalog_path(target_dir))
+    database.Base.metadata.create_all(bind=catalog, tables=database.catalog_tables())
+    copied = {table.name: 0 for table in database.Base.metadata.sorted_tables}
+    with source_engine.connect() as source:
+        for table in database.catalog_tables():
+            copied[table.name] = _copy(source, catalog, table, select(table), batch_size)
+
+        owner_ids = source.execute(select(users.User.id).order_by(users.User.id)).scalars().all()
+        for owner_id in owner_ids:
+            shard = database.sqlite_engine(database.shard_path(owner_id, target_dir))
+            database.Base.metadata.create_all(bind=shard, tables=database.shard_tables())
+            for table in database.shard_tables():
+                copied[table.name] += _copy(source, shard, table, _owner_rows(table, owner_id), batch_size)
+            shard.dispose()
+
+        # Rows without a resolvable owner stay behind; report them instead of guessing
+        left_behind = {}
+        for table in database.shard_tables():
+            total = source.execute(select(func.count()).select_from(table)).scalar()
+            if total != copied[table.name]:
+                left_behind[table.name] = total - copied[table.name]
+    catalog.dispose()
+    source_engine.dispose()
+    return owner_ids, copied, left_behind
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Split a single SQLite database into one file per owner.")
+    parser.add_argument("--source", default=database.DB_PATH, help="Single-file database (default: DB_PATH)")
+    parser.add_argument("--target", default=database.DB_SHARD_DIR, help="Shard directory (default: DB_SHARD_DIR)")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+    if not args.source or not args.target:
+        parser.error("--source and --target are required when DB_PATH / DB_SHARD_DIR are not set")
+
+    owner_ids, copied, left_behind = split(args.source, args.target, batch_size=args.batch_size)
+    for table, count in copied.items():
+        print(f"Copied {count} {table} rows")
+    for table, count in left_behind.items():
+        print(f"Left behind {count} {table} rows without an owner")
+    print(f"Sharded {len(owner_ids)} owners into {args.target}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from backend.core.config import settings
+
+class OwnerCache:
+    """Small per-process TTL cache keyed by owner.
+
+    Writers call ``invalidate(owner_id)`` after committing. That only reaches the
+    cache of their own process: with several server workers the others keep
+    serving their entry until the TTL runs out, so the TTL is the staleness bound
+    across workers. A TTL of 0 turns the cache off.
+    """
+
+    def __init__(self, ttl_seconds: float = 60.0, max_owners: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_owners = max_owners
+        self._entries: Dict[int, Dict[Hashable, Tuple[float, Any]]] = {}
+        # Bumped by every invalidate()/clear(); a compute that overlapped one is not stored
+        self._generations: Dict[int, int] = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    def _generation(self, owner_id: int):
+        return self._epoch, self._generations.get(owner_id, 0)
+
+    def get_or_compute(self, owner_id: int, key: Hashable, compute: Callable[[], Any]) -> Any:
+        if self.ttl_seconds <= 0:
+            return compute()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(owner_id, {}).get(key)
+            if entry and entry[0] > now:
+                return entry[1]
+            generation = self._generation(owner_id)
+
+        value = compute()
+
+        with self._lock:
+            if self._generation(owner_id) != generation:
+                # Invalidated while computing: the value may predate the write
+                return value
+            if owner_id not in self._entries and len(self._entries) >= self.max_owners:
+                # Drop the oldest owner (dicts keep insertion order)
+                self._entries.pop(next(iter(self._entries)))
+            self._entries.setdefault(owner_id, {})[key] = (now + self.ttl_seconds, value)
+        return value
+
+    def invalidate(self, owner_id: Optional[int]):
+        if owner_id is None:
+            return
+        with self._lock:
+            self._entries.pop(owner_id, None)
+            self._generations[owner_id] = self._generations.get(owner_id, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+            self._epoch += 1
+
+class LRUCache:
+    """Small per-process LRU cache for values whose key already identifies the data
+    they were derived from, so entries never go stale and need no invalidation."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        value = compute()
+
+        with self._lock:
+            self._entries[key] = value
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+# Dashboard aggregates; invalidated by the crud write paths
+dashboard_cache = OwnerCache(ttl_seconds=settings.DASHBOARD_CACHE_TTL_SECONDS)
@@ -8,6 +8,16 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     PROJECT_NAME: str = "Student Management System"
+    PAYMENT_DUE_DAY: int = 10 # Unpaid charges become LATE after this day of their month
+    OVERDUE_CHECK_INTERVAL_MINUTES: int = 60 # 0 disables the in-process overdue job
+    SYNC_TOMBSTONE_RETENTION_DAYS: int = 30 # Deletions kept for /sync; older tokens get a full snapshot. 0 keeps them forever
+    ROUTER_DISCOVERY: bool = False # Scan backend/routers instead of using the registry
+    FAST_JSON_LISTS: bool = False # List endpoints select plain columns and encode with orjson
+    REPORT_PDF_WORKERS: int = 2 # PDF render processes per server worker; 0 renders in the request thread
+    REPORT_QUEUE_TIMEOUT: int = 30 # Seconds a PDF request waits for a free render slot before a 503
+    DASHBOARD_CACHE_TTL_SECONDS: int = 10 # Dashboard/analytics results per worker; other workers see a write after this; 0 disables
+    IDEMPOTENCY_TTL_SECONDS: int = 3600 # How long a response is replayed for a repeated Idempotency-Key
+    IDEMPOTENCY_MAX_KEYS: int = 10000 # Stored responses per server worker; the oldest are evicted first
 
     model_config = SettingsConfigDict(
         env_file=os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), ".env"),
@@ -1,8 +1,15 @@
-from sqlalchemy import create_engine
+from fastapi import Depends, Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.sql.dml import UpdateBase
+from sqlalchemy.sql.elements import TextClause
 
+import glob
 import os
+import re
+import threading
 
 POSTGRES_USER = os.getenv("POSTGRES_USER", "postgres")
 POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD", "postgres")
@@ -10,16 +17,226 @@ POSTGRES_SERVER = os.getenv("POSTGRES_SERVER", "db")
 POSTGRES_PORT = os.getenv("POSTGRES_PORT", "5432")
 POSTGRES_DB = os.getenv("POSTGRES_DB", "student_management")
 
-DATABASE_URL = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}:{POSTGRES_PORT}/{POSTGRES_DB}"
+# SQLite deployments: DB_PATH is a single shared file; DB_SHARD_DIR keeps a small
+# catalog (users) plus one file per owner, so teachers never wait on each other's locks
+DB_PATH = os.getenv("DB_PATH")
+DB_SHARD_DIR = os.getenv("DB_SHARD_DIR")
+SHARDED = bool(DB_SHARD_DIR)
+# Single-writer mode: per SQLite file, one dedicated writer connection that sessions
+# take turns on (the pool is the write queue) plus a pool of WAL reader connections
+SQLITE_SINGLE_WRITER = os.getenv("SQLITE_SINGLE_WRITER", "").lower() in ("1", "true", "yes")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_WRITE_QUEUE_TIMEOUT = float(os.getenv("SQLITE_WRITE_QUEUE_TIMEOUT", "30"))
+# Optional read replica (any SQLAlchemy URL) for routes that opt in with `use_replica`.
+# A client that wrote in the last REPLICA_STICKY_SECONDS keeps reading from the primary.
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "10"))
+PRIMARY_COOKIE = "db_primary"
 
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Tables that live in the catalog when sharded; everything else is per owner
+CATALOG_TABLES = {"users"}
+
+def catalog_path(shard_dir: str) -> str:
+    return os.path.join(shard_dir, "catalog.db")
+
+def shard_path(owner_id: int, shard_dir: str = None) -> str:
+    return os.path.join(shard_dir or DB_SHARD_DIR, f"owner_{owner_id}.db")
+
+def _sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    # WAL: readers never block the writer nor wait for it; NORMAL skips the fsync per
+    # commit (WAL checkpoints still sync), which is what group commit would buy us
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.close()
+
+def _writer_connect(dbapi_connection, connection_record):
+    # Let SQLAlchemy issue BEGIN itself (see _begin_immediate) instead of pysqlite
+    dbapi_connection.isolation_level = None
+
+def _begin_immediate(connection):
+    # Take the write lock when the transaction starts, not on its first write, so a
+    # writer from another process makes us wait in busy_timeout instead of failing
+    connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+def sqlite_engine(path: str, writer: bool = False):
+    # Requests run in FastAPI's threadpool, so connections cross threads
+    options = {"connect_args": {"check_same_thread": False}}
+    if writer:
+        options.update(pool_size=1, max_overflow=0, pool_timeout=SQLITE_WRITE_QUEUE_TIMEOUT)
+    sqlite = create_engine(f"sqlite:///{path}", **options)
+    event.listen(sqlite, "connect", _sqlite_pragmas)
+    if writer:
+        event.listen(sqlite, "connect", _writer_connect)
+        event.listen(sqlite, "begin", _begin_immediate)
+    return sqlite
+
+def _sqlite_engines(path: str):
+    """(writer, reader) for a SQLite file; the same engine twice unless in single-writer mode."""
+    if not SQLITE_SINGLE_WRITER:
+        return (sqlite_engine(path),) * 2
+    return sqlite_engine(path, writer=True), sqlite_engine(path)
+
+if SHARDED:
+    os.makedirs(DB_SHARD_DIR, exist_ok=True)
+    DATABASE_URL = f"sqlite:///{catalog_path(DB_SHARD_DIR)}"
+elif DB_PATH:
+    DATABASE_URL = f"sqlite:///{DB_PATH}"
+else:
+    DATABASE_URL = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}:{POSTGRES_PORT}/{POSTGRES_DB}"
+
+# `engine` always takes writes (migrations, commands); `read_engine` serves plain reads
+if DATABASE_URL.startswith("sqlite"):
+    engine, read_engine = _sqlite_engines(DATABASE_URL[len("sqlite:///"):])
+else:
+    engine = read_engine = create_engine(DATABASE_URL)
+
+# Not with shards: each owner file is already its own small primary
+if DATABASE_REPLICA_URL and not SHARDED:
+    if DATABASE_REPLICA_URL.startswith("sqlite"):
+        replica_engine = sqlite_engine(DATABASE_REPLICA_URL[len("sqlite:///"):])
+    else:
+        replica_engine = create_engine(DATABASE_REPLICA_URL)
+else:
+    replica_engine = None
 
 Base = declarative_base()
 
+def catalog_tables():
+    return [table for table in Base.metadata.sorted_tables if table.name in CATALOG_TABLES]
+
+def shard_tables():
+    return [table for table in Base.metadata.sorted_tables if table.name not in CATALOG_TABLES]
+
+_shard_engines = {}
+_shard_lock = threading.Lock()
+
+def _shard_engine_pair(owner_id: int):
+    with _shard_lock:
+        pair = _shard_engines.get(owner_id)
+        if pair is None:
+            pair = _sqlite_engines(shard_path(owner_id))
+            # A new teacher's file is created on first use; existing ones are upgraded by `migrate`
+            Base.metadata.create_all(bind=pair[0], tables=shard_tables())
+            _shard_engines[owner_id] = pair
+        return pair
+
+def get_shard_engine(owner_id: int):
+    return _shard_engine_pair(owner_id)[0]
+
+def shard_owner_ids():
+    ids = []
+    for path in glob.glob(shard_path("*")):
+        match = re.search(r"owner_(\d+)\.db$", path)
+        if match:
+            ids.append(int(match.group(1)))
+    return sorted(ids)
+
+def tenant_engines():
+    """Every database holding tenant data: the shards, or the single shared database."""
+    if not SHARDED:
+        return [engine]
+    return [get_shard_engine(owner_id) for owner_id in shard_owner_ids()]
+
+def dispose_engines(close: bool = True):
+    engines = {engine, read_engine} | ({replica_engine} if replica_engine is not None else set())
+    for pair in list(_shard_engines.values()):
+        engines.update(pair)
+    for pooled in engines:
+        pooled.dispose(close=close)
+
+class SingleWriterSession(Session):
+    """Sends writes to the writer engine and plain reads to the reader engine.
+
+    Once a transaction has written through a writer it keeps using it until
+    commit/rollback, so it reads its own changes and holds the single writer
+    connection for as short a time as the crud function takes to commit.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._writers = set()
+
+    def _engine_pair(self, mapper):
+        return engine, read_engine
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        writer, reader = self._engine_pair(mapper)
+        if writer is reader:
+            return writer
+        if self._flushing or isinstance(clause, (UpdateBase, TextClause)):
+            self._writers.add(writer)
+        return writer if writer in self._writers else reader
+
+@event.listens_for(SingleWriterSession, "after_transaction_end")
+def _release_writers(session, transaction):
+    if transaction.parent is None:
+        session._writers.clear()
+
+class ReplicaSession(SingleWriterSession):
+    """Reads go to the replica once the request opted in (see `use_replica`); writes never do."""
+
+    def _engine_pair(self, mapper):
+        writer, reader = super()._engine_pair(mapper)
+        return (writer, replica_engine) if self.info.get("replica") else (writer, reader)
+
+class TenantSession(SingleWriterSession):
+    """Routes ``users`` to the catalog and every other table to the bound owner's shard."""
+
+    def _engine_pair(self, mapper):
+        if mapper is not None and mapper.local_table.name in CATALOG_TABLES:
+            return engine, read_engine
+        owner_id = self.info.get("owner_id")
+        if owner_id is None:
+            raise RuntimeError("Tenant data accessed before a user was bound to the session")
+        return _shard_engine_pair(owner_id)
+
+def bind_tenant(db: Session, owner_id: int):
+    # Called once the user is authenticated; a no-op for unsharded sessions
+    db.info["owner_id"] = owner_id
+
+if SHARDED:
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, class_=TenantSession)
+elif replica_engine is not None:
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, class_=ReplicaSession)
+elif read_engine is not engine:
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, class_=SingleWriterSession)
+else:
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def dialect_insert(db: Session):
+    """``insert`` of the session's dialect, for ON CONFLICT DO NOTHING / DO UPDATE."""
+    return {"postgresql": postgresql.insert, "sqlite": sqlite.insert}[db.get_bind().dialect.name]
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+def use_replica(request: Request, db: Session = Depends(get_db)):
+    """get_db for read-only routes: their reads are served by the replica when one is
+    configured, unless this client wrote recently and must see its own changes."""
+    if replica_engine is not None and PRIMARY_COOKIE not in request.cookies:
+        db.info["replica"] = True
+    return db
+
+async def stick_to_primary_after_write(request: Request, call_next):
+    # Middleware, installed only when a replica is configured
+    response = await call_next(request)
+    if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+        response.set_cookie(PRIMARY_COOKIE, "1", max_age=REPLICA_STICKY_SECONDS, httponly=True, samesite="lax")
+    return response
+
+def tenant_sessions():
+    """Yield one session per tenant database, for jobs that span every owner."""
+    for owner_id in (shard_owner_ids() if SHARDED else [None]):
+        db = SessionLocal()
+        if owner_id is not None:
+            bind_tenant(db, owner_id)
+        try:
+            yield db
+        finally:
+            db.close()
@@ -0,0 +1,121 @@
+"""Idempotency-Key support for retried writes.
+
+A client that may resend a request (flaky network) sends the same random
+``Idempotency-Key`` header on every attempt. The first attempt runs normally
+and its response is kept; later attempts with the same key and the same
+request get that response back (with ``Idempotent-Replayed: true``) without
+touching the database. Keys are scoped by the Authorization header, so two
+users can never see each other's responses.
+
+- same key, different method/path/body: 422
+- same key while the first attempt is still running: 409, retry later
+- 5xx responses (and bodies over MAX_STORED_BODY) are not kept, so the
+  request can be retried for real
+
+The store lives in the worker process (bounded, TTL-evicted): a retry that a
+load balancer sends to another worker is not deduplicated.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+from backend.core.config import settings
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+MAX_STORED_BODY = 1024 * 1024
+METHODS = ("POST", "PUT", "PATCH", "DELETE")
+
+# Stored response: status, raw headers, body
+StoredResponse = Tuple[int, list, bytes]
+
+class IdempotencyStore:
+    """Bounded LRU of key -> (expires, request fingerprint, response or None while running)."""
+
+    def __init__(self, ttl_seconds: float, max_keys: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_keys = max_keys
+        self._entries: "OrderedDict[str, Tuple[float, str, Optional[StoredResponse]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def begin(self, key: str, fingerprint: str):
+        """Claim ``key`` for a new attempt; returns ("new", None), ("replay", response),
+        ("running", None) or ("mismatch", None)."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                if entry[1] != fingerprint:
+                    return "mismatch", None
+                if entry[2] is None:
+                    return "running", None
+                return "replay", entry[2]
+            self._entries[key] = (now + self.ttl_seconds, fingerprint, None)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_keys:
+                self._entries.popitem(last=False)
+            return "new", None
+
+    def finish(self, key: str, fingerprint: str, response: StoredResponse):
+        with self._lock:
+            if key in self._entries:
+                self._entries[key] = (time.monotonic() + self.ttl_seconds, fingerprint, response)
+
+    def abandon(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+store = IdempotencyStore(settings.IDEMPOTENCY_TTL_SECONDS, settings.IDEMPOTENCY_MAX_KEYS)
+
+def _digest(*parts: bytes) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+def _response(status_code: int, raw_headers: list, body: bytes) -> Response:
+    # Raw headers as sent the first time (repeated ones like set-cookie included)
+    response = Response(content=body, status_code=status_code)
+    response.raw_headers = raw_headers
+    return response
+
+async def idempotency_middleware(request: Request, call_next):
+    idempotency_key = request.headers.get(HEADER)
+    if idempotency_key is None or request.method not in METHODS:
+        return await call_next(request)
+    if not idempotency_key or len(idempotency_key) > MAX_KEY_LENGTH:
+        return JSONResponse({"detail": f"Invalid {HEADER} header"}, status_code=400)
+
+    key = _digest(request.headers.get("Authorization", "").encode(), idempotency_key.encode())
+    # The body is cached on the request, so the endpoint can still read it
+    fingerprint = _digest(request.method.encode(), request.url.path.encode(), request.url.query.encode(), await request.body())
+
+    state, stored = store.begin(key, fingerprint)
+    if state == "replay":
+        status_code, raw_headers, body = stored
+        return _response(status_code, raw_headers + [(b"idempotent-replayed", b"true")], body)
+    if state == "running":
+        return JSONResponse({"detail": "A request with this Idempotency-Key is still being processed"}, status_code=409)
+    if state == "mismatch":
+        return JSONResponse({"detail": "Idempotency-Key was already used for a different request"}, status_code=422)
+
+    try:
+        response = await call_next(request)
+        body = b"".join([chunk async for chunk in response.body_iterator])
+    except BaseException:
+        store.abandon(key)
+        raise
+
+    if response.status_code >= 500 or len(body) > MAX_STORED_BODY:
+        store.abandon(key)
+    else:
+        store.finish(key, fingerprint, (response.status_code, list(response.raw_headers), body))
+    return _response(response.status_code, list(response.raw_headers), body)
@@ -0,0 +1,57 @@
+"""Route dependencies that load a resource and check it belongs to the current user.
+
+Each resolver is a single query that also brings back the owner, so a route pays
+one round trip for lookup plus authorization. FastAPI caches dependency results
+per request, so routes and sub-dependencies sharing a resolver reuse the same
+instance, and because it stays in the Session identity map, crud functions that
+fetch it again with ``db.get`` do not hit the database a second time.
+
+Missing rows answer 404 and rows owned by someone else 403.
+"""
+from fastapi import Depends, HTTPException
+from sqlalchemy.orm import Session
+from backend.core import database, security
+from backend.crud import attendance as attendance_crud
+from backend.crud import classes as class_crud
+from backend.crud import payments as payment_crud
+from backend.crud import students as student_crud
+from backend.schemas import users as user_schemas
+
+def _authorize(resource, owner_id, user_id: int, name: str):
+    if resource is None:
+        raise HTTPException(status_code=404, detail=f"{name} not found")
+    if owner_id != user_id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    return resource
+
+def owned_class(db: Session, class_id: int, user_id: int):
+    db_class = class_crud.get_class(db, class_id=class_id)
+    return _authorize(db_class, db_class and db_class.owner_id, user_id, "Class")
+
+def owned_student(db: Session, student_id: int, user_id: int):
+    student = student_crud.get_student(db, student_id=student_id)
+    return _authorize(student, student and student.owner_id, user_id, "Student")
+
+def owned_session(db: Session, session_id: int, user_id: int, with_logs: bool = False):
+    session = attendance_crud.get_session_with_class(db, session_id=session_id, with_logs=with_logs)
+    return _authorize(session, session and session.course_class.owner_id, user_id, "Session")
+
+def owned_payment(db: Session, payment_id: int, user_id: int):
+    payment = payment_crud.get_payment_with_student(db, payment_id=payment_id)
+    return _authorize(payment, payment and payment.student.owner_id, user_id, "Payment")
+
+def get_owned_class(class_id: int, db: Session = Depends(database.get_db), current_user: user_schemas.User = Depends(security.get_current_user)):
+    return owned_class(db, class_id, current_user.id)
+
+def get_owned_student(student_id: int, db: Session = Depends(database.get_db), current_user: user_schemas.User = Depends(security.get_current_user)):
+    return owned_student(db, student_id, current_user.id)
+
+def get_owned_session(session_id: int, db: Session = Depends(database.get_db), current_user: user_schemas.User = Depends(security.get_current_user)):
+    return owned_session(db, session_id, current_user.id)
+
+def get_owned_session_with_logs(session_id: int, db: Session = Depends(database.get_db), current_user: user_schemas.User = Depends(security.get_current_user)):
+    # Same single query, plus the roster (logs and their students) for reads and reports
+    return owned_session(db, session_id, current_user.id, with_logs=True)
+
+def get_owned_payment(payment_id: int, db: Session = Depends(database.get_db), current_user: user_schemas.User = Depends(security.get_current_user)):
+    return owned_payment(db, payment_id, current_user.id)
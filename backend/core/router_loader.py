@@ -3,27 +3,49 @@ import importlib
 import traceback
 from fastapi import FastAPI
 
-def include_routers(app: FastAPI):
+# Explicit registry: routers are included in this order without touching the filesystem.
+# Keep in sync with backend/routers/ (tests/test_router_registry.py checks it).
+ROUTER_MODULES = (
+    "auth",
+    "users",
+    "classes",
+    "schedules",
+    "attendance",
+    "students",
+    "payments",
+    "billing",
+    "dashboard",
+    "analytics",
+    "search",
+    "sync",
+)
+
+def discover_router_modules():
     # path to routers directory
     # assumes this file is in backend/ directory
     routers_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "routers")
-    
-    # Iterate over files
-    for filename in os.listdir(routers_dir):
-        if filename.endswith(".py") and filename != "__init__.py":
-            module_name = filename[:-3] # remove .py
+    return sorted(
+        filename[:-3] # remove .py
+        for filename in os.listdir(routers_dir)
+        if filename.endswith(".py") and filename != "__init__.py"
+    )
+
+def include_routers(app: FastAPI, discover: bool = False):
+    # discover=True scans the routers directory instead of using the registry (dev convenience)
+    module_names = discover_router_modules() if discover else ROUTER_MODULES
+
+    for module_name in module_names:
+        try:
+            # Import module
+            # We use absolute import with "backend" package
+            module = importlib.import_module(f"backend.routers.{module_name}")
             
-            try:
-                # Import module
-                # We use absolute import with "backend" package
-                module = importlib.import_module(f"backend.routers.{module_name}")
-                
-                # Check for router object
-                if hasattr(module, "router"):
-                    # Tag with proper case (Capitalize)
-                    tag = module_name.capitalize()
-                    app.include_router(module.router, tags=[tag])
-                    print(f"Included router: {module_name} with tag {tag}")
-            except Exception as e:
-                print(f"Failed to load router {module_name}: {e}")
-                traceback.print_exc()
+            # Check for router object
+            if hasattr(module, "router"):
+                # Tag with proper case (Capitalize)
+                tag = module_name.capitalize()
+                app.include_router(module.router, tags=[tag])
+                print(f"Included router: {module_name} with tag {tag}")
+        except Exception as e:
+            print(f"Failed to load router {module_name}: {e}")
+            traceback.print_exc()
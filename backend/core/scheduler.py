@@ -0,0 +1,62 @@
+import threading
+import traceback
+from typing import Callable, List
+
+class PeriodicJob:
+    """Runs ``func`` every ``interval_seconds`` on a daemon thread until stopped."""
+
+    def __init__(self, name: str, func: Callable[[], object], interval_seconds: float):
+        self.name = name
+        self.func = func
+        self.interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _loop(self):
+        # First run happens right away so a fresh boot catches up immediately
+        while not self._stop.is_set():
+            try:
+                result = self.func()
+                print(f"Job {self.name}: {result}")
+            except Exception as e:
+                print(f"Job {self.name} failed: {e}")
+                traceback.print_exc()
+            self._stop.wait(self.interval_seconds)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name=f"job-{self.name}", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+_jobs: List[PeriodicJob] = []
+# Cleared in the server workers that must not run jobs (see backend/serve.py)
+_enabled = True
+
+def disable_jobs():
+    """Keep ``start_jobs`` from starting anything in this process."""
+    global _enabled
+    _enabled = False
+
+# Tombstones only need to go within days of their retention, so once a day is plenty
+TOMBSTONE_PRUNE_INTERVAL_SECONDS = 24 * 60 * 60
+
+def start_jobs():
+    from backend.core.config import settings
+    from backend.commands import overdue, prune_tombstones
+
+    if _enabled and settings.OVERDUE_CHECK_INTERVAL_MINUTES > 0:
+        _jobs.append(PeriodicJob("overdue-payments", overdue.run, settings.OVERDUE_CHECK_INTERVAL_MINUTES * 60))
+    if _enabled and settings.SYNC_TOMBSTONE_RETENTION_DAYS > 0:
+        _jobs.append(PeriodicJob("prune-tombstones", prune_tombstones.run, TOMBSTONE_PRUNE_INTERVAL_SECONDS))
+    for job in _jobs:
+        job.start()
+
+def stop_jobs():
+    while _jobs:
+        _jobs.pop().stop()
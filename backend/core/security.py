@@ -52,4 +52,6 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
     user = users_crud.get_user_by_email(db, email=token_data.email)
     if user is None:
         raise credentials_exception
+    # From here on the request's session reads this owner's shard (sharded SQLite mode)
+    database.bind_tenant(db, user.id)
     return user
@@ -0,0 +1,44 @@
+import json
+import datetime
+from typing import Any, Optional, Sequence, Tuple
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError: # pragma: no cover - orjson is in requirements, stdlib json is the fallback
+    orjson = None
+
+def _default(value: Any):
+    if isinstance(value, (datetime.date, datetime.datetime, datetime.time)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def pick_columns(fields: Optional[str], columns: Sequence, always: Sequence[str] = ("id",)) -> Tuple:
+    """Resolve a ``fields=a,b,c`` query value to the matching subset of ``columns``.
+
+    Keeps the order of ``columns``; ``always`` keys are included even when not
+    requested. Raises ValueError on unknown names.
+    """
+    by_key = {column.key: column for column in columns}
+    requested = {name.strip() for name in (fields or "").split(",") if name.strip()}
+    unknown = requested - set(by_key)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    wanted = requested | {key for key in always if key in by_key}
+    return tuple(column for column in columns if column.key in wanted)
+
+class FastJSONResponse(Response):
+    """JSON response for plain dicts/lists that were already shaped by the crud layer.
+
+    Skips response_model validation entirely, so only return data whose types
+    come straight from typed columns.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
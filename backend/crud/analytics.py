@@ -0,0 +1,214 @@
+from datetime import date
+from typing import Optional
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+from backend.core.cache import dashboard_cache
+from backend.models.students import Student
+from backend.models.attendance import AttendanceSession, AttendanceLog
+
+# Weights of the at-risk score; each component is scaled to 0..1
+ABSENCE_WEIGHT = 0.5 # 1 - attendance rate over the recent window
+DECLINE_WEIGHT = 0.3 # falling grades, saturating at MAX_DECLINE points per 30 days
+MISSING_ESSAY_WEIGHT = 0.2 # 1 - essay delivery rate
+MAX_DECLINE = 2.0
+
+def _log_arrays(db: Session, user_id: int, since: Optional[date]):
+    """Every log of the owner as parallel NumPy arrays, from one query.
+
+    Read straight off the DBAPI cursor: building SQLAlchemy Row objects costs
+    more than the query itself at a few million logs. Session dates come from a
+    second, small query and are mapped onto the logs by session id.
+    """
+    import numpy as np
+
+    sessions = select(AttendanceSession.id, AttendanceSession.date).where(AttendanceSession.owner_id == user_id)
+    if since:
+        sessions = sessions.where(AttendanceSession.date >= since)
+    session_rows = db.execute(sessions.order_by(AttendanceSession.id)).all()
+    session_ids = np.array([row.id for row in session_rows], dtype=np.int64)
+    session_days = np.array([row.date for row in session_rows], dtype="datetime64[D]").astype(np.int64)
+
+    logs = select(
+        AttendanceLog.student_id,
+        AttendanceLog.session_id,
+        case((AttendanceLog.status == "present", 1), else_=0),
+        case((AttendanceLog.essay_delivered.is_(True), 1), else_=0),
+        func.coalesce(AttendanceLog.grade, -1.0), # Grades are never negative; -1 marks "no grade"
+    ).where(AttendanceLog.owner_id == user_id)
+    if since:
+        logs = logs.where(AttendanceLog.session_id.in_(select(sessions.subquery().c.id)))
+    result = db.connection().execute(logs)
+    try:
+        rows = np.array(result.cursor.fetchall(), dtype=np.float64).reshape(-1, 5)
+    finally:
+        result.close()
+
+    # Logs whose session is outside the window (or missing) are dropped
+    position = np.searchsorted(session_ids, rows[:, 1].astype(np.int64))
+    position = np.minimum(position, max(len(session_ids) - 1, 0))
+    known = (session_ids[position] == rows[:, 1]) if len(session_ids) else np.zeros(len(rows), dtype=bool)
+    rows, position = rows[known], position[known]
+    grade = np.where(rows[:, 4] < 0, np.nan, rows[:, 4])
+    return rows[:, 0].astype(np.int64), session_days[position], rows[:, 2], rows[:, 3], grade
+
+def compute_at_risk_students(db: Session, user_id: int, window: int = 8, since: Optional[date] = None, min_sessions: int = 4, limit: int = 20):
+    import numpy as np
+
+    active = dict(db.execute(
+        select(Student.id, Student.name).where(Student.owner_id == user_id, Student.active.is_(True))
+    ).all())
+    student, day, present, essay, grade = _log_arrays(db, user_id, since)
+    keep = np.isin(student, np.fromiter(active, dtype=np.int64, count=len(active)), kind="table")
+    student, day, present, essay, grade = student[keep], day[keep], present[keep], essay[keep], grade[keep]
+    if not len(student):
+        return []
+
+    # Group by student, oldest session first
+    order = np.lexsort((day, student))
+    student, day, present, essay, grade = student[order], day[order], present[order], essay[order], grade[order]
+    starts = np.flatnonzero(np.r_[True, student[1:] != student[:-1]])
+    ids, count = student[starts], len(starts)
+    group = np.repeat(np.arange(count), np.diff(np.r_[starts, len(student)]))
+    sessions = np.bincount(group, minlength=count)
+
+    # Rolling window: the last `window` logs of each student
+    from_end = np.cumsum(sessions)[group] - np.arange(len(student)) - 1
+    recent = from_end < window
+    recent_sessions = np.bincount(group[recent], minlength=count)
+    recent_attendance = np.bincount(group[recent], weights=present[recent], minlength=count) / recent_sessions
+    attendance = np.bincount(group, weights=present, minlength=count) / sessions
+    essay_rate = np.bincount(group, weights=essay, minlength=count) / sessions
+
+    # Least-squares slope of grade over time, from per-student sums
+    graded = ~np.isnan(grade)
+    g, x, y = group[graded], (day[graded] - day.min()).astype(np.float64), grade[graded]
+    n = np.bincount(g, minlength=count)
+    sx, sy = np.bincount(g, weights=x, minlength=count), np.bincount(g, weights=y, minlength=count)
+    sxy, sxx = np.bincount(g, weights=x * y, minlength=count), np.bincount(g, weights=x * x, minlength=count)
+    denominator = n * sxx - sx * sx
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = np.where(denominator > 0, (n * sxy - sx * sy) / denominator, 0.0) * 30
+        average_grade = np.where(n > 0, sy / n, np.nan)
+
+    score = (
+        ABSENCE_WEIGHT * (1 - recent_attendance)
+        + DECLINE_WEIGHT * np.clip(-slope / MAX_DECLINE, 0, 1)
+        + MISSING_ESSAY_WEIGHT * (1 - essay_rate)
+    )
+    score[sessions < min_sessions] = -1
+    ranked = np.argsort(-score, kind="stable")[:limit]
+    ranked = ranked[score[ranked] >= 0]
+
+    return [
+        {
+            "student_id": int(ids[i]),
+            "name": active[int(ids[i])],
+            "sessions": int(sessions[i]),
+            "attendance_rate": round(float(attendance[i]) * 100, 2),
+            "recent_attendance_rate": round(float(recent_attendance[i]) * 100, 2),
+            "grade_slope": round(float(slope[i]), 3),
+            "average_grade": None if np.isnan(average_grade[i]) else round(float(average_grade[i]), 2),
+            "essay_delivery_rate": round(float(essay_rate[i]) * 100, 2),
+            "risk_score": round(float(score[i]), 4),
+        }
+        for i in ranked
+    ]
+
+def get_at_risk_students(db: Session, user_id: int, window: int = 8, since: Optional[date] = None, min_sessions: int = 4, limit: int = 20):
+    # Shares the dashboard cache: attendance, student and class writes already invalidate it per owner
+    return dashboard_cache.get_or_compute(
+        user_id, ("at-risk", window, since, min_sessions, limit),
+        lambda: compute_at_risk_students(db, user_id, window=window, since=since, min_sessions=min_sessions, limit=limit)
+    )
+
+GRADE_PERCENTILES = (10, 25, 50, 75, 90)
+
+def compute_class_analytics(db: Session, class_id: int, start: Optional[date] = None, end: Optional[date] = None):
+    """Term summary of one class: attendance and essays per session from a GROUP BY,
+    grade distribution from the class's graded logs fetched in one go."""
+    import numpy as np
+
+    period = [AttendanceSession.class_id == class_id]
+    if start:
+        period.append(AttendanceSession.date >= start)
+    if end:
+        period.append(AttendanceSession.date <= end)
+
+    present = func.sum(case((AttendanceLog.status == "present", 1), else_=0))
+    essays = func.sum(case((AttendanceLog.essay_delivered.is_(True), 1), else_=0))
+    per_session = db.execute(
+        select(
+            AttendanceSession.id, AttendanceSession.date, AttendanceSession.description,
+            func.count(AttendanceLog.id), present, essays, func.avg(AttendanceLog.grade)
+        )
+        .outerjoin(AttendanceLog, AttendanceLog.session_id == AttendanceSession.id)
+        .where(*period)
+        .group_by(AttendanceSession.id, AttendanceSession.date, AttendanceSession.description)
+        .order_by(AttendanceSession.date)
+    ).all()
+
+    grades = np.fromiter(db.execute(
+        select(AttendanceLog.grade)
+        .join(AttendanceSession, AttendanceLog.session_id == AttendanceSession.id)
+        .where(*period, AttendanceLog.grade.is_not(None))
+    ).scalars(), dtype=np.float64)
+
+    total = sum(row[3] for row in per_session)
+    total_present = sum(row[4] or 0 for row in per_session)
+    total_essays = sum(row[5] or 0 for row in per_session)
+
+    def rate(part, whole):
+        return round(part / whole * 100, 2) if whole else 0.0
+
+    histogram = []
+    mean = median = std = None
+    percentiles = {}
+    if len(grades):
+        # Whole-point bins over the usual 0-10 scale, widened if a grade falls outside it
+        low, high = min(0, int(np.floor(grades.min()))), max(10, int(np.ceil(grades.max())))
+        counts, edges = np.histogram(grades, bins=np.arange(low, high + 1))
+        histogram = [
+            {"start": float(edges[i]), "end": float(edges[i + 1]), "count": int(counts[i])}
+            for i in range(len(counts))
+        ]
+        mean, median, std = (round(float(value), 2) for value in (grades.mean(), np.median(grades), grades.std()))
+        percentiles = {
+            f"p{p}": round(float(value), 2)
+            for p, value in zip(GRADE_PERCENTILES, np.percentile(grades, GRADE_PERCENTILES))
+        }
+
+    return {
+        "class_id": class_id,
+        "start": start,
+        "end": end,
+        "sessions": len(per_session),
+        "logs": total,
+        "attendance_rate": rate(total_present, total),
+        "essay_delivery_rate": rate(total_essays, total),
+        "graded": len(grades),
+        "grade_mean": mean,
+        "grade_median": median,
+        "grade_std": std,
+        "grade_percentiles": percentiles,
+        "grade_histogram": histogram,
+        "per_session": [
+            {
+                "session_id": session_id,
+                "date": session_date,
+                "description": description,
+                "logs": count,
+                "present": present_count or 0,
+                "attendance_rate": rate(present_count or 0, count),
+                "essay_delivery_rate": rate(essay_count or 0, count),
+                "average_grade": None if average is None else round(average, 2),
+            }
+            for session_id, session_date, description, count, present_count, essay_count, average in per_session
+        ],
+    }
+
+def get_class_analytics(db: Session, owner_id: int, class_id: int, start: Optional[date] = None, end: Optional[date] = None):
+    # One entry per class and period in the owner's dashboard cache, dropped by the next attendance write
+    return dashboard_cache.get_or_compute(
+        owner_id, ("class-analytics", class_id, start, end),
+        lambda: compute_class_analytics(db, class_id, start=start, end=end)
+    )
@@ -1,62 +1,92 @@
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, contains_eager, joinedload
 from backend.models.attendance import AttendanceSession, AttendanceLog
-from backend.schemas.attendance import AttendanceSessionCreate
-
-def create_attendance_session(db: Session, session: AttendanceSessionCreate, class_id: int):
-    # Calculate next lesson number
-    last_session = db.query(AttendanceSession)\
-        .filter(AttendanceSession.class_id == class_id)\
-        .order_by(AttendanceSession.lesson_number.desc())\
-        .first()
-    
-    next_number = (last_session.lesson_number + 1) if last_session else 1
+from backend.models.classes import Class
+from backend.models.enrollments import Enrollment
+from backend.schemas.attendance import AttendanceSessionCreate, AttendanceLogPatch
+from backend.core.cache import dashboard_cache
+from backend.core.database import dialect_insert
+from backend.crud.sync import record_tombstones
+
+def _class_owner(db: Session, class_id: int):
+    return db.query(Class.owner_id).filter(Class.id == class_id).scalar()
+
+def allocate_lesson_numbers(db: Session, class_id: int, count: int = 1) -> int:
+    """Reserve ``count`` consecutive lesson numbers for a class and return the first one.
+
+    A single UPDATE ... RETURNING on the class row: concurrent callers serialize on
+    that row lock, and a rollback of the caller's transaction releases the numbers.
+    Classes created before the counter existed start from their highest lesson_number.
+    """
+    current_max = select(func.max(AttendanceSession.lesson_number))\
+        .where(AttendanceSession.class_id == class_id).scalar_subquery()
+    last = db.execute(
+        update(Class)
+        .where(Class.id == class_id)
+        # updated_at kept as is: the counter is internal, not a change clients need to sync
+        .values(lesson_counter=func.coalesce(Class.lesson_counter, current_max, 0) + count, updated_at=Class.updated_at)
+        .returning(Class.lesson_counter)
+    ).scalar()
+    if last is None:
+        raise ValueError("Class not found.")
+    return last - count + 1
+
+def _check_roster(session: AttendanceSessionCreate):
+    # One log per student (uq_attendance_logs_session_student); caught here so the
+    # date conflict below is the only IntegrityError left
+    student_ids = [log.student_id for log in session.logs]
+    if len(set(student_ids)) != len(student_ids):
+        raise ValueError("A student appears more than once in the roster.")
+
+def create_attendance_session(db: Session, session: AttendanceSessionCreate, class_id: int, owner_id: int):
+    _check_roster(session)
+    next_number = allocate_lesson_numbers(db, class_id)
     
     # Auto-generate description if not provided
     description = session.description
     if not description:
         description = f"Aula {next_number:02d}"
 
-    # Check for duplicate session on same date
-    existing_session = db.query(AttendanceSession).filter(
-        AttendanceSession.class_id == class_id,
-        AttendanceSession.date == session.date
-    ).first()
-    if existing_session:
-        raise ValueError("A session for this date already exists.")
-
-    # Create session
+    # Create session and logs in one transaction; a same-date duplicate is caught by
+    # the (class_id, date) unique index instead of a pre-query
     db_session = AttendanceSession(
+        owner_id=owner_id,
         class_id=class_id,
         date=session.date,
         description=description,
-        lesson_number=next_number
+        lesson_number=next_number,
+        logs=[
+            AttendanceLog(
+                owner_id=owner_id,
+                student_id=log.student_id,
+                status=log.status,
+                essay_delivered=log.essay_delivered,
+                grade=log.grade,
+                observation=log.observation
+            )
+            for log in session.logs
+        ]
     )
     db.add(db_session)
-    db.commit()
-    db.refresh(db_session)
-
-    # Create logs
-    for log in session.logs:
-        db_log = AttendanceLog(
-            session_id=db_session.id,
-            student_id=log.student_id,
-            status=log.status,
-            essay_delivered=log.essay_delivered,
-            grade=log.grade,
-            observation=log.observation
-        )
-        db.add(db_log)
-    
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise ValueError("A session for this date already exists.")
     db.refresh(db_session)
+    dashboard_cache.invalidate(owner_id)
     return db_session
 
 def update_attendance_session(db: Session, session_id: int, session_data: AttendanceSessionCreate):
-    db_session = db.query(AttendanceSession).filter(AttendanceSession.id == session_id).first()
+    db_session = db.get(AttendanceSession, session_id)
     if not db_session:
         return None
+    _check_roster(session_data)
+    owner_id = _class_owner(db, db_session.class_id)
     
     # Update Session Details (Date/Description)
+    db_session.owner_id = owner_id
     db_session.date = session_data.date
     if session_data.description:
         db_session.description = session_data.description
@@ -65,10 +95,13 @@ def update_attendance_session(db: Session, session_id: int, session_data: Attend
     # Strategy: clear old logs and re-create? Or update in place?
     # Re-creating is safer for consistency if students changed, but let's try update/create.
     # Simpler: Delete all logs for this session and recreate them.
+    old_log_ids = [row.id for row in db.query(AttendanceLog.id).filter(AttendanceLog.session_id == session_id)]
     db.query(AttendanceLog).filter(AttendanceLog.session_id == session_id).delete()
+    record_tombstones(db, owner_id, "logs", old_log_ids)
     
     for log in session_data.logs:
         db_log = AttendanceLog(
+            owner_id=owner_id,
             session_id=session_id,
             student_id=log.student_id,
             status=log.status,
@@ -78,19 +111,91 @@ def update_attendance_session(db: Session, session_id: int, session_data: Attend
         )
         db.add(db_log)
         
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # Moved onto a date the class already has a session for: (class_id, date) unique index
+        db.rollback()
+        raise ValueError("A session for this date already exists.")
     db.refresh(db_session)
+    dashboard_cache.invalidate(owner_id)
     return db_session
 
 def get_class_attendance_sessions(db: Session, class_id: int):
     return db.query(AttendanceSession).filter(AttendanceSession.class_id == class_id).order_by(AttendanceSession.date.asc()).all()
 
+def get_session_with_class(db: Session, session_id: int, with_logs: bool = False):
+    # Class comes from the same JOIN, so its owner is known without a second query
+    query = db.query(AttendanceSession).join(AttendanceSession.course_class)\
+        .options(contains_eager(AttendanceSession.course_class))
+    if with_logs:
+        query = query.options(joinedload(AttendanceSession.logs).joinedload(AttendanceLog.student))
+    return query.filter(AttendanceSession.id == session_id).first()
+
 def get_attendance_session(db: Session, session_id: int):
     return db.query(AttendanceSession).options(joinedload(AttendanceSession.logs).joinedload(AttendanceLog.student)).filter(AttendanceSession.id == session_id).first()
 
 def delete_attendance_session(db: Session, session_id: int):
-    db_session = db.query(AttendanceSession).filter(AttendanceSession.id == session_id).first()
+    db_session = db.get(AttendanceSession, session_id)
     if db_session:
+        owner_id = _class_owner(db, db_session.class_id)
+        record_tombstones(db, owner_id, "logs", [log.id for log in db_session.logs])
+        record_tombstones(db, owner_id, "sessions", [db_session.id])
         db.delete(db_session)
         db.commit()
+        dashboard_cache.invalidate(owner_id)
     return db_session
+
+class VersionConflict(ValueError):
+    def __init__(self, current_version):
+        super().__init__("The attendance log was changed by someone else.")
+        self.current_version = current_version
+
+def patch_attendance_log(db: Session, session_id: int, class_id: int, student_id: int, patch: AttendanceLogPatch, owner_id: int):
+    """Change single fields of one student's log without touching the rest of the roster.
+
+    With ``patch.version`` the UPDATE only applies if the row is still at that
+    version (optimistic concurrency), otherwise VersionConflict is raised; None
+    if there is no such log. Without it the log is UPSERTed, so the first mark
+    for a student creates it, as long as they are enrolled in the class.
+    """
+    changes = patch.model_dump(exclude_unset=True, exclude={"version"})
+    row_filter = (AttendanceLog.session_id == session_id, AttendanceLog.student_id == student_id)
+
+    if patch.version is not None:
+        updated = db.query(AttendanceLog).filter(
+            *row_filter,
+            func.coalesce(AttendanceLog.version, 1) == patch.version
+        ).update(
+            {**changes, "version": func.coalesce(AttendanceLog.version, 1) + 1, "owner_id": owner_id},
+            synchronize_session=False
+        )
+        if not updated:
+            db.rollback()
+            current = db.query(AttendanceLog.version).filter(*row_filter).first()
+            if current is None:
+                return None
+            raise VersionConflict(current.version or 1)
+    else:
+        enrolled = db.query(Enrollment.id).filter(Enrollment.class_id == class_id, Enrollment.student_id == student_id).first()
+        # Logs of students who left the class since can still be corrected, but not created
+        if not enrolled and not db.query(AttendanceLog.id).filter(*row_filter).first():
+            raise ValueError("The student is not enrolled in this class.")
+        insert = dialect_insert(db)
+        values = {"status": "present", "essay_delivered": False, **changes}
+        statement = insert(AttendanceLog).values(owner_id=owner_id, session_id=session_id, student_id=student_id, version=1, **values)
+        statement = statement.on_conflict_do_update(
+            index_elements=[AttendanceLog.session_id, AttendanceLog.student_id],
+            set_={
+                **{key: getattr(statement.excluded, key) for key in changes},
+                "version": func.coalesce(AttendanceLog.version, 1) + 1,
+                "owner_id": owner_id,
+                "updated_at": func.now(),
+            }
+        )
+        db.execute(statement)
+
+    db.commit()
+    log = db.query(AttendanceLog).filter(*row_filter).first()
+    dashboard_cache.invalidate(owner_id)
+    return log
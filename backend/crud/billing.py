@@ -0,0 +1,80 @@
+from typing import List, Optional
+from sqlalchemy import select, exists, literal, and_, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased
+from backend.models.billing import BillingRate
+from backend.models.payments import Payment
+from backend.models.students import Student
+from backend.schemas.billing import BillingRateCreate
+from backend.core.cache import dashboard_cache
+from backend.core.database import dialect_insert
+
+def get_billing_rates(db: Session, user_id: int):
+    return db.query(BillingRate).filter(BillingRate.owner_id == user_id).order_by(BillingRate.class_type).all()
+
+def replace_billing_rates(db: Session, user_id: int, rates: List[BillingRateCreate]):
+    # One rate per class_type and a single default: duplicates would bill a student twice
+    class_types = [rate.class_type or None for rate in rates]
+    seen = set()
+    for class_type in class_types:
+        if class_type in seen:
+            if class_type is None:
+                raise ValueError("Only one default rate (without class_type) is allowed.")
+            raise ValueError(f"Duplicate rate for class_type '{class_type}'.")
+        seen.add(class_type)
+
+    db.query(BillingRate).filter(BillingRate.owner_id == user_id).delete(synchronize_session=False)
+    db.add_all([
+        BillingRate(owner_id=user_id, class_type=class_type, amount=rate.amount)
+        for class_type, rate in zip(class_types, rates)
+    ])
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another replace for the same owner committed in between
+        db.rollback()
+        raise ValueError("The billing rates were changed concurrently, try again.")
+    return get_billing_rates(db, user_id)
+
+def generate_monthly_payments(db: Session, year: int, month: int, user_id: Optional[int] = None, default_amount: float = 0.0) -> int:
+    """Create the missing PENDING payments of a month with a single INSERT ... SELECT.
+
+    Amount precedence: rate for the student's class_type, then the owner's
+    default rate, then ``default_amount``. Students that already have a
+    payment for the month are skipped, so running it twice is a no-op; one
+    created concurrently (a POST /payments/ or another run) is skipped by
+    ON CONFLICT on uq_payments_student_period instead of failing the batch.
+    When ``user_id`` is None every owner is billed in the same statement.
+    """
+    type_rate = aliased(BillingRate)
+    owner_rate = aliased(BillingRate)
+    already_billed = exists().where(
+        Payment.student_id == Student.id,
+        Payment.year == year,
+        Payment.month == month
+    )
+
+    source = select(
+        Student.owner_id,
+        Student.id,
+        literal(month),
+        literal(year),
+        literal("PENDING"),
+        func.coalesce(type_rate.amount, owner_rate.amount, default_amount)
+    ).select_from(Student)\
+        .outerjoin(type_rate, and_(type_rate.owner_id == Student.owner_id, type_rate.class_type == Student.class_type))\
+        .outerjoin(owner_rate, and_(owner_rate.owner_id == Student.owner_id, owner_rate.class_type.is_(None)))\
+        .where(Student.active.is_(True), ~already_billed)
+
+    if user_id is not None:
+        source = source.where(Student.owner_id == user_id)
+
+    statement = dialect_insert(db)(Payment).from_select(["owner_id", "student_id", "month", "year", "status", "amount"], source)\
+        .on_conflict_do_nothing(index_elements=[Payment.student_id, Payment.year, Payment.month])
+    result = db.execute(statement)
+    db.commit()
+    if user_id is None:
+        dashboard_cache.clear()
+    else:
+        dashboard_cache.invalidate(user_id)
+    return result.rowcount
@@ -1,6 +1,9 @@
 from sqlalchemy.orm import Session
 from backend.models.classes import Class
+from backend.models.schedules import ClassSchedule
 from backend.schemas.classes import ClassCreate
+from backend.core.cache import dashboard_cache
+from backend.crud.sync import record_tombstones
 
 def get_classes(db: Session, user_id: int, skip: int = 0, limit: int = 100):
     return db.query(Class).filter(Class.owner_id == user_id).offset(skip).limit(limit).all()
@@ -25,7 +28,7 @@ def get_class(db: Session, class_id: int):
     return db.query(Class).filter(Class.id == class_id).first()
 
 def update_class(db: Session, class_id: int, class_data: ClassCreate):
-    db_class = db.query(Class).filter(Class.id == class_id).first()
+    db_class = db.get(Class, class_id)
     if db_class:
         db_class.name = class_data.name
         db_class.schedule = class_data.schedule
@@ -34,8 +37,12 @@ def update_class(db: Session, class_id: int, class_data: ClassCreate):
     return db_class
 
 def delete_class(db: Session, class_id: int):
-    db_class = db.query(Class).filter(Class.id == class_id).first()
+    db_class = db.get(Class, class_id)
     if db_class:
+        owner_id = db_class.owner_id
+        db.query(ClassSchedule).filter(ClassSchedule.class_id == class_id).delete(synchronize_session=False)
+        record_tombstones(db, owner_id, "classes", [class_id])
         db.delete(db_class)
         db.commit()
+        dashboard_cache.invalidate(owner_id)
     return db_class
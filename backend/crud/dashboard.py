@@ -0,0 +1,58 @@
+from datetime import date
+from sqlalchemy import func, case, and_
+from sqlalchemy.orm import Session
+from backend.core.cache import dashboard_cache
+from backend.models.students import Student
+from backend.models.payments import Payment
+from backend.models.attendance import AttendanceSession, AttendanceLog
+
+def _month_bounds(year: int, month: int):
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start, end
+
+def compute_dashboard_stats(db: Session, user_id: int, year: int, month: int):
+    active_students = db.query(func.count(Student.id)).filter(
+        Student.owner_id == user_id,
+        Student.active.is_(True)
+    ).scalar()
+
+    is_paid = Payment.status == "PAID"
+    revenue, paid_active = db.query(
+        func.coalesce(func.sum(case((is_paid, Payment.amount), else_=0.0)), 0.0),
+        func.count(case((and_(is_paid, Student.active.is_(True)), Payment.id)))
+    ).join(Student, Payment.student_id == Student.id).filter(
+        Payment.owner_id == user_id,
+        Payment.year == year,
+        Payment.month == month
+    ).one()
+
+    start, end = _month_bounds(year, month)
+    sessions, total_logs, present_logs = db.query(
+        func.count(func.distinct(AttendanceSession.id)),
+        func.count(AttendanceLog.id),
+        func.count(case((AttendanceLog.status == "present", AttendanceLog.id)))
+    ).select_from(AttendanceSession)\
+        .outerjoin(AttendanceLog, AttendanceLog.session_id == AttendanceSession.id)\
+        .filter(
+            AttendanceSession.owner_id == user_id,
+            AttendanceSession.date >= start,
+            AttendanceSession.date < end
+        ).one()
+
+    return {
+        "year": year,
+        "month": month,
+        "active_students": active_students,
+        "monthly_revenue": round(float(revenue), 2),
+        # Active students without a PAID charge, matching the Payments page
+        "pending_payments": max(active_students - paid_active, 0),
+        "average_attendance": round(present_logs / total_logs * 100, 2) if total_logs else 0.0,
+        "sessions_this_month": sessions,
+    }
+
+def get_dashboard_stats(db: Session, user_id: int, year: int, month: int):
+    return dashboard_cache.get_or_compute(
+        user_id, (year, month),
+        lambda: compute_dashboard_stats(db, user_id=user_id, year=year, month=month)
+    )
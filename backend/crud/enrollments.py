@@ -1,10 +1,20 @@
+from typing import List
+from sqlalchemy import select, literal
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from backend.models.students import Student
 from backend.models.enrollments import Enrollment
+from backend.models.classes import Class
+from backend.core.database import dialect_insert
+from backend.crud.sync import record_tombstones
 
 def get_students_for_class(db: Session, class_id: int):
     return db.query(Student).join(Enrollment).filter(Enrollment.class_id == class_id).all()
 
+def get_student_rows_for_class(db: Session, class_id: int, columns):
+    rows = db.query(*columns).join(Enrollment, Enrollment.student_id == Student.id).filter(Enrollment.class_id == class_id).all()
+    return [row._asdict() for row in rows]
+
 def enroll_student(db: Session, class_id: int, student_id: int):
     existing = db.query(Enrollment).filter(Enrollment.class_id == class_id, Enrollment.student_id == student_id).first()
     if existing:
@@ -12,9 +22,57 @@ def enroll_student(db: Session, class_id: int, student_id: int):
     
     db_enrollment = Enrollment(class_id=class_id, student_id=student_id)
     db.add(db_enrollment)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # Enrolled concurrently (e.g. by a bulk enroll) since the check above
+        db.rollback()
+        return db.query(Enrollment).filter(Enrollment.class_id == class_id, Enrollment.student_id == student_id).first()
     return db_enrollment
 
 def unenroll_student(db: Session, class_id: int, student_id: int):
-    db.query(Enrollment).filter(Enrollment.class_id == class_id, Enrollment.student_id == student_id).delete()
+    _delete_enrollments(db, class_id, [student_id])
+    db.commit()
+
+def _insert_enrollments(db: Session, class_id: int, student_ids: List[int]) -> int:
+    # One INSERT ... SELECT for the whole batch; students already enrolled, including ones
+    # enrolled concurrently, are skipped by the (class_id, student_id) unique index
+    source = select(Student.id, literal(class_id)).where(Student.id.in_(student_ids))
+    statement = dialect_insert(db)(Enrollment).from_select(["student_id", "class_id"], source)\
+        .on_conflict_do_nothing(index_elements=[Enrollment.class_id, Enrollment.student_id])
+    return db.execute(statement).rowcount
+
+def _delete_enrollments(db: Session, class_id: int, student_ids: List[int]) -> int:
+    query = db.query(Enrollment).filter(
+        Enrollment.class_id == class_id,
+        Enrollment.student_id.in_(student_ids)
+    )
+    enrollment_ids = [row.id for row in query.with_entities(Enrollment.id)]
+    if not enrollment_ids:
+        return 0
+    owner_id = db.query(Class.owner_id).filter(Class.id == class_id).scalar()
+    record_tombstones(db, owner_id, "enrollments", enrollment_ids)
+    return db.query(Enrollment).filter(Enrollment.id.in_(enrollment_ids)).delete(synchronize_session=False)
+
+def enroll_students(db: Session, class_id: int, student_ids: List[int]) -> int:
+    if not student_ids:
+        return 0
+    enrolled = _insert_enrollments(db, class_id, student_ids)
+    db.commit()
+    return enrolled
+
+def unenroll_students(db: Session, class_id: int, student_ids: List[int]) -> int:
+    if not student_ids:
+        return 0
+    unenrolled = _delete_enrollments(db, class_id, student_ids)
+    db.commit()
+    return unenrolled
+
+def move_students(db: Session, from_class_id: int, to_class_id: int, student_ids: List[int]):
+    # Both statements share one transaction so a group never ends up half-moved
+    if not student_ids:
+        return 0, 0
+    unenrolled = _delete_enrollments(db, from_class_id, student_ids)
+    enrolled = _insert_enrollments(db, to_class_id, student_ids)
     db.commit()
+    return enrolled, unenrolled
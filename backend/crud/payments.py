@@ -1,12 +1,43 @@
-from sqlalchemy.orm import Session
+from datetime import date
+from sqlalchemy import and_, literal_column
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, contains_eager, selectinload
 from backend.models.payments import Payment
 from backend.schemas.payments import PaymentCreate
+from backend.core.cache import dashboard_cache
 from typing import List, Optional
 
 from backend.models.students import Student
 
-def get_payments(db: Session, user_id: int, student_id: Optional[int] = None, year: Optional[int] = None, month: Optional[int] = None, skip: int = 0, limit: int = 100, search: Optional[str] = None):
-    query = db.query(Payment).join(Student, Payment.student_id == Student.id).filter(Student.owner_id == user_id)
+# Rendered inline (not as a bound parameter) so the planner can match the partial index predicate
+UNPAID = Payment.status != literal_column("'PAID'")
+
+def _overdue_cutoff(today: date, due_day: int) -> int:
+    # Periods as year * 12 + month; anything strictly before the cutoff is past its due date
+    cutoff = today.year * 12 + today.month
+    if today.day > due_day:
+        cutoff += 1
+    return cutoff
+
+def _invalidate_student_owner(db: Session, student_id: int):
+    owner_id = db.query(Student.owner_id).filter(Student.id == student_id).scalar()
+    dashboard_cache.invalidate(owner_id)
+
+PAYMENT_COLUMNS = (
+    Payment.id, Payment.student_id, Payment.month, Payment.year, Payment.status, Payment.amount, Payment.paid_at,
+)
+# Nested "student" object of schemas.payments.Payment (StudentBase)
+PAYMENT_STUDENT_COLUMNS = (
+    Student.name, Student.phone, Student.parent_name, Student.parent_phone, Student.parent_email,
+    Student.school_year, Student.class_type, Student.active,
+)
+
+def _filter_payments(query, user_id: int, student_id: Optional[int], year: Optional[int], month: Optional[int], search: Optional[str], join_student: bool = False):
+    # Tenant filter on the payment's own owner_id; students are only joined for search or
+    # student columns, so a plain listing stays a single-table index range scan
+    if search or join_student:
+        query = query.join(Student, Payment.student_id == Student.id)
+    query = query.filter(Payment.owner_id == user_id)
     
     if student_id:
         query = query.filter(Payment.student_id == student_id)
@@ -17,10 +48,41 @@ def get_payments(db: Session, user_id: int, student_id: Optional[int] = None, ye
     if search:
         query = query.filter(Student.name.ilike(f"%{search}%"))
         
+    return query
+
+def get_payments(db: Session, user_id: int, student_id: Optional[int] = None, year: Optional[int] = None, month: Optional[int] = None, skip: int = 0, limit: int = 100, search: Optional[str] = None):
+    query = _filter_payments(db.query(Payment), user_id, student_id, year, month, search)
+    # The nested student is serialized for every row: take it from the search join, or
+    # load all of them in one extra IN query instead of one lazy load per row
+    query = query.options(contains_eager(Payment.student) if search else selectinload(Payment.student))
     return query.offset(skip).limit(limit).all()
 
-def create_payment(db: Session, payment: PaymentCreate):
+def get_payment_rows(db: Session, user_id: int, student_id: Optional[int] = None, year: Optional[int] = None, month: Optional[int] = None, skip: int = 0, limit: int = 100, search: Optional[str] = None,
+                     payment_columns=PAYMENT_COLUMNS, student_columns=PAYMENT_STUDENT_COLUMNS):
+    # Fast path: one SELECT of plain columns shaped like schemas.payments.Payment.
+    # With no student_columns the nested "student" object is left out entirely.
+    query = _filter_payments(db.query(*payment_columns, *student_columns), user_id, student_id, year, month, search, join_student=bool(student_columns))
+    payment_keys = [column.key for column in payment_columns]
+    student_keys = [column.key for column in student_columns]
+    split = len(payment_keys)
+    result = []
+    for row in query.offset(skip).limit(limit).all():
+        item = dict(zip(payment_keys, row[:split]))
+        if student_keys:
+            item["student"] = dict(zip(student_keys, row[split:]))
+        result.append(item)
+    return result
+
+def get_monthly_report_rows(db: Session, user_id: int, year: int, month: int, limit: int = 1000):
+    # Every student with their payment for the period, if any (one per student by uq_payments_student_period)
+    period = and_(Payment.student_id == Student.id, Payment.year == year, Payment.month == month)
+    return db.query(
+        Student.name, Student.parent_name, Student.school_year, Student.class_type, Payment.status, Payment.amount,
+    ).outerjoin(Payment, period).filter(Student.owner_id == user_id).order_by(Student.id).limit(limit).all()
+
+def create_payment(db: Session, payment: PaymentCreate, user_id: int):
     db_payment = Payment(
+        owner_id=user_id,
         student_id=payment.student_id,
         month=payment.month,
         year=payment.year,
@@ -29,16 +91,46 @@ def create_payment(db: Session, payment: PaymentCreate):
         paid_at=payment.paid_at
     )
     db.add(db_payment)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise ValueError("A payment for this month already exists.")
     db.refresh(db_payment)
+    dashboard_cache.invalidate(user_id)
     return db_payment
 
+def get_payment_with_student(db: Session, payment_id: int):
+    return db.query(Payment).join(Payment.student).options(contains_eager(Payment.student))\
+        .filter(Payment.id == payment_id).first()
+
 def update_payment(db: Session, payment_id: int, payment_data: PaymentCreate):
-    payment = db.query(Payment).filter(Payment.id == payment_id).first()
+    payment = db.get(Payment, payment_id)
     if payment:
         payment.status = payment_data.status
         payment.amount = payment_data.amount
         payment.paid_at = payment_data.paid_at
         db.commit()
         db.refresh(payment)
+        _invalidate_student_owner(db, payment.student_id)
     return payment
+
+def mark_overdue_payments(db: Session, due_day: int, today: Optional[date] = None) -> int:
+    """Flip every PENDING payment past its due day to LATE in a single UPDATE."""
+    cutoff = _overdue_cutoff(today or date.today(), due_day)
+    updated = db.query(Payment).filter(
+        UNPAID,
+        Payment.status == "PENDING",
+        Payment.year * 12 + Payment.month < cutoff
+    ).update({Payment.status: "LATE"}, synchronize_session=False)
+    db.commit()
+    return updated
+
+def get_overdue_payments(db: Session, user_id: int, due_day: int, today: Optional[date] = None, skip: int = 0, limit: int = 100):
+    # Includes PENDING rows the batch job has not flipped yet, so the list never lags the calendar
+    cutoff = _overdue_cutoff(today or date.today(), due_day)
+    return db.query(Payment).join(Student, Payment.student_id == Student.id).filter(
+        Payment.owner_id == user_id,
+        UNPAID,
+        Payment.year * 12 + Payment.month < cutoff
+    ).order_by(Payment.year, Payment.month, Student.name).offset(skip).limit(limit).all()
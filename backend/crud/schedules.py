@@ -0,0 +1,122 @@
+import datetime
+import re
+import unicodedata
+from typing import List, Optional, Tuple
+from sqlalchemy import func, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from backend.models.schedules import ClassSchedule
+from backend.models.attendance import AttendanceSession, AttendanceLog
+from backend.models.enrollments import Enrollment
+from backend.schemas.schedules import ScheduleRuleCreate
+from backend.core.cache import dashboard_cache
+from backend.crud.attendance import allocate_lesson_numbers
+
+# Accent-free prefixes, so "Terça", "terca" and "Ter" all match
+WEEKDAY_NAMES = {
+    "seg": 0, "ter": 1, "qua": 2, "qui": 3, "sex": 4, "sab": 5, "dom": 6,
+    "mon": 0, "tue": 1, "wed": 2, "thu": 3, "fri": 4, "sat": 5, "sun": 6,
+}
+
+TIME_PATTERN = re.compile(r"(\d{1,2})(?::|h)(\d{2})?")
+
+def parse_schedule_text(text: Optional[str]) -> List[Tuple[int, Optional[datetime.time]]]:
+    """Parse free-text schedules such as "Segunda 19:00" or "Ter e Qui 18h30"."""
+    if not text:
+        return []
+    normalized = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode().lower()
+
+    start_time = None
+    match = TIME_PATTERN.search(normalized)
+    if match:
+        hour, minute = int(match.group(1)), int(match.group(2) or 0)
+        if hour < 24 and minute < 60:
+            start_time = datetime.time(hour, minute)
+
+    weekdays = []
+    for word in re.findall(r"[a-z]+", normalized):
+        weekday = WEEKDAY_NAMES.get(word[:3])
+        if weekday is not None and weekday not in weekdays:
+            weekdays.append(weekday)
+    return [(weekday, start_time) for weekday in weekdays]
+
+def expand_dates(weekdays: List[int], start_date: datetime.date, end_date: datetime.date) -> List[datetime.date]:
+    wanted = set(weekdays)
+    dates = []
+    current = start_date
+    while current <= end_date:
+        if current.weekday() in wanted:
+            dates.append(current)
+        current += datetime.timedelta(days=1)
+    return dates
+
+def get_schedule_rules(db: Session, class_id: int):
+    return db.query(ClassSchedule).filter(ClassSchedule.class_id == class_id).order_by(ClassSchedule.weekday).all()
+
+def replace_schedule_rules(db: Session, class_id: int, rules: List[ScheduleRuleCreate]):
+    db.query(ClassSchedule).filter(ClassSchedule.class_id == class_id).delete(synchronize_session=False)
+    db.add_all([ClassSchedule(class_id=class_id, weekday=rule.weekday, start_time=rule.start_time) for rule in rules])
+    db.commit()
+    return get_schedule_rules(db, class_id)
+
+def get_effective_weekdays(db: Session, db_class) -> List[int]:
+    # Structured rules win; fall back to the legacy free-text Class.schedule
+    rules = get_schedule_rules(db, db_class.id)
+    if rules:
+        return [rule.weekday for rule in rules]
+    return [weekday for weekday, _ in parse_schedule_text(db_class.schedule)]
+
+def find_session_conflicts(db: Session, class_id: int, dates: List[datetime.date]) -> List[datetime.date]:
+    if not dates:
+        return []
+    rows = db.query(AttendanceSession.date).filter(
+        AttendanceSession.class_id == class_id,
+        AttendanceSession.date.in_(dates)
+    ).all()
+    return sorted(row.date for row in rows)
+
+def generate_sessions(db: Session, db_class, start_date: datetime.date, end_date: datetime.date, dry_run: bool = False):
+    dates = expand_dates(get_effective_weekdays(db, db_class), start_date, end_date)
+    conflicts = find_session_conflicts(db, db_class.id, dates)
+    conflict_set = set(conflicts)
+    new_dates = [d for d in dates if d not in conflict_set]
+
+    if dry_run:
+        # Preview only: numbers are what the next allocation would hand out
+        first_number = (db_class.lesson_counter or db.query(func.max(AttendanceSession.lesson_number))
+                        .filter(AttendanceSession.class_id == db_class.id).scalar() or 0) + 1
+    elif new_dates:
+        first_number = allocate_lesson_numbers(db, db_class.id, count=len(new_dates))
+
+    sessions = []
+    for offset, session_date in enumerate(new_dates):
+        number = first_number + offset
+        sessions.append(AttendanceSession(
+            owner_id=db_class.owner_id,
+            class_id=db_class.id,
+            date=session_date,
+            description=f"Aula {number:02d}",
+            lesson_number=number
+        ))
+
+    if dry_run or not sessions:
+        return {"class_id": db_class.id, "created": sessions, "conflicts": conflicts}
+
+    db.add_all(sessions)
+    try:
+        db.flush()
+    except IntegrityError:
+        # A session for one of these dates was created concurrently after the conflict check
+        db.rollback()
+        raise ValueError("A session for one of these dates already exists.")
+
+    # Default roster: every enrolled student starts as present, like the attendance form
+    student_ids = [row.student_id for row in db.query(Enrollment.student_id).filter(Enrollment.class_id == db_class.id)]
+    if student_ids:
+        db.execute(insert(AttendanceLog), [
+            {"owner_id": db_class.owner_id, "session_id": s.id, "student_id": student_id, "status": "present", "essay_delivered": False}
+            for s in sessions for student_id in student_ids
+        ])
+    db.commit()
+    dashboard_cache.invalidate(db_class.owner_id)
+    return {"class_id": db_class.id, "created": sessions, "conflicts": conflicts}
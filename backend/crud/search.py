@@ -0,0 +1,90 @@
+import html
+import re
+from sqlalchemy import column, func, literal_column, select, table
+from sqlalchemy.orm import Session
+from backend.models.attendance import AttendanceLog, AttendanceSession, OBSERVATION_FTS_TABLE, OBSERVATION_TS_CONFIG
+from backend.models.classes import Class
+from backend.models.students import Student
+
+MAX_TERMS = 8
+HIGHLIGHT = ("<mark>", "</mark>")
+# The database wraps matches in these control characters; the snippet is HTML-escaped
+# before they become HIGHLIGHT, so markup typed into an observation stays text
+MARKERS = ("\x02", "\x03")
+
+def _terms(query: str):
+    # Only word characters reach the FTS syntax, so user input can never form operators
+    return re.findall(r"\w+", query)[:MAX_TERMS]
+
+def _context_columns():
+    return (
+        AttendanceLog.id.label("log_id"),
+        AttendanceLog.student_id,
+        Student.name.label("student_name"),
+        AttendanceLog.session_id,
+        AttendanceSession.date.label("session_date"),
+        AttendanceSession.description.label("session_description"),
+        AttendanceSession.class_id,
+        Class.name.label("class_name"),
+    )
+
+def _with_context(statement):
+    return statement\
+        .join(AttendanceSession, AttendanceLog.session_id == AttendanceSession.id)\
+        .join(Class, AttendanceSession.class_id == Class.id)\
+        .join(Student, AttendanceLog.student_id == Student.id)
+
+def _search_sqlite(db: Session, owner_id: int, terms, limit: int):
+    fts = table(OBSERVATION_FTS_TABLE, column("rowid"))
+    fts_ref = literal_column(OBSERVATION_FTS_TABLE)
+    # Every term is a prefix ("entreg" finds "entregou"); owner_id is an indexed FTS column
+    phrases = " ".join(f'"{term}"*' for term in terms)
+    match = f'owner_id : "{owner_id}" AND observation : ({phrases})'
+    rank = func.bm25(fts_ref, 1.0, 0.0) # owner_id only filters
+    statement = _with_context(
+        select(
+            *_context_columns(),
+            func.snippet(fts_ref, 0, *MARKERS, "…", 16).label("snippet"),
+            (-rank).label("rank"),
+        ).select_from(AttendanceLog).join(fts, fts.c.rowid == AttendanceLog.id)
+    ).where(fts_ref.op("MATCH")(match), AttendanceLog.owner_id == owner_id).order_by(rank).limit(limit)
+    return db.execute(statement).all()
+
+def _search_postgresql(db: Session, owner_id: int, terms, limit: int):
+    query = func.to_tsquery(OBSERVATION_TS_CONFIG, " & ".join(f"{term}:*" for term in terms))
+    # Same expression as the GIN index, so the planner can use it
+    document = func.to_tsvector(OBSERVATION_TS_CONFIG, func.coalesce(AttendanceLog.observation, ""))
+    rank = func.ts_rank(document, query)
+    best = select(AttendanceLog.id, rank.label("rank"))\
+        .where(document.op("@@")(query), AttendanceLog.owner_id == owner_id)\
+        .order_by(rank.desc()).limit(limit).subquery()
+    # Headlines are costly, so they are only built for the rows kept
+    headline = func.ts_headline(
+        OBSERVATION_TS_CONFIG, AttendanceLog.observation, query,
+        f'StartSel="{MARKERS[0]}", StopSel="{MARKERS[1]}", MaxWords=24, MinWords=8'
+    )
+    statement = _with_context(
+        select(*_context_columns(), headline.label("snippet"), best.c.rank)
+        .select_from(AttendanceLog).join(best, best.c.id == AttendanceLog.id)
+    ).order_by(best.c.rank.desc())
+    return db.execute(statement).all()
+
+def _highlight(snippet: str) -> str:
+    escaped = html.escape(snippet)
+    return escaped.replace(MARKERS[0], HIGHLIGHT[0]).replace(MARKERS[1], HIGHLIGHT[1])
+
+SEARCHERS = {"sqlite": _search_sqlite, "postgresql": _search_postgresql}
+
+def search_observations(db: Session, owner_id: int, query: str, limit: int = 20):
+    """Best-ranked attendance logs of the owner whose observation matches every word of
+    ``query``, each with a highlighted snippet and its student, session and class."""
+    terms = _terms(query)
+    if not terms:
+        return []
+    search = SEARCHERS.get(db.get_bind().dialect.name)
+    if search is None:
+        raise ValueError("Observation search is not supported on this database.")
+    hits = [row._asdict() for row in search(db, owner_id, terms, limit)]
+    for hit in hits:
+        hit["snippet"] = _highlight(hit["snippet"] or "")
+    return hits
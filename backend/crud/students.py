@@ -1,30 +1,53 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, contains_eager
 from backend.models.students import Student
-from backend.models.attendance import AttendanceLog
+from backend.models.attendance import AttendanceLog, AttendanceSession
 from backend.models.enrollments import Enrollment
 from backend.schemas.students import StudentCreate
+from backend.core.cache import dashboard_cache
+from backend.crud.sync import record_tombstones
 
-from sqlalchemy import or_
+from datetime import date
+from sqlalchemy import Date, String, case, cast, func, literal, or_
+from typing import List, Optional
 
-def get_students(db: Session, user_id: int, skip: int = 0, limit: int = 100, search: str = None):
-    query = db.query(Student).filter(Student.owner_id == user_id)
+# Columns of schemas.students.Student, in response order
+STUDENT_COLUMNS = (
+    Student.name, Student.phone, Student.parent_name, Student.parent_phone, Student.parent_email,
+    Student.school_year, Student.class_type, Student.active, Student.id, Student.owner_id,
+)
+
+def _filter_students(query, user_id: int, search: str = None):
+    query = query.filter(Student.owner_id == user_id)
     if search:
         search_filter = f"%{search}%"
         query = query.filter(or_(
             Student.name.ilike(search_filter),
             Student.parent_name.ilike(search_filter)
         ))
-    return query.offset(skip).limit(limit).all()
+    return query
+
+def get_students(db: Session, user_id: int, skip: int = 0, limit: int = 100, search: str = None):
+    return _filter_students(db.query(Student), user_id, search).offset(skip).limit(limit).all()
+
+def get_student_rows(db: Session, user_id: int, skip: int = 0, limit: int = 100, search: str = None, columns=STUDENT_COLUMNS):
+    # Fast path: plain dicts straight from column tuples, no ORM identity map or hydration.
+    # `columns` narrows the SELECT itself for sparse fieldsets (?fields=id,name).
+    rows = _filter_students(db.query(*columns), user_id, search).offset(skip).limit(limit).all()
+    return [row._asdict() for row in rows]
 
 def create_student(db: Session, student: StudentCreate, user_id: int):
     db_student = Student(**student.model_dump(), owner_id=user_id)
     db.add(db_student)
     db.commit()
     db.refresh(db_student)
+    dashboard_cache.invalidate(user_id)
     return db_student
 
+def get_student(db: Session, student_id: int):
+    return db.query(Student).filter(Student.id == student_id).first()
+
 def update_student(db: Session, student_id: int, student_data: StudentCreate):
-    student = db.query(Student).filter(Student.id == student_id).first()
+    student = db.get(Student, student_id)
     if student:
         student.name = student_data.name
         student.phone = student_data.phone
@@ -36,24 +59,34 @@ def update_student(db: Session, student_id: int, student_data: StudentCreate):
         student.active = student_data.active
         db.commit()
         db.refresh(student)
+        dashboard_cache.invalidate(student.owner_id)
     return student
 
 def delete_student(db: Session, student_id: int):
-    student = db.query(Student).filter(Student.id == student_id).first()
+    student = db.get(Student, student_id)
     if student:
+        owner_id = student.owner_id
+        log_ids = [row.id for row in db.query(AttendanceLog.id).filter(AttendanceLog.student_id == student_id)]
+        enrollment_ids = [row.id for row in db.query(Enrollment.id).filter(Enrollment.student_id == student_id)]
         db.query(AttendanceLog).filter(AttendanceLog.student_id == student_id).delete()
         db.query(Enrollment).filter(Enrollment.student_id == student_id).delete()
+        record_tombstones(db, owner_id, "logs", log_ids)
+        record_tombstones(db, owner_id, "enrollments", enrollment_ids)
+        record_tombstones(db, owner_id, "students", [student_id])
         db.delete(student)
         db.commit()
+        dashboard_cache.invalidate(owner_id)
     return student
 
 def get_student_report_stats(db: Session, student_id: int, month: int = None, year: int = None):
-    student = db.query(Student).filter(Student.id == student_id).first()
+    student = db.get(Student, student_id)
     if not student:
         return None
     
     from backend.models.attendance import AttendanceSession
-    query = db.query(AttendanceLog).join(AttendanceSession).filter(AttendanceLog.student_id == student_id)
+    # Sessions come back in the same query: the report reads each log's date and description
+    query = db.query(AttendanceLog).join(AttendanceSession).options(contains_eager(AttendanceLog.session))\
+        .filter(AttendanceLog.student_id == student_id)
 
     if month and year:
         from sqlalchemy import extract
@@ -80,9 +113,58 @@ def get_student_report_stats(db: Session, student_id: int, month: int = None, ye
         "logs": logs
     }
 
-def get_student_evolution(db: Session, student_id: int):
-    # Retrieve logs ordered by session date
-    # Need to import AttendanceSession first (check top of file)
-    from backend.models.attendance import AttendanceSession
-    results = db.query(AttendanceLog).join(AttendanceSession).filter(AttendanceLog.student_id == student_id).order_by(AttendanceSession.date).all()
-    return results
+def _week_or_month_start(db: Session, bucket: str, column):
+    # First day of the bucket, as a date, in the current dialect
+    if db.get_bind().dialect.name == "sqlite":
+        modifiers = ("weekday 0", "-6 days") if bucket == "week" else ("start of month",)
+        return func.date(column, *modifiers, type_=Date)
+    return cast(func.date_trunc(bucket, column), Date)
+
+def get_student_evolution(db: Session, student_id: int, start: Optional[date] = None, end: Optional[date] = None, bucket: Optional[str] = None, limit: int = 500):
+    """Grade and attendance series of a student, oldest first, as plain dicts.
+
+    Without ``bucket`` each session is a point; with ``bucket="week"|"month"`` the
+    logs are averaged per week (starting Monday) or month in SQL. Only the latest
+    ``limit`` points of the window are returned.
+    """
+    present = case((AttendanceLog.status == "present", 100.0), else_=0.0)
+    if bucket:
+        point_date = _week_or_month_start(db, bucket, AttendanceSession.date).label("date")
+        columns = (
+            point_date,
+            func.avg(AttendanceLog.grade).label("grade"),
+            literal(None, String).label("status"),
+            func.count(AttendanceLog.id).label("sessions"),
+            func.avg(present).label("attendance_rate"),
+        )
+    else:
+        point_date = AttendanceSession.date
+        columns = (
+            point_date.label("date"),
+            AttendanceLog.grade,
+            AttendanceLog.status,
+            literal(1).label("sessions"),
+            present.label("attendance_rate"),
+        )
+    query = db.query(*columns).select_from(AttendanceLog)\
+        .join(AttendanceSession, AttendanceLog.session_id == AttendanceSession.id)\
+        .filter(AttendanceLog.student_id == student_id)
+    if bucket:
+        query = query.group_by(point_date)
+    if start:
+        query = query.filter(AttendanceSession.date >= start)
+    if end:
+        query = query.filter(AttendanceSession.date <= end)
+
+    rows = query.order_by(point_date.desc()).limit(limit).all()
+    return [
+        {**row._asdict(), "grade": None if row.grade is None else round(row.grade, 2), "attendance_rate": round(row.attendance_rate, 2)}
+        for row in reversed(rows)
+    ]
+
+def count_owned_students(db: Session, user_id: int, student_ids: List[int]) -> int:
+    # Single query to authorize a whole batch of student ids
+    return db.query(func.count(Student.id)).filter(
+        Student.owner_id == user_id,
+        Student.id.in_(set(student_ids))
+    ).scalar()
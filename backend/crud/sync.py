@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+from sqlalchemy import delete, func, insert
+from sqlalchemy.orm import Session
+from backend.core.config import settings
+from backend.models.sync import Tombstone
+from backend.models.students import Student
+from backend.models.classes import Class
+from backend.models.enrollments import Enrollment
+from backend.models.attendance import AttendanceSession, AttendanceLog
+from backend.models.payments import Payment
+
+# Rows stamped by transactions that started before the previous sync but committed
+# after it carry an older updated_at; re-sending this window catches them.
+# Clients apply changes as upserts by id, so the overlap is harmless.
+SYNC_OVERLAP = timedelta(seconds=30)
+
+def record_tombstones(db: Session, owner_id: int, entity: str, entity_ids: Iterable[int]):
+    """Queue tombstones in the caller's transaction; the caller commits."""
+    rows = [{"owner_id": owner_id, "entity": entity, "entity_id": entity_id} for entity_id in entity_ids]
+    if rows:
+        db.execute(insert(Tombstone), rows)
+
+def tombstone_retention() -> Optional[timedelta]:
+    days = settings.SYNC_TOMBSTONE_RETENTION_DAYS
+    return timedelta(days=days) if days > 0 else None
+
+def prune_tombstones(db: Session, retention: timedelta) -> int:
+    """Drop tombstones older than ``retention``; get_changes answers tokens that old
+    with a full snapshot, so no client still needs them."""
+    cutoff = db.query(func.now()).scalar() - retention
+    result = db.execute(delete(Tombstone).where(Tombstone.deleted_at < cutoff))
+    db.commit()
+    return result.rowcount
+
+def encode_token(moment: datetime) -> str:
+    return moment.isoformat()
+
+def decode_token(token: str) -> datetime:
+    return datetime.fromisoformat(token)
+
+def _rows(query):
+    return [row._asdict() for row in query.all()]
+
+def get_changes(db: Session, user_id: int, since: Optional[datetime] = None, retention: Optional[timedelta] = None):
+    # Taken from the database clock, the same one that stamps updated_at
+    now = db.query(func.now()).scalar()
+    if since is not None and retention is not None and since - SYNC_OVERLAP < now - retention:
+        # Deletions since then may already be pruned (see prune_tombstones): start over
+        since = None
+    cutoff = since - SYNC_OVERLAP if since else None
+
+    def changed(query, model):
+        if cutoff is not None:
+            query = query.filter(model.updated_at >= cutoff)
+        return _rows(query)
+
+    changes = {
+        "students": changed(db.query(*Student.__table__.c).filter(Student.owner_id == user_id), Student),
+        "classes": changed(db.query(*Class.__table__.c).filter(Class.owner_id == user_id), Class),
+        "enrollments": changed(
+            db.query(*Enrollment.__table__.c).join(Class, Enrollment.class_id == Class.id).filter(Class.owner_id == user_id),
+            Enrollment
+        ),
+        "sessions": changed(db.query(*AttendanceSession.__table__.c).filter(AttendanceSession.owner_id == user_id), AttendanceSession),
+        "logs": changed(db.query(*AttendanceLog.__table__.c).filter(AttendanceLog.owner_id == user_id), AttendanceLog),
+        "payments": changed(db.query(*Payment.__table__.c).filter(Payment.owner_id == user_id), Payment),
+    }
+
+    deleted = []
+    if cutoff is not None:
+        deleted = _rows(db.query(Tombstone.entity, Tombstone.entity_id).filter(
+            Tombstone.owner_id == user_id,
+            Tombstone.deleted_at >= cutoff
+        ))
+
+    return {"token": encode_token(now), "full": since is None, "changes": changes, "deleted": deleted}
@@ -1,21 +1,34 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Date, Float, Text, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, Float, Text, Boolean, Index, event, text
 from sqlalchemy.orm import relationship
 from backend.core.database import Base
+from backend.models.mixins import TimestampMixin
 
-class AttendanceSession(Base):
+class AttendanceSession(TimestampMixin, Base):
     __tablename__ = "attendance_sessions"
+    # Unique indexes (not constraints) so `migrate` can add them to existing tables
+    __table_args__ = (
+        Index("uq_attendance_sessions_class_date", "class_id", "date", unique=True),
+        Index("uq_attendance_sessions_class_lesson", "class_id", "lesson_number", unique=True),
+        Index("ix_attendance_sessions_owner_date", "owner_id", "date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     class_id = Column(Integer, ForeignKey("classes.id"))
     date = Column(Date)
     description = Column(String) # e.g. "Aula 01"
     lesson_number = Column(Integer, default=1)
+    owner_id = Column(Integer, ForeignKey("users.id")) # Copy of the class owner, so tenant reads skip the join
 
     course_class = relationship("Class", back_populates="attendance_sessions")
     logs = relationship("AttendanceLog", back_populates="session", cascade="all, delete-orphan")
 
-class AttendanceLog(Base):
+class AttendanceLog(TimestampMixin, Base):
     __tablename__ = "attendance_logs"
+    # Unique index rather than constraint so `migrate` can add it to existing tables; target of the log UPSERT
+    __table_args__ = (
+        Index("uq_attendance_logs_session_student", "session_id", "student_id", unique=True),
+        Index("ix_attendance_logs_owner_student", "owner_id", "student_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     session_id = Column(Integer, ForeignKey("attendance_sessions.id"))
@@ -24,6 +37,63 @@ class AttendanceLog(Base):
     essay_delivered = Column(Boolean, default=False)
     grade = Column(Float, nullable=True) # 960
     observation = Column(Text, nullable=True)
+    version = Column(Integer, default=1) # Bumped on every PATCH, for optimistic concurrency
+    owner_id = Column(Integer, ForeignKey("users.id")) # Copy of the session's class owner
 
     session = relationship("AttendanceSession", back_populates="logs")
     student = relationship("Student")
+
+# Full-text index over observations (crud/search.py), kept in sync by the database itself so
+# every write path (session edits, log PATCH/UPSERT, student deletion, sync) is covered.
+# SQLite: external-content FTS5 table fed by triggers; owner_id is indexed too so a search
+# only walks the owner's postings. PostgreSQL: GIN index on the tsvector expression.
+OBSERVATION_FTS_TABLE = "attendance_logs_fts"
+OBSERVATION_TS_CONFIG = "portuguese"
+
+_SQLITE_OBSERVATION_INDEX = (
+    f"""CREATE VIRTUAL TABLE {OBSERVATION_FTS_TABLE} USING fts5(
+        observation, owner_id, content='attendance_logs', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS attendance_logs_fts_insert AFTER INSERT ON attendance_logs BEGIN
+        INSERT INTO {OBSERVATION_FTS_TABLE}(rowid, observation, owner_id) VALUES (new.id, new.observation, new.owner_id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS attendance_logs_fts_delete AFTER DELETE ON attendance_logs BEGIN
+        INSERT INTO {OBSERVATION_FTS_TABLE}({OBSERVATION_FTS_TABLE}, rowid, observation, owner_id) VALUES ('delete', old.id, old.observation, old.owner_id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS attendance_logs_fts_update AFTER UPDATE OF observation, owner_id ON attendance_logs BEGIN
+        INSERT INTO {OBSERVATION_FTS_TABLE}({OBSERVATION_FTS_TABLE}, rowid, observation, owner_id) VALUES ('delete', old.id, old.observation, old.owner_id);
+        INSERT INTO {OBSERVATION_FTS_TABLE}(rowid, observation, owner_id) VALUES (new.id, new.observation, new.owner_id);
+    END""",
+)
+
+def create_observation_index(connection) -> bool:
+    """Create the observation search index if it is missing; returns True if it was created.
+
+    Called for new tables (after_create) and by `migrate` for existing ones, whose
+    current observations are indexed on creation.
+    """
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE name = :name"), {"name": OBSERVATION_FTS_TABLE}
+        ).first()
+        if not exists:
+            connection.execute(text(_SQLITE_OBSERVATION_INDEX[0]))
+            connection.execute(text(f"INSERT INTO {OBSERVATION_FTS_TABLE}({OBSERVATION_FTS_TABLE}) VALUES ('rebuild')"))
+        for trigger in _SQLITE_OBSERVATION_INDEX[1:]:
+            connection.execute(text(trigger))
+        return not exists
+    if dialect == "postgresql":
+        exists = connection.execute(text("SELECT to_regclass('ix_attendance_logs_observation_fts')")).scalar()
+        if not exists:
+            connection.execute(text(
+                "CREATE INDEX ix_attendance_logs_observation_fts ON attendance_logs "
+                f"USING gin (to_tsvector('{OBSERVATION_TS_CONFIG}', coalesce(observation, '')))"
+            ))
+        return not exists
+    return False
+
+@event.listens_for(AttendanceLog.__table__, "after_create")
+def _create_observation_index(target, connection, **kwargs):
+    create_observation_index(connection)
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Float, Index, text
+from backend.core.database import Base
+
+class BillingRate(Base):
+    __tablename__ = "billing_rates"
+    # Unique indexes rather than constraints so `migrate` can add them to existing tables.
+    # NULLs never collide in a unique index, so the single default rate needs its own partial one.
+    __table_args__ = (
+        Index("uq_billing_rates_owner_class_type", "owner_id", "class_type", unique=True),
+        Index(
+            "uq_billing_rates_owner_default", "owner_id", unique=True,
+            postgresql_where=text("class_type IS NULL"),
+            sqlite_where=text("class_type IS NULL")
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    owner_id = Column(Integer, ForeignKey("users.id"), index=True)
+    class_type = Column(String, nullable=True) # NULL = owner's default amount
+    amount = Column(Float, default=0.0)
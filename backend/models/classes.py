@@ -1,14 +1,16 @@
 from sqlalchemy import Column, Integer, String, ForeignKey
 from sqlalchemy.orm import relationship
 from backend.core.database import Base
+from backend.models.mixins import TimestampMixin
 
-class Class(Base):
+class Class(TimestampMixin, Base):
     __tablename__ = "classes"
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True)
     schedule = Column(String) # e.g., "Monday 18:30"
     owner_id = Column(Integer, ForeignKey("users.id"))
+    lesson_counter = Column(Integer, nullable=True) # Last allocated lesson_number; NULL until the first allocation
 
     owner = relationship("User", back_populates="owned_classes")
     enrollments = relationship("Enrollment", back_populates="course_class")
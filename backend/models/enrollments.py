@@ -1,9 +1,12 @@
-from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy import Column, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from backend.core.database import Base
+from backend.models.mixins import TimestampMixin
 
-class Enrollment(Base):
+class Enrollment(TimestampMixin, Base):
     __tablename__ = "enrollments"
+    # Unique index rather than constraint so `migrate` can add it to existing tables
+    __table_args__ = (Index("uq_enrollments_class_student", "class_id", "student_id", unique=True),)
 
     id = Column(Integer, primary_key=True, index=True)
     student_id = Column(Integer, ForeignKey("students.id"))
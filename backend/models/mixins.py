@@ -0,0 +1,7 @@
+from sqlalchemy import Column, DateTime, func
+
+class TimestampMixin:
+    # SQL-expression defaults (not Python callables) so bulk INSERT ... SELECT and
+    # query.update() stamp rows too; updated_at drives GET /sync
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), index=True)
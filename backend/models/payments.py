@@ -1,9 +1,21 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Float, Boolean, Date
+from sqlalchemy import Column, Integer, String, ForeignKey, Float, Boolean, Date, Index, text
 from sqlalchemy.orm import relationship
 from backend.core.database import Base
+from backend.models.mixins import TimestampMixin
 
-class Payment(Base):
+class Payment(TimestampMixin, Base):
     __tablename__ = "payments"
+    __table_args__ = (
+        # Unique index rather than constraint so `migrate` can add it to existing tables
+        Index("uq_payments_student_period", "student_id", "year", "month", unique=True),
+        # Partial index: only unpaid rows, which is all the overdue job and collections ever scan
+        Index(
+            "ix_payments_unpaid_period", "year", "month", "student_id",
+            postgresql_where=text("status <> 'PAID'"),
+            sqlite_where=text("status <> 'PAID'")
+        ),
+        Index("ix_payments_owner_period", "owner_id", "year", "month"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     student_id = Column(Integer, ForeignKey("students.id"))
@@ -12,5 +24,6 @@ class Payment(Base):
     status = Column(String) # "PENDING", "PAID", "LATE"
     amount = Column(Float, default=0.0)
     paid_at = Column(Date, nullable=True)
+    owner_id = Column(Integer, ForeignKey("users.id")) # Copy of the student's owner, so tenant reads skip the join
     
     student = relationship("Student", back_populates="payments")
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, ForeignKey, Time
+from sqlalchemy.orm import relationship
+from backend.core.database import Base
+
+class ClassSchedule(Base):
+    __tablename__ = "class_schedules"
+
+    id = Column(Integer, primary_key=True, index=True)
+    class_id = Column(Integer, ForeignKey("classes.id"), index=True)
+    weekday = Column(Integer) # 0 = Monday ... 6 = Sunday
+    start_time = Column(Time, nullable=True)
+
+    course_class = relationship("Class")
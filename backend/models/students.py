@@ -1,8 +1,9 @@
 from sqlalchemy import Column, Integer, String, ForeignKey, Boolean
 from sqlalchemy.orm import relationship
 from backend.core.database import Base
+from backend.models.mixins import TimestampMixin
 
-class Student(Base):
+class Student(TimestampMixin, Base):
     __tablename__ = "students"
 
     id = Column(Integer, primary_key=True, index=True)
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index, func
+from backend.core.database import Base
+
+class Tombstone(Base):
+    __tablename__ = "tombstones"
+    __table_args__ = (Index("ix_tombstones_owner_deleted_at", "owner_id", "deleted_at"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    owner_id = Column(Integer, ForeignKey("users.id"))
+    entity = Column(String) # "students", "classes", "enrollments", "sessions", "logs", "payments"
+    entity_id = Column(Integer)
+    deleted_at = Column(DateTime, default=func.now())
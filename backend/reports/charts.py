@@ -0,0 +1,50 @@
+"""Server-side rendering of the student evolution chart.
+
+Drawn headlessly with matplotlib's Agg canvas (no pyplot global state, so it is
+safe from worker threads) and cached per process. The cache key is the student
+plus the plotted points themselves (not a hash of them, which could collide), so
+any change to the series produces a new entry and repeated or batch exports of
+unchanged data skip the render.
+"""
+import io
+from datetime import date
+from typing import Optional, Sequence, Tuple
+from backend.core.cache import LRUCache
+
+# Roughly 30-60 KB per PNG
+chart_cache = LRUCache(max_entries=256)
+
+LINE_COLOR = "#8b5cf6" # Same purple as the chart in the Students page
+GRID_COLOR = "#d1d5db"
+
+def render_evolution_chart(points: Sequence[Tuple[date, Optional[float]]]) -> bytes:
+    # Imported on first render: matplotlib is heavy and most requests never draw
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.dates import AutoDateLocator, DateFormatter
+    from matplotlib.figure import Figure
+
+    figure = Figure(figsize=(8, 4), dpi=100)
+    FigureCanvasAgg(figure)
+    axes = figure.add_subplot()
+    dates = [point_date for point_date, _ in points]
+    # Ungraded sessions become gaps in the line, like the frontend chart
+    grades = [float("nan") if grade is None else grade for _, grade in points]
+    axes.plot(dates, grades, color=LINE_COLOR, linewidth=2.5, marker="o", markersize=5)
+    axes.set_ylim(0, 10)
+    axes.set_ylabel("Nota")
+    axes.grid(True, color=GRID_COLOR, linestyle="--", linewidth=0.8)
+    axes.xaxis.set_major_locator(AutoDateLocator(maxticks=10))
+    axes.xaxis.set_major_formatter(DateFormatter("%d/%m/%Y"))
+    figure.autofmt_xdate()
+    figure.tight_layout()
+
+    output = io.BytesIO()
+    figure.savefig(output, format="png")
+    return output.getvalue()
+
+def evolution_chart(student_id: int, points: Sequence[Tuple[date, Optional[float]]]) -> Optional[bytes]:
+    """PNG of the student's grade evolution, or None when there is nothing to plot."""
+    if not points:
+        return None
+    points = tuple(points)
+    return chart_cache.get_or_compute((student_id, points), lambda: render_evolution_chart(points))
@@ -0,0 +1,114 @@
+"""Content of the student, session and financial reports as layout blocks.
+
+Each builder returns (blocks, filename stem); the renderer adds the extension.
+"""
+from typing import List, Optional, Tuple
+from backend.reports.layout import Heading, Image, Paragraph, Table, text
+
+STATUS_LABELS = {
+    'PRESENT': 'Presente',
+    'ABSENT': 'Ausente',
+    'LATE': 'Atrasado',
+    'Justified': 'Justificado',
+    'present': 'Presente',
+    'absent': 'Ausente',
+    'late': 'Atrasado',
+    'justified': 'Justificado'
+}
+
+def _or_dash(value) -> str:
+    return str(value) if value is not None and value != '' else '-'
+
+def student_report(stats: dict, month: Optional[int] = None, year: Optional[int] = None, chart: Optional[bytes] = None) -> Tuple[List, str]:
+    """chart: evolution chart PNG (charts.evolution_chart); the section is left out without one."""
+    student = stats["student"]
+    title = 'Relatório de Desempenho'
+    if month and year:
+        title += f' - {month:02d}/{year}'
+
+    info = [('Nome: ', True), (f'{student.name}\n', False)]
+    if student.parent_name:
+        info += [('Responsável: ', True), (f'{student.parent_name}\n', False)]
+
+    blocks = [
+        Heading(title, level=0, center=True),
+        Heading('Informações do Aluno'),
+        Paragraph(info),
+        Heading('Resumo de Atividades'),
+        Table(
+            ['Total Aulas', 'Presenças', 'Frequência', 'Média Notas'],
+            [[str(stats["total_classes"]), str(stats["present"]), f'{stats["attendance_rate"]}%', f'{stats["avg_grade"]}']]
+        ),
+    ]
+
+    if chart:
+        blocks += [Heading('Gráfico de Evolução'), Image(chart)]
+
+    blocks += [
+        Heading('Histórico Detalhado'),
+        Table(
+            ['Data', 'Conteúdo/Descrição', 'Status', 'Nota', 'Observação'],
+            [[
+                log.session.date.strftime('%d/%m/%Y'),
+                str(log.session.description),
+                STATUS_LABELS.get(log.status, log.status),
+                _or_dash(log.grade),
+                str(log.observation) if log.observation else '-',
+            ] for log in stats["logs"]]
+        ),
+    ]
+
+    filename = f"Relatorio_{student.name.replace(' ', '_')}"
+    if month and year:
+        filename += f"_{month:02d}_{year}"
+    elif year:
+        filename += f"_{year}"
+    return blocks, filename
+
+def session_report(session) -> Tuple[List, str]:
+    blocks = [
+        Heading('Relatório de Aula', level=0),
+        text(f'Turma: {session.course_class.name}'),
+        text(f'Data: {session.date}'),
+        text(f'Descrição: {session.description}'),
+        Heading('Frequência e Notas'),
+        Table(
+            ['Aluno', 'Status', 'Nota', 'Observação'],
+            [[
+                log.student.name if log.student else "Unknown",
+                "Presente" if log.status == 'present' else "Ausente",
+                _or_dash(log.grade),
+                str(log.observation) if log.observation else '-',
+            ] for log in session.logs],
+            grid=False, bold_header=False
+        ),
+    ]
+    return blocks, f"aula_{session.date}"
+
+def financial_report(rows, month: int, year: int) -> Tuple[List, str]:
+    """rows: (name, parent_name, school_year, class_type, payment status, amount) per student."""
+    paid_count = 0
+    total_received = 0.0
+    details = []
+    for name, parent_name, school_year, class_type, status, amount in rows:
+        is_paid = status == 'PAID'
+        if is_paid:
+            paid_count += 1
+            total_received += (amount or 0.0)
+        details.append([
+            name,
+            parent_name or "-",
+            school_year or "-",
+            class_type or "-",
+            'PAGO' if is_paid else 'PENDENTE',
+            f"R$ {amount:.2f}" if amount and amount > 0 else "-",
+        ])
+
+    blocks = [
+        Heading(f'Relatório Financeiro - {month:02d}/{year}', level=0, center=True),
+        Heading('Resumo do Mês'),
+        Table(['Total Alunos', 'Recebido', 'Pendentes'], [[str(len(details)), f"R$ {total_received:.2f}", str(len(details) - paid_count)]]),
+        Heading('Detalhamento por Aluno'),
+        Table(['Aluno', 'Responsável', 'Ano Escolar', 'Tipo de Aula', 'Status', 'Valor Pago'], details),
+    ]
+    return blocks, f"Financeiro_{month:02d}_{year}"
@@ -0,0 +1,150 @@
+"""Render report layouts to DOCX without building a python-docx object tree.
+
+The python-docx default template is unzipped once and its parts kept in memory.
+A render only writes word/document.xml as one string, with every table row
+generated in bulk, and zips it next to the cached parts. ``Document()`` re-parses
+the template on every call and ``table.add_row().cells`` walks the whole table
+for each new row, which is what made long reports slow.
+"""
+import importlib.util
+import io
+import os
+import re
+import threading
+import zipfile
+from typing import List, Tuple
+from xml.sax.saxutils import escape, quoteattr
+from backend.reports.layout import Heading, Image, Paragraph, Table
+
+MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# Twips between the template's page margins; python-docx splits this evenly between table columns
+BLOCK_WIDTH = 8640
+EMU_PER_INCH = 914400
+IMAGE_RELATIONSHIP = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/image"
+
+# Control characters are not allowed in XML 1.0 (python-docx refuses them too)
+_INVALID_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+_template = None
+_template_lock = threading.Lock()
+
+def _load_template():
+    global _template
+    with _template_lock:
+        if _template is None:
+            # Located without importing python-docx, which rendering does not need
+            package_dir = importlib.util.find_spec("docx").submodule_search_locations[0]
+            with zipfile.ZipFile(os.path.join(package_dir, "templates", "default.docx")) as archive:
+                parts = {name: archive.read(name) for name in archive.namelist()}
+            document = parts.pop("word/document.xml").decode("utf-8")
+            head = document[:document.index("<w:body>") + len("<w:body>")]
+            section = re.search(r"<w:sectPr.*</w:sectPr>", document, re.S).group(0)
+            _template = (parts, head, section)
+    return _template
+
+def _text(value) -> str:
+    return escape(_INVALID_XML.sub("", str(value)))
+
+def _run(value: str, bold: bool = False) -> str:
+    # Like python-docx add_run: "\n" becomes a line break
+    pieces = "<w:br/>".join(f'<w:t xml:space="preserve">{_text(piece)}</w:t>' for piece in value.split("\n"))
+    return f"<w:r>{'<w:rPr><w:b/></w:rPr>' if bold else ''}{pieces}</w:r>"
+
+def _paragraph(runs: str, style: str = None, center: bool = False) -> str:
+    properties = (f'<w:pStyle w:val="{style}"/>' if style else "") + ('<w:jc w:val="center"/>' if center else "")
+    return f"<w:p>{f'<w:pPr>{properties}</w:pPr>' if properties else ''}{runs}</w:p>"
+
+def _heading(block: Heading) -> str:
+    style = "Title" if block.level == 0 else f"Heading{block.level}"
+    return _paragraph(_run(block.text), style=style, center=block.center)
+
+def _table(block: Table) -> str:
+    width = BLOCK_WIDTH // len(block.header)
+    cell_start = f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{width}"/></w:tcPr><w:p>'
+
+    def row(cells, bold=False):
+        return "<w:tr>" + "".join(f"{cell_start}{_run(cell, bold) if cell else ''}</w:p></w:tc>" for cell in cells) + "</w:tr>"
+
+    style = '<w:tblStyle w:val="TableGrid"/>' if block.grid else ""
+    grid = f'<w:gridCol w:w="{width}"/>' * len(block.header)
+    return "".join([
+        f'<w:tbl><w:tblPr>{style}<w:tblW w:type="auto" w:w="0"/>'
+        '<w:tblLook w:val="04A0" w:firstRow="1" w:lastRow="0" w:firstColumn="1" w:lastColumn="0" w:noHBand="0" w:noVBand="1"/>'
+        f"</w:tblPr><w:tblGrid>{grid}</w:tblGrid>",
+        row(block.header, bold=block.bold_header),
+        "".join([row(cells) for cells in block.rows]),
+        "</w:tbl>",
+    ])
+
+def image_info(data: bytes):
+    """(extension, content type, width, height in EMU); raises if python-docx can't read the image."""
+    from docx.image.image import Image as ImageHeader
+    header = ImageHeader.from_blob(data)
+    return header.ext, header.content_type, header.width, header.height
+
+def _image(block: Image, number: int) -> Tuple[str, str]:
+    ext, _, native_width, native_height = image_info(block.data)
+    cx = int(block.width_inches * EMU_PER_INCH)
+    cy = int(native_height * cx / native_width)
+    name = f"image{number}.{ext}"
+    graphic = (
+        '<a:graphic xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main">'
+        '<a:graphicData uri="http://schemas.openxmlformats.org/drawingml/2006/picture">'
+        '<pic:pic xmlns:pic="http://schemas.openxmlformats.org/drawingml/2006/picture">'
+        f'<pic:nvPicPr><pic:cNvPr id="0" name="{name}"/><pic:cNvPicPr/></pic:nvPicPr>'
+        f'<pic:blipFill><a:blip r:embed="rIdImage{number}"/><a:stretch><a:fillRect/></a:stretch></pic:blipFill>'
+        f'<pic:spPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="{cx}" cy="{cy}"/></a:xfrm><a:prstGeom prst="rect"/></pic:spPr>'
+        "</pic:pic></a:graphicData></a:graphic>"
+    )
+    drawing = (
+        f'<w:r><w:drawing><wp:inline distT="0" distB="0" distL="0" distR="0"><wp:extent cx="{cx}" cy="{cy}"/>'
+        f'<wp:docPr id="{number}" name="Picture {number}"/>'
+        '<wp:cNvGraphicFramePr><a:graphicFrameLocks xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" noChangeAspect="1"/></wp:cNvGraphicFramePr>'
+        f"{graphic}</wp:inline></w:drawing></w:r>"
+    )
+    return _paragraph(drawing, center=block.center), name
+
+def render_docx(blocks: List) -> bytes:
+    parts, head, section = _load_template()
+    body, media = [], []
+    for block in blocks:
+        if isinstance(block, Heading):
+            body.append(_heading(block))
+        elif isinstance(block, Paragraph):
+            body.append(_paragraph("".join(_run(value, bold) for value, bold in block.runs), center=block.center))
+        elif isinstance(block, Table):
+            body.append(_table(block))
+        elif isinstance(block, Image):
+            xml, name = _image(block, len(media) + 1)
+            body.append(xml)
+            media.append((name, block.data))
+        else:
+            raise TypeError(f"Unsupported report block: {block!r}")
+    document = head + "".join(body) + section + "</w:body></w:document>"
+
+    overrides = {"word/document.xml": document.encode("utf-8")}
+    if media:
+        relationships = parts["word/_rels/document.xml.rels"].decode("utf-8")
+        content_types = parts["[Content_Types].xml"].decode("utf-8")
+        new_relationships = "".join(
+            f'<Relationship Id="rIdImage{number}" Type="{IMAGE_RELATIONSHIP}" Target={quoteattr("media/" + name)}/>'
+            for number, (name, _) in enumerate(media, start=1)
+        )
+        overrides["word/_rels/document.xml.rels"] = relationships.replace("</Relationships>", new_relationships + "</Relationships>").encode("utf-8")
+        for name, data in media:
+            ext, content_type = name.rsplit(".", 1)[1], image_info(data)[1]
+            if f'Extension="{ext}"' not in content_types:
+                content_types = content_types.replace("</Types>", f'<Default Extension="{ext}" ContentType="{content_type}"/></Types>')
+            overrides[f"word/media/{name}"] = data
+        overrides["[Content_Types].xml"] = content_types.encode("utf-8")
+
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", overrides.pop("[Content_Types].xml", parts["[Content_Types].xml"]))
+        for name, data in parts.items():
+            if name != "[Content_Types].xml":
+                archive.writestr(name, overrides.pop(name, data))
+        for name, data in overrides.items():
+            archive.writestr(name, data)
+    return output.getvalue()
@@ -0,0 +1,70 @@
+"""Turn report blocks into a download in the requested format.
+
+DOCX renders in the request thread. PDF layout is CPU-heavier pure Python, so it
+runs in a small process pool (REPORT_PDF_WORKERS per server worker) and at most
+two jobs per pool process may be running or queued; further requests wait up to
+REPORT_QUEUE_TIMEOUT seconds for a slot and then get a 503 instead of piling up
+pickled documents in memory.
+"""
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Literal
+from urllib.parse import quote
+from fastapi import HTTPException, Response
+from backend.core.config import settings
+from backend.reports import docx_renderer, pdf_renderer
+
+ReportFormat = Literal["docx", "pdf"]
+
+_pool = None
+_pool_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(max(settings.REPORT_PDF_WORKERS, 1) * 2)
+
+def _pdf_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Created on first use, so each server worker gets its own after the fork.
+            # Spawned (not forked) children: the parent has running threads. They are
+            # recycled now and then so a leak in a render cannot grow forever.
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.REPORT_PDF_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                max_tasks_per_child=200,
+            )
+    return _pool
+
+def render_pdf(blocks: List) -> bytes:
+    if settings.REPORT_PDF_WORKERS <= 0:
+        return pdf_renderer.render_pdf(blocks)
+    if not _slots.acquire(timeout=settings.REPORT_QUEUE_TIMEOUT):
+        raise HTTPException(status_code=503, detail="Too many reports being generated, try again shortly")
+    try:
+        return _pdf_pool().submit(pdf_renderer.render_pdf, blocks).result()
+    finally:
+        _slots.release()
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
+RENDERERS = {
+    "docx": (docx_renderer.MEDIA_TYPE, docx_renderer.render_docx),
+    "pdf": (pdf_renderer.MEDIA_TYPE, render_pdf),
+}
+
+def report_response(blocks: List, filename: str, output_format: ReportFormat = "docx") -> Response:
+    media_type, render = RENDERERS[output_format]
+    filename = f"{filename}.{output_format}"
+    # Headers are Latin-1 on the wire: plain ASCII name plus the exact one in RFC 5987 form
+    fallback = filename.encode("ascii", "replace").decode("ascii").replace("?", "_")
+    # The whole file is already in memory, so a plain Response (with Content-Length) beats streaming it
+    return Response(
+        content=render(blocks),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={fallback}; filename*=UTF-8''{quote(filename)}"}
+    )
@@ -0,0 +1,29 @@
+"""Output-neutral building blocks of a report.
+
+Report builders (documents.py) describe a report as a list of these blocks and
+the renderers turn that list into a file, so the report content lives in one place.
+"""
+from typing import NamedTuple, Sequence, Tuple
+
+class Heading(NamedTuple):
+    text: str
+    level: int = 1 # 0 is the document title
+    center: bool = False
+
+class Paragraph(NamedTuple):
+    runs: Sequence[Tuple[str, bool]] # (text, bold); "\n" inside a run is a line break
+    center: bool = False
+
+class Table(NamedTuple):
+    header: Sequence[str]
+    rows: Sequence[Sequence[str]]
+    grid: bool = True
+    bold_header: bool = True
+
+class Image(NamedTuple):
+    data: bytes
+    width_inches: float = 6.0
+    center: bool = True
+
+def text(value: str) -> Paragraph:
+    return Paragraph([(value, False)])
@@ -0,0 +1,124 @@
+"""Render report layouts straight to PDF with fpdf2 (pure Python).
+
+Uses the PDF core fonts, which need no font file or embedding but only cover
+Latin-1: that fits Portuguese text, and anything outside it is printed as "?".
+"""
+import io
+from typing import List
+from backend.reports.layout import Heading, Image, Paragraph, Table
+
+MEDIA_TYPE = "application/pdf"
+
+FONT = "Helvetica"
+HEADING_SIZES = {0: 22, 1: 15, 2: 13}
+BODY_SIZE = 10
+TABLE_SIZE = 9
+LINE_HEIGHT = 5.5 # mm
+TABLE_LINE_HEIGHT = 4.2
+CELL_PADDING = 1.2
+
+def _latin1(value) -> str:
+    return str(value).encode("latin-1", "replace").decode("latin-1")
+
+def _heading(pdf, block: Heading):
+    pdf.ln(3 if block.level else 0)
+    pdf.set_font(FONT, "B", HEADING_SIZES.get(block.level, BODY_SIZE + 2))
+    pdf.multi_cell(0, HEADING_SIZES.get(block.level, BODY_SIZE + 2) * 0.5, _latin1(block.text), align="C" if block.center else "L", new_x="LMARGIN", new_y="NEXT")
+    pdf.ln(2)
+
+def _paragraph(pdf, block: Paragraph):
+    # Runs are written inline with write(); "\n" inside them starts a new line
+    pdf.set_x(pdf.l_margin)
+    for value, bold in block.runs:
+        pdf.set_font(FONT, "B" if bold else "", BODY_SIZE)
+        pdf.write(LINE_HEIGHT, _latin1(value))
+    pdf.ln(LINE_HEIGHT)
+    pdf.ln(1)
+
+def _wrap(value: str, width: float, widths: dict, scale: float) -> List[str]:
+    # Greedy word wrap with the core font's character widths; words wider than the cell are cut
+    lines = []
+    space = widths[" "] * scale
+    for paragraph in value.split("\n"):
+        line, line_width = "", 0.0
+        for word in paragraph.split(" "):
+            word_width = sum(widths[c] for c in word) * scale
+            if line and line_width + space + word_width <= width:
+                line, line_width = f"{line} {word}", line_width + space + word_width
+                continue
+            if line:
+                lines.append(line)
+            while word_width > width and len(word) > 1:
+                cut, cut_width = 0, 0.0
+                while cut < len(word) and cut_width + widths[word[cut]] * scale <= width:
+                    cut_width += widths[word[cut]] * scale
+                    cut += 1
+                cut = max(cut, 1)
+                lines.append(word[:cut])
+                word = word[cut:]
+                word_width = sum(widths[c] for c in word) * scale
+            line, line_width = word, word_width
+        lines.append(line)
+    return lines
+
+def _table(pdf, block: Table):
+    """Rows are laid out here instead of with FPDF.table(), whose per-character line
+    breaking costs seconds on a 1,000-row report. The header repeats on every page."""
+    column_width = pdf.epw / len(block.header)
+    text_width = column_width - 2 * CELL_PADDING
+    border = "D" if block.grid else None
+
+    def layout(cells, style):
+        pdf.set_font(FONT, style, TABLE_SIZE)
+        widths, scale = pdf.current_font.cw, TABLE_SIZE * 0.001 / pdf.k
+        wrapped = [_wrap(_latin1(value), text_width, widths, scale) for value in cells]
+        return wrapped, max(len(lines) for lines in wrapped) * TABLE_LINE_HEIGHT + 2 * CELL_PADDING
+
+    def draw(wrapped, height, style):
+        pdf.set_font(FONT, style, TABLE_SIZE)
+        top = pdf.y
+        for column, lines in enumerate(wrapped):
+            x = pdf.l_margin + column * column_width
+            if border:
+                pdf.rect(x, top, column_width, height, border)
+            for number, line in enumerate(lines):
+                if line:
+                    pdf.text(x + CELL_PADDING, top + CELL_PADDING + (number + 0.75) * TABLE_LINE_HEIGHT, line)
+        pdf.set_y(top + height)
+
+    header_style = "B" if block.bold_header else ""
+    header = layout(block.header, header_style)
+    draw(*header, header_style)
+    for cells in block.rows:
+        wrapped, height = layout(cells, "")
+        if pdf.y + height > pdf.page_break_trigger:
+            pdf.add_page()
+            draw(*header, header_style)
+        draw(wrapped, height, "")
+    pdf.ln(3)
+
+def _image(pdf, block: Image):
+    width = min(block.width_inches * 25.4, pdf.epw)
+    x = pdf.l_margin + (pdf.epw - width) / 2 if block.center else pdf.l_margin
+    pdf.image(io.BytesIO(block.data), x=x, w=width)
+    pdf.ln(3)
+
+def render_pdf(blocks: List) -> bytes:
+    # Imported here so worker processes (and the app) only load fpdf2 when rendering
+    from fpdf import FPDF
+
+    pdf = FPDF(format="A4")
+    pdf.set_auto_page_break(True, margin=15)
+    pdf.add_page()
+    for block in blocks:
+        if isinstance(block, Heading):
+            _heading(pdf, block)
+        elif isinstance(block, Paragraph):
+            _paragraph(pdf, block)
+        elif isinstance(block, Table):
+            _table(pdf, block)
+        elif isinstance(block, Image):
+            _image(pdf, block)
+        else:
+            raise TypeError(f"Unsupported report block: {block!r}")
+    return bytes(pdf.output())
@@ -0,0 +1,31 @@
+from datetime import date
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from backend.schemas import users as user_schemas
+from backend.schemas import analytics as analytics_schemas
+from backend.crud import analytics as analytics_crud
+from backend.core import database, ownership, security
+
+router = APIRouter()
+
+@router.get("/analytics/at-risk", response_model=List[analytics_schemas.AtRiskStudent])
+def read_at_risk_students(
+    window: int = Query(8, ge=2, le=52),
+    since: Optional[date] = None,
+    min_sessions: int = Query(4, ge=1),
+    limit: int = Query(20, ge=1, le=500),
+    db: Session = Depends(database.get_db),
+    current_user: user_schemas.User = Depends(security.get_current_user)
+):
+    return analytics_crud.get_at_risk_students(db, user_id=current_user.id, window=window, since=since, min_sessions=min_sessions, limit=limit)
+
+@router.get("/classes/{class_id}/analytics", response_model=analytics_schemas.ClassAnalytics)
+def read_class_analytics(
+    class_id: int,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    db: Session = Depends(database.get_db),
+    db_class = Depends(ownership.get_owned_class)
+):
+    return analytics_crud.get_class_analytics(db, owner_id=db_class.owner_id, class_id=class_id, start=start, end=end)
@@ -1,31 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from docx import Document
-import io
-from backend.schemas import users as user_schemas
 from backend.crud import attendance as attendance_crud
-from backend.crud import classes as class_crud
-from backend.core import database, security
+from backend.core import database, ownership
+from backend.reports import documents
+from backend.reports.export import ReportFormat, report_response
 
 from backend.schemas import attendance as attendance_schemas
 
 router = APIRouter()
 
+def _check_session_class(db_session, class_id: int):
+    # The session is authorized through its own class; it must also be the class in the URL
+    if db_session.class_id != class_id:
+        raise HTTPException(status_code=404, detail="Session not found")
+
 @router.put("/classes/{class_id}/attendance/{session_id}", response_model=attendance_schemas.AttendanceSession)
 def update_attendance_session(
     class_id: int, 
     session_id: int, 
     session: attendance_schemas.AttendanceSessionCreate, 
     db: Session = Depends(database.get_db), 
-    current_user: user_schemas.User = Depends(security.get_current_user)
+    db_session = Depends(ownership.get_owned_session)
 ):
-    # Verify ownership
-    db_class = class_crud.get_class(db, class_id=class_id)
-    if not db_class or db_class.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
-        
-    updated_session = attendance_crud.update_attendance_session(db, session_id=session_id, session_data=session)
+    _check_session_class(db_session, class_id)
+    try:
+        updated_session = attendance_crud.update_attendance_session(db, session_id=session_id, session_data=session)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not updated_session:
         raise HTTPException(status_code=404, detail="Session not found")
     return updated_session
@@ -35,70 +36,40 @@ def delete_attendance_session(
     class_id: int, 
     session_id: int, 
     db: Session = Depends(database.get_db), 
-    current_user: user_schemas.User = Depends(security.get_current_user)
+    db_session = Depends(ownership.get_owned_session)
 ):
-    # Verify ownership
-    db_class = class_crud.get_class(db, class_id=class_id)
-    if not db_class or db_class.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
-        
+    _check_session_class(db_session, class_id)
     deleted_session = attendance_crud.delete_attendance_session(db, session_id=session_id)
     if not deleted_session:
         raise HTTPException(status_code=404, detail="Session not found")
     return {"message": "Session deleted successfully"}
 
-@router.get("/attendance-sessions/{session_id}")
-def read_attendance_session(session_id: int, db: Session = Depends(database.get_db), current_user: user_schemas.User = Depends(security.get_current_user)):
-    session = attendance_crud.get_attendance_session(db, session_id=session_id)
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
-    # Verify ownership via class... lazy way: fetch class
-    db_class = class_crud.get_class(db, class_id=session.class_id)
-    if db_class.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    return session
+@router.patch("/attendance-sessions/{session_id}/logs/{student_id}", response_model=attendance_schemas.AttendanceLog)
+def patch_attendance_log(
+    session_id: int,
+    student_id: int,
+    patch: attendance_schemas.AttendanceLogPatch,
+    db: Session = Depends(database.get_db),
+    db_session = Depends(ownership.get_owned_session),
+    student = Depends(ownership.get_owned_student)
+):
+    try:
+        log = attendance_crud.patch_attendance_log(
+            db, session_id=session_id, class_id=db_session.class_id, student_id=student_id, patch=patch, owner_id=db_session.course_class.owner_id
+        )
+    except attendance_crud.VersionConflict as e:
+        raise HTTPException(status_code=409, detail={"message": str(e), "current_version": e.current_version})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if log is None:
+        raise HTTPException(status_code=404, detail="Attendance log not found")
+    return log
 
-@router.get("/attendance-sessions/{session_id}/report/docx")
-def generate_session_report(session_id: int, db: Session = Depends(database.get_db), current_user: user_schemas.User = Depends(security.get_current_user)):
-    session = attendance_crud.get_attendance_session(db, session_id=session_id)
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    # Verify ownership
-    db_class = class_crud.get_class(db, class_id=session.class_id)
-    if db_class.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
+@router.get("/attendance-sessions/{session_id}", dependencies=[Depends(database.use_replica)])
+def read_attendance_session(session = Depends(ownership.get_owned_session_with_logs)):
+    return session
 
-    document = Document()
-    document.add_heading(f'Relatório de Aula', 0)
-    document.add_paragraph(f'Turma: {db_class.name}')
-    document.add_paragraph(f'Data: {session.date}')
-    document.add_paragraph(f'Descrição: {session.description}')
-    
-    document.add_heading('Frequência e Notas', level=1)
-    
-    table = document.add_table(rows=1, cols=4)
-    hdr_cells = table.rows[0].cells
-    hdr_cells[0].text = 'Aluno'
-    hdr_cells[1].text = 'Status'
-    hdr_cells[2].text = 'Nota'
-    hdr_cells[3].text = 'Observação'
-    
-    for log in session.logs:
-        row_cells = table.add_row().cells
-        # log.student might be lazy loaded, proceed with caution or let ORM handle
-        student_name = log.student.name if log.student else "Unknown"
-        row_cells[0].text = student_name
-        row_cells[1].text = "Presente" if log.status == 'present' else "Ausente"
-        row_cells[2].text = str(log.grade) if log.grade is not None else '-'
-        row_cells[3].text = str(log.observation) if log.observation else '-'
-        
-    file_stream = io.BytesIO()
-    document.save(file_stream)
-    file_stream.seek(0)
-    
-    return StreamingResponse(
-        file_stream, 
-        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        headers={"Content-Disposition": f"attachment; filename=aula_{session.date}.docx"}
-    )
+@router.get("/attendance-sessions/{session_id}/report/docx", dependencies=[Depends(database.use_replica)])
+def generate_session_report(output_format: ReportFormat = Query("docx", alias="format"), session = Depends(ownership.get_owned_session_with_logs)):
+    blocks, filename = documents.session_report(session)
+    return report_response(blocks, filename, output_format)
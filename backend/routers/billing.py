@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List
+from backend.schemas import users as user_schemas
+from backend.schemas import billing as billing_schemas
+from backend.crud import billing as billing_crud
+from backend.core import database, security
+
+router = APIRouter()
+
+@router.get("/billing/rates", response_model=List[billing_schemas.BillingRate])
+def read_billing_rates(db: Session = Depends(database.get_db), current_user: user_schemas.User = Depends(security.get_current_user)):
+    return billing_crud.get_billing_rates(db, user_id=current_user.id)
+
+@router.put("/billing/rates", response_model=List[billing_schemas.BillingRate])
+def replace_billing_rates(rates: List[billing_schemas.BillingRateCreate], db: Session = Depends(database.get_db), current_user: user_schemas.User = Depends(security.get_current_user)):
+    try:
+        return billing_crud.replace_billing_rates(db, user_id=current_user.id, rates=rates)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/billing/run", response_model=billing_schemas.BillingRunResult)
+def run_billing(
+    year: int,
+    month: int = Query(ge=1, le=12),
+    default_amount: float = Query(0.0, ge=0),
+    db: Session = Depends(database.get_db),
+    current_user: user_schemas.User = Depends(security.get_current_user)
+):
+    created = billing_crud.generate_monthly_payments(db, year=year, month=month, user_id=current_user.id, default_amount=default_amount)
+    return {"year": year, "month": month, "created": created}
@@ -1,79 +1,91 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from backend.schemas import classes as class_schemas
 from backend.schemas import users as user_schemas
 from backend.schemas import students as student_schemas
 from backend.schemas import attendance as attendance_schemas
+from backend.schemas import enrollments as enrollment_schemas
 from backend.crud import classes as class_crud
 from backend.crud import enrollments as enrollment_crud
 from backend.crud import attendance as attendance_crud
-from backend.core import database, security
+from backend.crud import students as student_crud
+from backend.core import database, ownership, security
+from backend.core.serialization import FastJSONResponse, pick_columns
 
 router = APIRouter()
 
 @router.get("/classes/", response_model=List[class_schemas.Class])
-def read_classes(skip: int = 0, limit: int = 100, db: Session = Depends(database.get_db), current_user: user_schemas.User = Depends(security.get_current_user)):
+def read_classes(skip: int = 0, limit: int = 100, db: Session = Depends(database.use_replica), current_user: user_schemas.User = Depends(security.get_current_user)):
     return class_crud.get_classes(db, user_id=current_user.id, skip=skip, limit=limit)
 
 @router.post("/classes/", response_model=class_schemas.Class)
 def create_class(class_: class_schemas.ClassCreate, db: Session = Depends(database.get_db), current_user: user_schemas.User = Depends(security.get_current_user)):
     return class_crud.create_class(db=db, class_=class_, user_id=current_user.id)
 
-@router.get("/classes/{class_id}", response_model=class_schemas.Class)
-def read_class(class_id: int, db: Session = Depends(database.get_db), current_user: user_schemas.User = Depends(security.get_current_user)):
-    db_class = class_crud.get_class(db, class_id=class_id)
-    if db_class is None:
-        raise HTTPException(status_code=404, detail="Class not found")
-    if db_class.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
+@router.get("/classes/{class_id}", response_model=class_schemas.Class, dependencies=[Depends(database.use_replica)])
+def read_class(db_class = Depends(ownership.get_owned_class)):
     return db_class
 
 @router.put("/classes/{class_id}", response_model=class_schemas.Class)
-def update_class(class_id: int, class_data: class_schemas.ClassCreate, db: Session = Depends(database.get_db), current_user: user_schemas.User = Depends(security.get_current_user)):
-    db_class = class_crud.get_class(db, class_id=class_id)
-    if db_class is None:
-        raise HTTPException(status_code=404, detail="Class not found")
-    if db_class.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
+def update_class(class_id: int, class_data: class_schemas.ClassCreate, db: Session = Depends(database.get_db), db_class = Depends(ownership.get_owned_class)):
     return class_crud.update_class(db=db, class_id=class_id, class_data=class_data)
 
 @router.delete("/classes/{class_id}")
-def delete_class(class_id: int, db: Session = Depends(database.get_db), current_user: user_schemas.User = Depends(security.get_current_user)):
-    db_class = class_crud.get_class(db, class_id=class_id)
-    if db_class is None:
-        raise HTTPException(status_code=404, detail="Class not found")
-    if db_class.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
+def delete_class(class_id: int, db: Session = Depends(database.get_db), db_class = Depends(ownership.get_owned_class)):
     class_crud.delete_class(db=db, class_id=class_id)
     return {"message": "Class deleted successfully"}
 
 @router.get("/classes/{class_id}/students", response_model=List[student_schemas.Student])
-def read_class_students(class_id: int, db: Session = Depends(database.get_db), current_user: user_schemas.User = Depends(security.get_current_user)):
-    # Verify ownership
-    db_class = class_crud.get_class(db, class_id=class_id)
-    if not db_class or db_class.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
+def read_class_students(class_id: int, fields: Optional[str] = None, db: Session = Depends(database.use_replica), db_class = Depends(ownership.get_owned_class)):
+    if fields:
+        try:
+            columns = pick_columns(fields, student_crud.STUDENT_COLUMNS)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return FastJSONResponse(enrollment_crud.get_student_rows_for_class(db, class_id=class_id, columns=columns))
     return enrollment_crud.get_students_for_class(db, class_id=class_id)
 
 @router.get("/classes/{class_id}/attendance", response_model=List[attendance_schemas.AttendanceSession])
-def read_attendance_sessions(class_id: int, db: Session = Depends(database.get_db), current_user: user_schemas.User = Depends(security.get_current_user)):
-    # Verify class belongs to user
-    # TODO: Add check
+def read_attendance_sessions(class_id: int, db: Session = Depends(database.use_replica), db_class = Depends(ownership.get_owned_class)):
     return attendance_crud.get_class_attendance_sessions(db, class_id=class_id)
 
 @router.post("/classes/{class_id}/attendance", response_model=attendance_schemas.AttendanceSession)
-def create_attendance_session(class_id: int, session: attendance_schemas.AttendanceSessionCreate, db: Session = Depends(database.get_db), current_user: user_schemas.User = Depends(security.get_current_user)):
-    # Verify class belongs to user
-    # TODO: Add check
-    # TODO: Add check
-    return attendance_crud.create_attendance_session(db=db, session=session, class_id=class_id)
+def create_attendance_session(class_id: int, session: attendance_schemas.AttendanceSessionCreate, db: Session = Depends(database.get_db), db_class = Depends(ownership.get_owned_class)):
+    try:
+        return attendance_crud.create_attendance_session(db=db, session=session, class_id=class_id, owner_id=db_class.owner_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/classes/{class_id}/enroll/{student_id}")
-def enroll_student_in_class(class_id: int, student_id: int, db: Session = Depends(database.get_db), current_user: user_schemas.User = Depends(security.get_current_user)):
+def enroll_student_in_class(class_id: int, student_id: int, db: Session = Depends(database.get_db), db_class = Depends(ownership.get_owned_class), student = Depends(ownership.get_owned_student)):
     return enrollment_crud.enroll_student(db, class_id=class_id, student_id=student_id)
 
 @router.delete("/classes/{class_id}/enroll/{student_id}")
-def unenroll_student_from_class(class_id: int, student_id: int, db: Session = Depends(database.get_db), current_user: user_schemas.User = Depends(security.get_current_user)):
+def unenroll_student_from_class(class_id: int, student_id: int, db: Session = Depends(database.get_db), db_class = Depends(ownership.get_owned_class), student = Depends(ownership.get_owned_student)):
     enrollment_crud.unenroll_student(db, class_id=class_id, student_id=student_id)
     return {"message": "Student unenrolled successfully"}
+
+def _verify_bulk_enrollment(db: Session, data: enrollment_schemas.EnrollmentBulk, user_id: int):
+    # The target class is already authorized by the route dependency
+    if data.from_class_id:
+        ownership.owned_class(db, data.from_class_id, user_id)
+    student_ids = set(data.student_ids)
+    if student_crud.count_owned_students(db, user_id=user_id, student_ids=list(student_ids)) != len(student_ids):
+        raise HTTPException(status_code=403, detail="Not authorized")
+    return list(student_ids)
+
+@router.post("/classes/{class_id}/enrollments", response_model=enrollment_schemas.EnrollmentBulkResult)
+def enroll_students_in_class(class_id: int, data: enrollment_schemas.EnrollmentBulk, db: Session = Depends(database.get_db), current_user: user_schemas.User = Depends(security.get_current_user), db_class = Depends(ownership.get_owned_class)):
+    student_ids = _verify_bulk_enrollment(db, data, current_user.id)
+    if data.from_class_id:
+        enrolled, unenrolled = enrollment_crud.move_students(db, from_class_id=data.from_class_id, to_class_id=class_id, student_ids=student_ids)
+        return {"class_id": class_id, "enrolled": enrolled, "unenrolled": unenrolled}
+    enrolled = enrollment_crud.enroll_students(db, class_id=class_id, student_ids=student_ids)
+    return {"class_id": class_id, "enrolled": enrolled}
+
+@router.delete("/classes/{class_id}/enrollments", response_model=enrollment_schemas.EnrollmentBulkResult)
+def unenroll_students_from_class(class_id: int, data: enrollment_schemas.EnrollmentBulk, db: Session = Depends(database.get_db), current_user: user_schemas.User = Depends(security.get_current_user), db_class = Depends(ownership.get_owned_class)):
+    student_ids = _verify_bulk_enrollment(db, data, current_user.id)
+    unenrolled = enrollment_crud.unenroll_students(db, class_id=class_id, student_ids=student_ids)
+    return {"class_id": class_id, "unenrolled": unenrolled}
@@ -0,0 +1,20 @@
+from datetime import date
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from backend.schemas import users as user_schemas
+from backend.schemas import dashboard as dashboard_schemas
+from backend.crud import dashboard as dashboard_crud
+from backend.core import database, security
+
+router = APIRouter()
+
+@router.get("/dashboard/stats", response_model=dashboard_schemas.DashboardStats)
+def read_dashboard_stats(
+    year: Optional[int] = None,
+    month: Optional[int] = Query(None, ge=1, le=12),
+    db: Session = Depends(database.get_db),
+    current_user: user_schemas.User = Depends(security.get_current_user)
+):
+    today = date.today()
+    return dashboard_crud.get_dashboard_stats(db, user_id=current_user.id, year=year or today.year, month=month or today.month)
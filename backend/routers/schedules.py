@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from typing import List
+from backend.schemas import schedules as schedule_schemas
+from backend.crud import schedules as schedule_crud
+from backend.core import database, ownership
+
+router = APIRouter()
+
+@router.get("/classes/{class_id}/schedule", response_model=List[schedule_schemas.ScheduleRule])
+def read_schedule_rules(class_id: int, db: Session = Depends(database.use_replica), db_class = Depends(ownership.get_owned_class)):
+    return schedule_crud.get_schedule_rules(db, class_id=class_id)
+
+@router.put("/classes/{class_id}/schedule", response_model=List[schedule_schemas.ScheduleRule])
+def replace_schedule_rules(class_id: int, rules: List[schedule_schemas.ScheduleRuleCreate], db: Session = Depends(database.get_db), db_class = Depends(ownership.get_owned_class)):
+    return schedule_crud.replace_schedule_rules(db, class_id=class_id, rules=rules)
+
+@router.post("/classes/{class_id}/attendance/generate", response_model=schedule_schemas.SessionGenerateResult)
+def generate_attendance_sessions(class_id: int, request: schedule_schemas.SessionGenerateRequest, db: Session = Depends(database.get_db), db_class = Depends(ownership.get_owned_class)):
+    if request.end_date < request.start_date:
+        raise HTTPException(status_code=400, detail="end_date must be on or after start_date")
+    if (request.end_date - request.start_date).days > 366:
+        raise HTTPException(status_code=400, detail="Date range cannot exceed one year")
+    try:
+        return schedule_crud.generate_sessions(db, db_class=db_class, start_date=request.start_date, end_date=request.end_date, dry_run=request.dry_run)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List
+from backend.schemas import users as user_schemas
+from backend.schemas import search as search_schemas
+from backend.crud import search as search_crud
+from backend.core import database, security
+
+router = APIRouter()
+
+@router.get("/search/observations", response_model=List[search_schemas.ObservationHit])
+def search_observations(
+    q: str = Query(..., min_length=2, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(database.use_replica),
+    current_user: user_schemas.User = Depends(security.get_current_user)
+):
+    try:
+        return search_crud.search_observations(db, owner_id=current_user.id, query=q, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=501, detail=str(e))
@@ -0,0 +1,27 @@
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from typing import Optional
+from backend.schemas import users as user_schemas
+from backend.crud import sync as sync_crud
+from backend.core import database, security
+from backend.core.serialization import FastJSONResponse
+
+router = APIRouter()
+
+@router.get("/sync")
+def read_changes(since: Optional[str] = None, db: Session = Depends(database.get_db), current_user: user_schemas.User = Depends(security.get_current_user)):
+    """Rows changed since ``since`` (the ``token`` of the previous call) plus deletions.
+
+    Without ``since``, or with a token older than the tombstone retention, a full
+    snapshot is returned (``full: true``: replace the local data). Otherwise apply
+    ``changes`` as upserts by id and ``deleted`` as removals. Keep ``token`` for the
+    next call.
+    """
+    since_moment: Optional[datetime] = None
+    if since:
+        try:
+            since_moment = sync_crud.decode_token(since)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid sync token")
+    return FastJSONResponse(sync_crud.get_changes(db, user_id=current_user.id, since=since_moment, retention=sync_crud.tombstone_retention()))
@@ -0,0 +1,45 @@
+from datetime import date
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+
+class AtRiskStudent(BaseModel):
+    student_id: int
+    name: str
+    sessions: int
+    attendance_rate: float # Percentage over all logs in the period
+    recent_attendance_rate: float # Percentage over the last `window` logs
+    grade_slope: float # Grade points per 30 days (negative = falling)
+    average_grade: Optional[float] = None
+    essay_delivery_rate: float
+    risk_score: float # 0..1, higher is more at risk
+
+class GradeBin(BaseModel):
+    start: float
+    end: float # Exclusive, except for the last bin
+    count: int
+
+class SessionAttendance(BaseModel):
+    session_id: int
+    date: date
+    description: Optional[str] = None
+    logs: int
+    present: int
+    attendance_rate: float
+    essay_delivery_rate: float
+    average_grade: Optional[float] = None
+
+class ClassAnalytics(BaseModel):
+    class_id: int
+    start: Optional[date] = None
+    end: Optional[date] = None
+    sessions: int
+    logs: int
+    attendance_rate: float # Percentage of present logs in the period
+    essay_delivery_rate: float
+    graded: int # Logs with a grade; the grade statistics below only use these
+    grade_mean: Optional[float] = None
+    grade_median: Optional[float] = None
+    grade_std: Optional[float] = None
+    grade_percentiles: Dict[str, float] # p10, p25, p50, p75, p90
+    grade_histogram: List[GradeBin]
+    per_session: List[SessionAttendance]
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from typing import List, Optional
 from datetime import date
 
@@ -12,9 +12,26 @@ class AttendanceLogBase(BaseModel):
 class AttendanceLogCreate(AttendanceLogBase):
     pass
 
+class AttendanceLogPatch(BaseModel):
+    # Only the fields sent are changed
+    status: Optional[str] = None
+    essay_delivered: Optional[bool] = None
+    grade: Optional[float] = None
+    observation: Optional[str] = None
+    version: Optional[int] = None # Version the client last saw; omit for a blind write
+
+    # Leave status/essay_delivered out to keep them; null is only a value for grade and observation
+    @field_validator("status", "essay_delivered")
+    @classmethod
+    def not_null(cls, value):
+        if value is None:
+            raise ValueError("may be omitted but not null")
+        return value
+
 class AttendanceLog(AttendanceLogBase):
     id: int
     session_id: int
+    version: Optional[int] = None
     class Config:
         from_attributes = True
 
@@ -0,0 +1,20 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+class BillingRateBase(BaseModel):
+    class_type: Optional[str] = None # Empty = default for students without a specific rate
+    amount: float = Field(ge=0)
+
+class BillingRateCreate(BillingRateBase):
+    pass
+
+class BillingRate(BillingRateBase):
+    id: int
+    owner_id: int
+    class Config:
+        from_attributes = True
+
+class BillingRunResult(BaseModel):
+    year: int
+    month: int
+    created: int
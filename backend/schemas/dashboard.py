@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+
+class DashboardStats(BaseModel):
+    year: int
+    month: int
+    active_students: int
+    monthly_revenue: float
+    pending_payments: int
+    average_attendance: float # Percentage of present logs in the month's sessions
+    sessions_this_month: int
@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class EnrollmentBulk(BaseModel):
+    student_ids: List[int]
+    from_class_id: Optional[int] = None # When set, students are moved out of this class
+
+class EnrollmentBulkResult(BaseModel):
+    class_id: int
+    enrolled: int = 0
+    unenrolled: int = 0
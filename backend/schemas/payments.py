@@ -20,6 +20,22 @@ class Payment(PaymentBase):
     class Config:
         from_attributes = True
 
+# Row of GET /payments/?fields=...: only the requested columns (and id) are present,
+# "student" only when student.<column> names were requested
+class PaymentPartial(BaseModel):
+    id: Optional[int] = None
+    student_id: Optional[int] = None
+    month: Optional[int] = None
+    year: Optional[int] = None
+    status: Optional[str] = None
+    amount: Optional[float] = None
+    paid_at: Optional[date] = None
+    student: Optional['StudentPartial'] = None
+
+    class Config:
+        from_attributes = True
+
 # Forward ref resolving
-from backend.schemas.students import StudentBase
+from backend.schemas.students import StudentBase, StudentPartial
 Payment.model_rebuild()
+PaymentPartial.model_rebuild()
@@ -0,0 +1,34 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+import datetime
+
+class ScheduleRuleBase(BaseModel):
+    weekday: int = Field(ge=0, le=6) # 0 = Monday ... 6 = Sunday
+    start_time: Optional[datetime.time] = None
+
+class ScheduleRuleCreate(ScheduleRuleBase):
+    pass
+
+class ScheduleRule(ScheduleRuleBase):
+    id: int
+    class_id: int
+    class Config:
+        from_attributes = True
+
+class SessionGenerateRequest(BaseModel):
+    start_date: datetime.date
+    end_date: datetime.date
+    dry_run: bool = False
+
+class GeneratedSession(BaseModel):
+    id: Optional[int] = None
+    date: datetime.date
+    description: str
+    lesson_number: int
+    class Config:
+        from_attributes = True
+
+class SessionGenerateResult(BaseModel):
+    class_id: int
+    created: List[GeneratedSession] = []
+    conflicts: List[datetime.date] = []
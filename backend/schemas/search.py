@@ -0,0 +1,15 @@
+from datetime import date
+from typing import Optional
+from pydantic import BaseModel
+
+class ObservationHit(BaseModel):
+    log_id: int
+    student_id: int
+    student_name: str
+    session_id: int
+    session_date: date
+    session_description: Optional[str] = None
+    class_id: int
+    class_name: Optional[str] = None
+    snippet: str # HTML-escaped observation excerpt, matches wrapped in <mark></mark>
+    rank: float # Higher is more relevant; only comparable within one search
@@ -21,10 +21,24 @@ class Student(StudentBase):
     class Config:
         from_attributes = True
 
-class StudentEvolutionPoint(BaseModel):
-    date: datetime.date
-    grade: Optional[float] = None
-    status: str
+# Row of GET /students/?fields=...: only the requested columns (and id) are present
+class StudentPartial(BaseModel):
+    id: Optional[int] = None
+    owner_id: Optional[int] = None
+    name: Optional[str] = None
+    phone: Optional[str] = None
+    parent_name: Optional[str] = None
+    parent_phone: Optional[str] = None
+    parent_email: Optional[str] = None
+    school_year: Optional[str] = None
+    class_type: Optional[str] = None
+    active: Optional[bool] = None
+    class Config:
+        from_attributes = True
 
-class StudentReportRequest(BaseModel):
-    chart_image: Optional[str] = None
+class StudentEvolutionPoint(BaseModel):
+    date: datetime.date # Session date, or first day of the week/month when bucketed
+    grade: Optional[float] = None # Average over the bucket
+    status: Optional[str] = None # Only for single sessions
+    sessions: int = 1
+    attendance_rate: float # Percentage of sessions present
@@ -0,0 +1,96 @@
+"""Production entry point: a gunicorn master pre-forking uvicorn workers.
+
+Usage: python -m backend.serve
+
+Environment:
+    HOST_IP / PORT_BACKEND   bind address (default 0.0.0.0:8000)
+    WEB_CONCURRENCY          worker processes (default: one per CPU core)
+    KEEP_ALIVE               seconds to hold idle keep-alive connections (default 5)
+    BACKLOG                  pending connection queue size (default 2048)
+    GRACEFUL_TIMEOUT         seconds a stopping worker gets to finish in-flight
+                             requests such as report renders (default 60)
+    WORKER_TIMEOUT           seconds before a silent worker is restarted (default 120)
+
+The in-process background jobs (OVERDUE_CHECK_INTERVAL_MINUTES) run in a single
+worker, not in each one.
+"""
+import importlib.util
+import multiprocessing
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gunicorn.app.base import BaseApplication
+from uvicorn_worker import UvicornWorker
+
+def _available(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+class ProductionWorker(UvicornWorker):
+    # uvloop/httptools when installed (uvicorn[standard]); pure-Python fallbacks otherwise
+    CONFIG_KWARGS = {
+        "loop": "uvloop" if _available("uvloop") else "asyncio",
+        "http": "httptools" if _available("httptools") else "h11",
+    }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Stop accepting, then let in-flight requests (e.g. DOCX renders) finish
+        # before gunicorn's graceful_timeout kills the worker
+        self.config.timeout_graceful_shutdown = max(self.cfg.graceful_timeout - 1, 1)
+
+def pre_fork(server, worker):
+    # Master, before each fork: background jobs (overdue payments) run in exactly one
+    # worker. The first one gets them, and a replacement takes over when it exits.
+    worker.runs_jobs = getattr(server, "jobs_worker", None) is None
+    if worker.runs_jobs:
+        server.jobs_worker = worker
+
+def child_exit(server, worker):
+    if getattr(server, "jobs_worker", None) is worker:
+        server.jobs_worker = None
+
+def post_fork(server, worker):
+    # The app is preloaded in the master; never share its pooled DB connections with children
+    from backend.core import database, scheduler
+    database.dispose_engines(close=False)
+    if not worker.runs_jobs:
+        scheduler.disable_jobs()
+
+def default_workers() -> int:
+    return int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+
+def build_options() -> dict:
+    host = os.getenv("HOST_IP", "0.0.0.0")
+    port = int(os.getenv("PORT_BACKEND", 8000))
+    return {
+        "bind": f"{host}:{port}",
+        "workers": default_workers(),
+        "worker_class": "backend.serve.ProductionWorker",
+        "preload_app": True,
+        "keepalive": int(os.getenv("KEEP_ALIVE", 5)),
+        "backlog": int(os.getenv("BACKLOG", 2048)),
+        "graceful_timeout": int(os.getenv("GRACEFUL_TIMEOUT", 60)),
+        "timeout": int(os.getenv("WORKER_TIMEOUT", 120)),
+        "pre_fork": pre_fork,
+        "post_fork": post_fork,
+        "child_exit": child_exit,
+    }
+
+class ProductionServer(BaseApplication):
+    def __init__(self, options: dict):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        # Called once in the master because preload_app is on; workers inherit the imported app
+        from backend.server import app
+        return app
+
+if __name__ == "__main__":
+    ProductionServer(build_options()).run()
@@ -1,15 +1,25 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from backend.core import database
-# Models are now imported individually where needed, but for create_all we need Base
-# And to ensure all models are registered, we must import them
-from backend.models import users, classes, students, enrollments, attendance, payments
-from backend.core import database
+# All models are imported so relationships resolve; schema creation lives in
+# backend.commands.migrate and is no longer run on import
+from backend.models import users, classes, students, enrollments, attendance, payments, schedules, billing, sync
+from backend.core.config import settings
 from backend.core.router_loader import include_routers
+from backend.core import database, idempotency, scheduler
+from backend.reports import export
 
-database.Base.metadata.create_all(bind=database.engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Background jobs (overdue payments) and the PDF render pool live as long as the server
+    scheduler.start_jobs()
+    try:
+        yield
+    finally:
+        scheduler.stop_jobs()
+        export.shutdown_pool()
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # CORS
 app.add_middleware(
@@ -20,5 +30,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Load routers dynamically
-include_routers(app)
\ No newline at end of file
+# Read-your-writes for replica reads: after a write the client reads from the primary for a few seconds
+if database.replica_engine is not None:
+    app.middleware("http")(database.stick_to_primary_after_write)
+
+# Retried POSTs with an Idempotency-Key header replay the first response instead of writing twice
+app.middleware("http")(idempotency.idempotency_middleware)
+
+# Load routers from the explicit registry (ROUTER_DISCOVERY=true scans the directory instead)
+include_routers(app, discover=settings.ROUTER_DISCOVERY)
@@ -1,20 +1,54 @@
-import axios from 'axios';
+import axios, { type InternalAxiosRequestConfig } from 'axios';
 
 const api = axios.create({
   baseURL: import.meta.env.VITE_API_URL,
 });
 
+// Creates that are retried on network errors (and while still running); the same Idempotency-Key on every attempt
+// lets the server replay the first response instead of creating a duplicate
+const IDEMPOTENT_POSTS = [/^\/students\/$/, /^\/payments\/$/, /^\/classes\/\d+\/attendance$/];
+const MAX_RETRIES = 3;
+
+const isIdempotentPost = (config: InternalAxiosRequestConfig) =>
+  config.method === 'post' && IDEMPOTENT_POSTS.some((pattern) => pattern.test(config.url ?? ''));
+
+// crypto.randomUUID only exists in secure contexts; the app is also served over plain HTTP
+const newIdempotencyKey = () => {
+  if (typeof crypto.randomUUID === 'function') {
+    return crypto.randomUUID();
+  }
+  const bytes = crypto.getRandomValues(new Uint8Array(16));
+  bytes[6] = (bytes[6] & 0x0f) | 0x40; // UUID version 4
+  bytes[8] = (bytes[8] & 0x3f) | 0x80; // RFC 4122 variant
+  const hex = Array.from(bytes, (byte) => byte.toString(16).padStart(2, '0')).join('');
+  return `${hex.slice(0, 8)}-${hex.slice(8, 12)}-${hex.slice(12, 16)}-${hex.slice(16, 20)}-${hex.slice(20)}`;
+};
+
+// No response (network error), or 409 because the first attempt with this key is still
+// running on the server: back off and resend with the same key
+const isRetryable = (error: { response?: { status: number } }) =>
+  !error.response || error.response.status === 409;
+
 api.interceptors.request.use((config) => {
   const token = localStorage.getItem('token');
   if (token) {
     config.headers.Authorization = `Bearer ${token}`;
   }
+  if (isIdempotentPost(config) && !config.headers['Idempotency-Key']) {
+    config.headers['Idempotency-Key'] = newIdempotencyKey();
+  }
   return config;
 });
 
 api.interceptors.response.use(
   (response) => response,
-  (error) => {
+  async (error) => {
+    const config = error.config as (InternalAxiosRequestConfig & { retries?: number }) | undefined;
+    if (isRetryable(error) && config && isIdempotentPost(config) && (config.retries ?? 0) < MAX_RETRIES) {
+      config.retries = (config.retries ?? 0) + 1;
+      await new Promise((resolve) => setTimeout(resolve, 500 * config.retries));
+      return api(config);
+    }
     if (error.response && error.response.status === 401) {
       if (error.config && error.config.url && error.config.url.includes('/token')) {
         return Promise.reject(error);
@@ -269,7 +269,7 @@ export const ClassDetails = () => {
 
     const loadAllStudents = async () => {
         try {
-            const res = await api.get('/students/');
+            const res = await api.get('/students/?fields=id,name,active');
             setAllStudents(res.data);
             setShowEnrollModal(true);
         } catch (e) { console.error(e); }
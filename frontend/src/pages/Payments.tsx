@@ -68,7 +68,7 @@ export const Payments = () => {
 
             // 2. Fetch ALL students for accurate Stats (Total & Pending)
             // We use a high limit to ensure we get everyone to count correctly.
-            const allStudentsRes = await api.get(`/students/?limit=1000`);
+            const allStudentsRes = await api.get(`/students/?limit=1000&fields=id`);
 
             // 3. Fetch ALL payments for the month (limit 1000)
             const paymentsRes = await api.get(`/payments/?year=${selectedYear}&month=${selectedMonth}&limit=1000`);
@@ -1,7 +1,6 @@
 import React, { useEffect, useState } from 'react';
 import api from '../api';
 import { Plus, Search, Pencil, Trash, X, AlertTriangle, UserCircle, LineChart as LineChartIcon, Download } from 'lucide-react';
-import html2canvas from 'html2canvas';
 import { formatPhone, unmaskPhone } from '../utils/masks';
 import { LineChart, Line, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer } from 'recharts';
 import { Loading } from '../components/Loading';
@@ -19,9 +18,11 @@ interface Student {
 }
 
 interface EvolutionPoint {
-    date: string;
+    date: string; // Session date, or first day of the week when bucketed
     grade: number | null;
-    status: string;
+    status: string | null;
+    sessions: number;
+    attendance_rate: number;
 }
 
 interface ClassModel {
@@ -130,21 +131,6 @@ export const Students = () => {
     const handleDownloadReport = async () => {
         if (!viewingEvolution) return;
 
-        const chartElement = document.getElementById('evolution-chart-container');
-        let chartImage = null;
-
-        if (chartElement && evolutionData.length > 0) {
-            try {
-                // Capture chart with html2canvas
-                const canvas = await html2canvas(chartElement, {
-                    backgroundColor: '#1f2937' // Match bg-bg-card
-                });
-                chartImage = canvas.toDataURL('image/png');
-            } catch (err) {
-                console.error("Erro ao capturar gráfico", err);
-            }
-        }
-
         try {
             let requestUrl = `/students/${viewingEvolution.id}/report/docx`;
 
@@ -152,9 +138,8 @@ export const Students = () => {
                 requestUrl += `?month=${reportMonth}&year=${reportYear}`;
             }
 
-            const response = await api.post(requestUrl, {
-                chart_image: chartImage
-            }, {
+            // The evolution chart is rendered by the server
+            const response = await api.post(requestUrl, null, {
                 responseType: 'blob'
             });
 
@@ -182,29 +167,30 @@ export const Students = () => {
         }
     };
 
-    const handleViewEvolution = async (student: Student) => {
+    const handleViewEvolution = (student: Student) => {
         setViewingEvolution(student);
         setEvolutionData([]);
         setReportMonth(''); // Default to All
         setReportYear(new Date().getFullYear());
-        try {
-            const res = await api.get(`/students/${student.id}/evolution`);
-            // Parse dates if necessary, recharts handles strings usually but better ensure
-            setEvolutionData(res.data);
-        } catch (e) { console.error(e); alert('Erro ao buscar evolução'); }
     };
 
-    // Filter data for chart
-    const getFilteredEvolutionData = () => {
-        if (reportMonth === '') return evolutionData;
-        return evolutionData.filter(d => {
-            const date = new Date(d.date);
-            // Javascript months are 0-indexed
-            return date.getMonth() + 1 === Number(reportMonth) && date.getFullYear() === Number(reportYear);
-        });
-    };
-
-    const filteredEvolutionData = getFilteredEvolutionData();
+    // The server windows and aggregates the series: one point per session for a month,
+    // weekly averages for the whole history
+    useEffect(() => {
+        if (!viewingEvolution) return;
+        const params: Record<string, string> = {};
+        if (reportMonth === '') {
+            params.bucket = 'week';
+        } else {
+            const month = String(reportMonth).padStart(2, '0');
+            const lastDay = new Date(reportYear, Number(reportMonth), 0).getDate();
+            params.from = `${reportYear}-${month}-01`;
+            params.to = `${reportYear}-${month}-${lastDay}`;
+        }
+        api.get(`/students/${viewingEvolution.id}/evolution`, { params })
+            .then(res => setEvolutionData(res.data))
+            .catch(e => { console.error(e); alert('Erro ao buscar evolução'); });
+    }, [viewingEvolution, reportMonth, reportYear]);
 
 
     return (
@@ -541,9 +527,9 @@ export const Students = () => {
                         </div>
 
                         <div id="evolution-chart-container" className="h-[400px] w-full bg-bg-card p-4 rounded-xl">
-                            {filteredEvolutionData.length > 0 ? (
+                            {evolutionData.length > 0 ? (
                                 <ResponsiveContainer width="100%" height="100%">
-                                    <LineChart data={filteredEvolutionData}>
+                                    <LineChart data={evolutionData}>
                                         <CartesianGrid strokeDasharray="3 3" stroke="#ffffff20" />
                                         <XAxis dataKey="date" stroke="#9ca3af" />
                                         <YAxis stroke="#9ca3af" domain={[0, 10]} />
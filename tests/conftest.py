@@ -1,12 +1,87 @@
 import sys
 import os
+from collections import namedtuple
 import pytest
 
 # Add separate to path
 sys.path.append(os.getcwd())
+# Settings are read when backend modules are imported, before any fixture runs
+os.environ.setdefault("SECRET_KEY", "test_secret_key")
 
 @pytest.fixture(autouse=True)
 def mock_env_vars(monkeypatch):
     monkeypatch.setenv("SECRET_KEY", "test_secret_key")
     monkeypatch.setenv("ALGORITHM", "HS256")
     monkeypatch.setenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+
+# A user of the test database with the headers that authenticate as them
+Teacher = namedtuple("Teacher", ["id", "email", "headers"])
+
+@pytest.fixture
+def session_factory(monkeypatch):
+    """Fresh in-memory database per test; code that opens its own sessions gets it too."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+    from backend.core import database
+    from backend.models import users, classes, students, enrollments, attendance, payments, schedules, billing, sync
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    database.Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    monkeypatch.setattr(database, "SessionLocal", factory)
+    yield factory
+    engine.dispose()
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+@pytest.fixture
+def client(session_factory):
+    from fastapi.testclient import TestClient
+    from backend.core import database, idempotency
+    from backend.core.cache import dashboard_cache
+    from backend.server import app
+
+    def get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    # Per-process caches would leak results between test databases
+    dashboard_cache.clear()
+    idempotency.store.clear()
+    app.dependency_overrides[database.get_db] = get_db
+    # Not used as a context manager: the lifespan (background jobs) does not run
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+@pytest.fixture
+def make_teacher(session_factory):
+    from backend.core import security
+    from backend.models.users import User
+
+    def make(email: str) -> Teacher:
+        session = session_factory()
+        try:
+            user = User(email=email, hashed_password="x")
+            session.add(user)
+            session.commit()
+            token = security.create_access_token({"sub": email})
+            return Teacher(user.id, email, {"Authorization": f"Bearer {token}"})
+        finally:
+            session.close()
+    return make
+
+@pytest.fixture
+def teacher(make_teacher):
+    return make_teacher("teacher@test.com")
+
+@pytest.fixture
+def other_teacher(make_teacher):
+    return make_teacher("other@test.com")
@@ -58,7 +58,7 @@ def seed_varied_attendance():
     # Create 5 sessions in the last 20 days
     dates_to_seed = [today - timedelta(days=x*3) for x in range(6)] # Today, -3, -6, -9, -12, -15 days
 
-    for session_date in dates_to_seed:
+    for lesson_number, session_date in enumerate(sorted(dates_to_seed), start=1):
         # Check if session exists
         session = db.query(attendance.AttendanceSession).filter(
             attendance.AttendanceSession.class_id == course_class.id,
@@ -68,10 +68,11 @@ def seed_varied_attendance():
         if not session:
             print(f"Creating session for {session_date}...")
             session = attendance.AttendanceSession(
+                owner_id=user.id,
                 class_id=course_class.id,
                 date=session_date,
                 description=f"Aula do dia {session_date.strftime('%d/%m')}",
-                lesson_number=1
+                lesson_number=lesson_number
             )
             db.add(session)
             db.commit()
@@ -93,6 +94,7 @@ def seed_varied_attendance():
                     grade = random.randint(60, 100) * 10
                 
                 log = attendance.AttendanceLog(
+                    owner_id=user.id,
                     session_id=session.id,
                     student_id=student.id,
                     status=status,
@@ -0,0 +1,66 @@
+import pytest
+
+MONDAYS = ["2026-03-02", "2026-03-09", "2026-03-16", "2026-03-23"]
+
+def _class_with_history(client, teacher, marks):
+    """A class with one student per entry of ``marks``: a list of (status, grade) per Monday."""
+    klass = client.post("/classes/", json={"name": "Turma", "schedule": "Seg 10h"}, headers=teacher.headers).json()
+    students = {}
+    for name in marks:
+        students[name] = client.post("/students/", json={"name": name}, headers=teacher.headers).json()["id"]
+        client.post(f"/classes/{klass['id']}/enroll/{students[name]}", headers=teacher.headers)
+    for index, day in enumerate(MONDAYS):
+        logs = [
+            {"student_id": students[name], "status": history[index][0], "grade": history[index][1], "essay_delivered": True}
+            for name, history in marks.items()
+        ]
+        client.post(f"/classes/{klass['id']}/attendance", json={"date": day, "logs": logs}, headers=teacher.headers)
+    return klass, students
+
+@pytest.fixture
+def histories(client, teacher, other_teacher):
+    mine = _class_with_history(client, teacher, {
+        "Ana": [("present", 9), ("present", 9), ("present", 9), ("present", 9)],
+        "Caio": [("present", 8), ("absent", None), ("present", 5), ("absent", None)],
+    })
+    theirs = _class_with_history(client, other_teacher, {
+        "Bia": [("absent", None), ("absent", None), ("absent", None), ("absent", None)],
+    })
+    return mine, theirs
+
+def test_at_risk_ranks_only_the_owners_students(client, teacher, other_teacher, histories):
+    (_, mine), (_, theirs) = histories
+
+    ranked = client.get("/analytics/at-risk", headers=teacher.headers).json()
+
+    assert [row["student_id"] for row in ranked] == [mine["Caio"], mine["Ana"]]
+    caio = ranked[0]
+    assert (caio["sessions"], caio["attendance_rate"], caio["average_grade"]) == (4, 50.0, 6.5)
+    assert caio["grade_slope"] < 0
+    assert [row["student_id"] for row in client.get("/analytics/at-risk", headers=other_teacher.headers).json()] == [theirs["Bia"]]
+
+def test_at_risk_skips_students_with_few_sessions(client, teacher, histories):
+    assert client.get("/analytics/at-risk?min_sessions=5", headers=teacher.headers).json() == []
+
+def test_at_risk_cache_is_dropped_on_writes(client, teacher, histories):
+    (_, mine), _ = histories
+    assert len(client.get("/analytics/at-risk", headers=teacher.headers).json()) == 2
+
+    client.delete(f"/students/{mine['Ana']}", headers=teacher.headers)
+
+    assert [row["student_id"] for row in client.get("/analytics/at-risk", headers=teacher.headers).json()] == [mine["Caio"]]
+
+def test_class_analytics_summarizes_the_period(client, teacher, histories):
+    (klass, _), _ = histories
+
+    summary = client.get(f"/classes/{klass['id']}/analytics?start=2026-03-09", headers=teacher.headers).json()
+
+    assert (summary["sessions"], summary["logs"], summary["graded"]) == (3, 6, 4)
+    assert summary["attendance_rate"] == pytest.approx(66.67)
+    assert (summary["grade_mean"], summary["grade_median"]) == (8.0, 9.0)
+    assert sum(bin["count"] for bin in summary["grade_histogram"]) == 4
+    assert [session["present"] for session in summary["per_session"]] == [1, 2, 1]
+
+def test_class_analytics_of_another_owner_is_forbidden(client, other_teacher, histories):
+    (klass, _), _ = histories
+    assert client.get(f"/classes/{klass['id']}/analytics", headers=other_teacher.headers).status_code == 403
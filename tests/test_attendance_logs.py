@@ -0,0 +1,83 @@
+from datetime import date
+import pytest
+
+@pytest.fixture
+def roster(client, teacher):
+    """A class with one enrolled student and a session where they were present."""
+    klass = client.post("/classes/", json={"name": "Turma", "schedule": "Seg 10h"}, headers=teacher.headers).json()
+    student = client.post("/students/", json={"name": "Ana"}, headers=teacher.headers).json()
+    client.post(f"/classes/{klass['id']}/enroll/{student['id']}", headers=teacher.headers)
+    session = client.post(f"/classes/{klass['id']}/attendance", json={
+        "date": date(2026, 3, 2).isoformat(),
+        "logs": [{"student_id": student["id"], "status": "present", "grade": 8, "observation": "Bem"}],
+    }, headers=teacher.headers).json()
+    return f"/attendance-sessions/{session['id']}/logs/{student['id']}"
+
+def _log(client, teacher, roster):
+    session_url = roster.rsplit("/logs/", 1)[0]
+    [log] = client.get(session_url, headers=teacher.headers).json()["logs"]
+    return log
+
+def test_patch_changes_only_the_fields_sent(client, teacher, roster):
+    log = client.patch(roster, json={"grade": 9.5}, headers=teacher.headers).json()
+
+    assert (log["status"], log["grade"], log["observation"]) == ("present", 9.5, "Bem")
+
+def test_patch_clears_grade_and_observation_with_null(client, teacher, roster):
+    log = client.patch(roster, json={"grade": None, "observation": None}, headers=teacher.headers).json()
+
+    assert (log["status"], log["grade"], log["observation"]) == ("present", None, None)
+
+@pytest.mark.parametrize("field", ["status", "essay_delivered"])
+def test_patch_rejects_null_for_required_fields(client, teacher, roster, field):
+    response = client.patch(roster, json={field: None}, headers=teacher.headers)
+
+    assert response.status_code == 422
+    assert _log(client, teacher, roster)[field] is not None
+
+def test_patch_with_a_stale_version_conflicts(client, teacher, roster):
+    version = _log(client, teacher, roster)["version"]
+    assert client.patch(roster, json={"status": "absent", "version": version}, headers=teacher.headers).status_code == 200
+
+    response = client.patch(roster, json={"status": "present", "version": version}, headers=teacher.headers)
+
+    assert response.status_code == 409
+    assert response.json()["detail"]["current_version"] == version + 1
+    assert _log(client, teacher, roster)["status"] == "absent"
+
+def _other_student_url(client, teacher, roster, enroll):
+    session_url = roster.rsplit("/logs/", 1)[0]
+    class_id = client.get(session_url, headers=teacher.headers).json()["class_id"]
+    student = client.post("/students/", json={"name": "Bia"}, headers=teacher.headers).json()
+    if enroll:
+        client.post(f"/classes/{class_id}/enroll/{student['id']}", headers=teacher.headers)
+    return f"{session_url}/logs/{student['id']}"
+
+def test_first_mark_creates_the_log_of_an_enrolled_student(client, teacher, roster):
+    url = _other_student_url(client, teacher, roster, enroll=True)
+
+    log = client.patch(url, json={"status": "absent"}, headers=teacher.headers).json()
+
+    assert (log["status"], log["essay_delivered"], log["version"]) == ("absent", False, 1)
+
+def test_versioned_patch_of_a_missing_log_is_not_found(client, teacher, roster):
+    url = _other_student_url(client, teacher, roster, enroll=True)
+
+    response = client.patch(url, json={"status": "absent", "version": 1}, headers=teacher.headers)
+
+    assert response.status_code == 404
+
+def test_patch_cannot_add_a_student_outside_the_class(client, teacher, roster):
+    url = _other_student_url(client, teacher, roster, enroll=False)
+
+    response = client.patch(url, json={"status": "present"}, headers=teacher.headers)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "The student is not enrolled in this class."
+
+def test_log_of_a_student_who_left_can_still_be_corrected(client, teacher, roster):
+    log = _log(client, teacher, roster)
+    class_id = client.get(roster.rsplit("/logs/", 1)[0], headers=teacher.headers).json()["class_id"]
+    client.delete(f"/classes/{class_id}/enroll/{log['student_id']}", headers=teacher.headers)
+
+    assert client.patch(roster, json={"grade": 7}, headers=teacher.headers).json()["grade"] == 7
@@ -0,0 +1,75 @@
+import pytest
+from backend.crud import attendance as attendance_crud
+from backend.crud import schedules as schedule_crud
+from backend.models.classes import Class
+
+@pytest.fixture
+def klass(client, teacher):
+    return client.post("/classes/", json={"name": "Turma", "schedule": "Seg 10h"}, headers=teacher.headers).json()
+
+def _create(client, teacher, klass, day, **data):
+    return client.post(f"/classes/{klass['id']}/attendance", json={"date": day, "logs": [], **data}, headers=teacher.headers)
+
+def test_sessions_are_numbered_in_creation_order(client, teacher, klass):
+    first = _create(client, teacher, klass, "2026-03-09").json()
+    second = _create(client, teacher, klass, "2026-03-02").json()
+    named = _create(client, teacher, klass, "2026-03-16", description="Revisão").json()
+
+    assert [(s["lesson_number"], s["description"]) for s in (first, second, named)] == [
+        (1, "Aula 01"), (2, "Aula 02"), (3, "Revisão")
+    ]
+
+def test_lesson_numbers_are_not_reused_after_a_delete(client, teacher, klass):
+    first = _create(client, teacher, klass, "2026-03-02").json()
+    client.delete(f"/classes/{klass['id']}/attendance/{first['id']}", headers=teacher.headers)
+
+    assert _create(client, teacher, klass, "2026-03-02").json()["lesson_number"] == 2
+
+def test_allocation_continues_from_sessions_created_before_the_counter(db, client, teacher, klass):
+    _create(client, teacher, klass, "2026-03-02")
+    _create(client, teacher, klass, "2026-03-09")
+    db.query(Class).filter(Class.id == klass["id"]).update({"lesson_counter": None})
+    db.commit()
+
+    assert attendance_crud.allocate_lesson_numbers(db, klass["id"], count=3) == 3
+    assert attendance_crud.allocate_lesson_numbers(db, klass["id"]) == 6
+
+def test_duplicate_date_is_a_400_on_create_and_generate(client, teacher, klass, monkeypatch):
+    _create(client, teacher, klass, "2026-03-02")
+
+    response = _create(client, teacher, klass, "2026-03-02")
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "A session for this date already exists."
+
+    # A session created between generate's conflict check and its insert
+    monkeypatch.setattr(schedule_crud, "find_session_conflicts", lambda db, class_id, dates: [])
+    response = client.post(f"/classes/{klass['id']}/attendance/generate", json={
+        "start_date": "2026-03-01", "end_date": "2026-03-31"
+    }, headers=teacher.headers)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "A session for one of these dates already exists."
+
+def test_moving_a_session_onto_a_taken_date_is_rejected(client, teacher, klass):
+    _create(client, teacher, klass, "2026-03-02")
+    other = _create(client, teacher, klass, "2026-03-09").json()
+    url = f"/classes/{klass['id']}/attendance/{other['id']}"
+
+    response = client.put(url, json={"date": "2026-03-02", "logs": []}, headers=teacher.headers)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "A session for this date already exists."
+    assert client.put(url, json={"date": "2026-03-16", "logs": []}, headers=teacher.headers).json()["date"] == "2026-03-16"
+
+def test_roster_with_a_repeated_student_is_rejected(client, teacher, klass):
+    student = client.post("/students/", json={"name": "Ana"}, headers=teacher.headers).json()
+    logs = [{"student_id": student["id"], "status": "present"}, {"student_id": student["id"], "status": "absent"}]
+
+    created = _create(client, teacher, klass, "2026-03-02", logs=logs)
+    session = _create(client, teacher, klass, "2026-03-09").json()
+    updated = client.put(f"/classes/{klass['id']}/attendance/{session['id']}", json={"date": "2026-03-09", "logs": logs}, headers=teacher.headers)
+
+    for response in (created, updated):
+        assert response.status_code == 400
+        assert response.json()["detail"] == "A student appears more than once in the roster."
@@ -0,0 +1,98 @@
+import pytest
+from sqlalchemy import create_engine, false, inspect, literal, select, text
+from sqlalchemy.exc import IntegrityError
+from backend.commands import migrate
+from backend.crud import billing as billing_crud
+from backend.models.billing import BillingRate
+
+def _student(client, teacher, name, class_type=None, active=True):
+    body = {"name": name, "class_type": class_type, "active": active}
+    return client.post("/students/", json=body, headers=teacher.headers).json()["id"]
+
+def _amounts(client, teacher, year=2026, month=3):
+    payments = client.get("/payments/", params={"year": year, "month": month}, headers=teacher.headers).json()
+    return {payment["student_id"]: (payment["amount"], payment["status"]) for payment in payments}
+
+def test_billing_run_uses_type_rate_then_default_rate(client, teacher):
+    individual = _student(client, teacher, "Ana", class_type="Individual")
+    group = _student(client, teacher, "Bia", class_type="Grupo")
+    _student(client, teacher, "Caio", active=False)
+    client.put("/billing/rates", json=[{"amount": 80}, {"class_type": "Individual", "amount": 120}], headers=teacher.headers)
+
+    result = client.post("/billing/run", params={"year": 2026, "month": 3, "default_amount": 50}, headers=teacher.headers)
+
+    assert result.json() == {"year": 2026, "month": 3, "created": 2}
+    assert _amounts(client, teacher) == {individual: (120.0, "PENDING"), group: (80.0, "PENDING")}
+
+def test_billing_run_falls_back_to_default_amount(client, teacher):
+    student = _student(client, teacher, "Ana", class_type="Grupo")
+
+    client.post("/billing/run", params={"year": 2026, "month": 3, "default_amount": 50}, headers=teacher.headers)
+
+    assert _amounts(client, teacher) == {student: (50.0, "PENDING")}
+
+def test_billing_run_is_idempotent_and_keeps_existing_payments(client, teacher, other_teacher):
+    paid = _student(client, teacher, "Ana")
+    pending = _student(client, teacher, "Bia")
+    _student(client, other_teacher, "Outro")
+    client.post("/payments/", json={"student_id": paid, "month": 3, "year": 2026, "status": "PAID", "amount": 99}, headers=teacher.headers)
+
+    first = client.post("/billing/run", params={"year": 2026, "month": 3, "default_amount": 70}, headers=teacher.headers).json()
+    second = client.post("/billing/run", params={"year": 2026, "month": 3, "default_amount": 70}, headers=teacher.headers).json()
+
+    assert (first["created"], second["created"]) == (1, 0)
+    assert _amounts(client, teacher) == {paid: (99.0, "PAID"), pending: (70.0, "PENDING")}
+    assert _amounts(client, other_teacher) == {}
+
+def test_billing_run_skips_payments_created_concurrently(client, db, teacher, monkeypatch):
+    paid = _student(client, teacher, "Ana")
+    pending = _student(client, teacher, "Bia")
+    client.post("/payments/", json={"student_id": paid, "month": 3, "year": 2026, "status": "PAID", "amount": 99}, headers=teacher.headers)
+    # The payment committed after the run's NOT EXISTS check: only the unique index sees it
+    monkeypatch.setattr(billing_crud, "exists", lambda: select(literal(1)).where(false()).exists())
+
+    assert billing_crud.generate_monthly_payments(db, year=2026, month=3, user_id=teacher.id, default_amount=70) == 1
+    assert _amounts(client, teacher) == {paid: (99.0, "PAID"), pending: (70.0, "PENDING")}
+
+@pytest.mark.parametrize("rates", [
+    [{"amount": 80}, {"amount": 90}],
+    [{"class_type": "", "amount": 80}, {"amount": 90}],
+    [{"class_type": "Grupo", "amount": 80}, {"class_type": "Grupo", "amount": 90}],
+])
+def test_duplicate_rates_are_rejected(client, teacher, rates):
+    client.put("/billing/rates", json=[{"amount": 60}], headers=teacher.headers)
+
+    response = client.put("/billing/rates", json=rates, headers=teacher.headers)
+
+    assert response.status_code == 400
+    assert [rate["amount"] for rate in client.get("/billing/rates", headers=teacher.headers).json()] == [60.0]
+
+def test_database_allows_a_single_default_rate_per_owner(db, teacher):
+    db.add_all([BillingRate(owner_id=teacher.id, amount=80), BillingRate(owner_id=teacher.id, amount=90)])
+    with pytest.raises(IntegrityError):
+        db.commit()
+
+def test_duplicate_payment_for_the_same_month_is_rejected(client, teacher):
+    student = _student(client, teacher, "Ana")
+    body = {"student_id": student, "month": 3, "year": 2026, "amount": 99}
+
+    first = client.post("/payments/", json=body, headers=teacher.headers)
+    second = client.post("/payments/", json=body, headers=teacher.headers)
+
+    assert (first.status_code, second.status_code) == (200, 400)
+    assert len(_amounts(client, teacher)) == 1
+
+def test_migrate_adds_unique_indexes_to_existing_tables(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    migrate.migrate(engine)
+    names = ("uq_payments_student_period", "uq_billing_rates_owner_class_type", "uq_billing_rates_owner_default")
+    with engine.begin() as connection:
+        for name in names:
+            connection.execute(text(f"DROP INDEX {name}"))
+
+    _, created, _ = migrate.migrate(engine)
+
+    assert set(names) <= set(created)
+    inspector = inspect(engine)
+    indexes = {index["name"]: index for table in ("payments", "billing_rates") for index in inspector.get_indexes(table)}
+    assert all(indexes[name]["unique"] for name in names)
@@ -0,0 +1,96 @@
+import threading
+import pytest
+from backend.core.cache import OwnerCache, dashboard_cache
+
+STATS = "/dashboard/stats?year=2026&month=3"
+
+def _stats(client, teacher):
+    return client.get(STATS, headers=teacher.headers).json()
+
+@pytest.fixture
+def school(client, teacher, other_teacher):
+    """Two active students and one inactive, a paid and a pending March payment, one
+    March session with one present and one absent log; plus another owner's data."""
+    headers = teacher.headers
+    klass = client.post("/classes/", json={"name": "Turma", "schedule": "Seg 10h"}, headers=headers).json()
+    ana, bia = (client.post("/students/", json={"name": name}, headers=headers).json() for name in ("Ana", "Bia"))
+    client.post("/students/", json={"name": "Caio", "active": False}, headers=headers)
+    paid = client.post("/payments/", json={"student_id": ana["id"], "month": 3, "year": 2026, "amount": 150, "status": "PAID"}, headers=headers).json()
+    pending = client.post("/payments/", json={"student_id": bia["id"], "month": 3, "year": 2026, "amount": 120}, headers=headers).json()
+    session = client.post(f"/classes/{klass['id']}/attendance", json={"date": "2026-03-02", "logs": [
+        {"student_id": ana["id"], "status": "present"}, {"student_id": bia["id"], "status": "absent"},
+    ]}, headers=headers).json()
+    other = client.post("/students/", json={"name": "Outro"}, headers=other_teacher.headers).json()
+    client.post("/payments/", json={"student_id": other["id"], "month": 3, "year": 2026, "amount": 999, "status": "PAID"}, headers=other_teacher.headers)
+    return {"class": klass, "ana": ana, "bia": bia, "paid": paid, "pending": pending, "session": session}
+
+def test_stats_aggregate_the_owners_month(client, teacher, school):
+    assert _stats(client, teacher) == {
+        "year": 2026, "month": 3, "active_students": 2, "monthly_revenue": 150.0,
+        "pending_payments": 1, "average_attendance": 50.0, "sessions_this_month": 1,
+    }
+    assert client.get("/dashboard/stats?year=2026&month=4", headers=teacher.headers).json()["monthly_revenue"] == 0.0
+
+def _write(client, teacher, school, write):
+    headers = teacher.headers
+    klass, ana, bia, session = school["class"], school["ana"], school["bia"], school["session"]
+    session_url = f"/classes/{klass['id']}/attendance/{session['id']}"
+    writes = {
+        "student create": lambda: client.post("/students/", json={"name": "Duda"}, headers=headers),
+        "student update": lambda: client.put(f"/students/{bia['id']}", json={"name": "Bia", "active": False}, headers=headers),
+        "student delete": lambda: client.delete(f"/students/{bia['id']}", headers=headers),
+        "payment create": lambda: client.post("/payments/", json={"student_id": bia["id"], "month": 3, "year": 2025, "amount": 1}, headers=headers),
+        "payment update": lambda: client.put(f"/payments/{school['pending']['id']}", json={**school["pending"], "status": "PAID"}, headers=headers),
+        "session create": lambda: client.post(f"/classes/{klass['id']}/attendance", json={"date": "2026-03-09", "logs": []}, headers=headers),
+        "session update": lambda: client.put(session_url, json={"date": "2026-03-02", "logs": [{"student_id": ana["id"], "status": "present"}]}, headers=headers),
+        "session delete": lambda: client.delete(session_url, headers=headers),
+        "log patch": lambda: client.patch(f"/attendance-sessions/{session['id']}/logs/{bia['id']}", json={"status": "present"}, headers=headers),
+        "class delete": lambda: client.delete(f"/classes/{klass['id']}", headers=headers),
+        "sessions generate": lambda: client.post(f"/classes/{klass['id']}/attendance/generate", json={"start_date": "2026-03-09", "end_date": "2026-03-09"}, headers=headers),
+        "billing run": lambda: client.post("/billing/run?year=2026&month=4&default_amount=100", headers=headers),
+    }
+    response = writes[write]()
+    assert response.status_code == 200, response.text
+
+@pytest.mark.parametrize("write", [
+    "student create", "student update", "student delete", "payment create", "payment update",
+    "session create", "session update", "session delete", "log patch", "class delete",
+    "sessions generate", "billing run",
+])
+def test_every_write_invalidates_the_owners_cache(client, teacher, other_teacher, school, write):
+    before = _stats(client, teacher)
+    _stats(client, other_teacher)
+    assert teacher.id in dashboard_cache._entries and other_teacher.id in dashboard_cache._entries
+
+    _write(client, teacher, school, write)
+
+    assert teacher.id not in dashboard_cache._entries
+    assert other_teacher.id in dashboard_cache._entries
+    after = _stats(client, teacher)
+    # Payments of other months, and deleting a class (its sessions are kept), leave March as is
+    if write not in ("payment create", "billing run", "class delete"):
+        assert after != before
+
+def test_compute_overlapping_an_invalidate_is_not_stored():
+    cache = OwnerCache(ttl_seconds=60)
+    computing, written = threading.Event(), threading.Event()
+
+    def slow_compute():
+        computing.set()
+        written.wait()
+        return "before the write"
+
+    reader = threading.Thread(target=lambda: cache.get_or_compute(1, "stats", slow_compute))
+    reader.start()
+    computing.wait()
+    cache.invalidate(1) # The write commits while the read is still computing
+    written.set()
+    reader.join()
+
+    assert cache.get_or_compute(1, "stats", lambda: "after the write") == "after the write"
+
+def test_zero_ttl_disables_the_cache():
+    cache = OwnerCache(ttl_seconds=0)
+    values = iter(range(3))
+
+    assert [cache.get_or_compute(1, "stats", lambda: next(values)) for _ in range(3)] == [0, 1, 2]
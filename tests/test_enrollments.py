@@ -0,0 +1,86 @@
+from sqlalchemy import create_engine, inspect, text
+from backend.commands import migrate
+from backend.crud import enrollments as enrollment_crud
+
+def _setup(client, teacher):
+    class_id = client.post("/classes/", json={"name": "Turma A", "schedule": "Segunda 19:00"}, headers=teacher.headers).json()["id"]
+    student_ids = [
+        client.post("/students/", json={"name": name}, headers=teacher.headers).json()["id"]
+        for name in ("Ana", "Bia", "Caio")
+    ]
+    return class_id, student_ids
+
+def _roster(client, teacher, class_id):
+    return sorted(student["name"] for student in client.get(f"/classes/{class_id}/students", headers=teacher.headers).json())
+
+def test_bulk_enroll_is_idempotent(client, teacher):
+    class_id, student_ids = _setup(client, teacher)
+
+    first = client.post(f"/classes/{class_id}/enrollments", json={"student_ids": student_ids}, headers=teacher.headers)
+    again = client.post(f"/classes/{class_id}/enrollments", json={"student_ids": student_ids + student_ids[:1]}, headers=teacher.headers)
+
+    assert first.status_code == 200 and first.json()["enrolled"] == 3
+    assert again.status_code == 200 and again.json()["enrolled"] == 0
+    assert _roster(client, teacher, class_id) == ["Ana", "Bia", "Caio"]
+
+def test_bulk_enroll_skips_rows_the_unique_index_already_has(client, db, teacher):
+    class_id, student_ids = _setup(client, teacher)
+    client.post(f"/classes/{class_id}/enroll/{student_ids[1]}", headers=teacher.headers)
+
+    # No pre-check: the conflicting row is skipped by ON CONFLICT DO NOTHING, not an IntegrityError
+    assert enrollment_crud.enroll_students(db, class_id, student_ids) == 2
+    assert enrollment_crud.enroll_students(db, class_id, student_ids) == 0
+    assert _roster(client, teacher, class_id) == ["Ana", "Bia", "Caio"]
+
+def test_single_enroll_racing_a_bulk_enroll_returns_the_existing_row(client, db, teacher, monkeypatch):
+    class_id, student_ids = _setup(client, teacher)
+    enrollment_crud.enroll_students(db, class_id, student_ids[:1])
+    real_query = db.query
+    calls = []
+
+    def query(*entities):
+        # The existence check runs before the concurrent bulk enroll commits
+        calls.append(entities)
+        result = real_query(*entities)
+        return result.filter(False) if len(calls) == 1 else result
+    monkeypatch.setattr(db, "query", query)
+
+    enrollment = enrollment_crud.enroll_student(db, class_id, student_ids[0])
+
+    assert enrollment is not None and enrollment.student_id == student_ids[0]
+    assert len(calls) == 2
+
+def test_bulk_move_between_classes(client, teacher):
+    class_id, student_ids = _setup(client, teacher)
+    target_id = client.post("/classes/", json={"name": "Turma B", "schedule": "Quarta 19:00"}, headers=teacher.headers).json()["id"]
+    client.post(f"/classes/{class_id}/enrollments", json={"student_ids": student_ids}, headers=teacher.headers)
+
+    moved = client.post(f"/classes/{target_id}/enrollments", json={"student_ids": student_ids[:2], "from_class_id": class_id}, headers=teacher.headers)
+
+    assert moved.json() == {"class_id": target_id, "enrolled": 2, "unenrolled": 2}
+    assert _roster(client, teacher, class_id) == ["Caio"]
+    assert _roster(client, teacher, target_id) == ["Ana", "Bia"]
+
+def test_bulk_enroll_rejects_other_owners(client, teacher, other_teacher):
+    class_id, student_ids = _setup(client, teacher)
+    other_class_id, other_student_ids = _setup(client, other_teacher)
+
+    foreign_student = client.post(f"/classes/{class_id}/enrollments", json={"student_ids": student_ids + other_student_ids[:1]}, headers=teacher.headers)
+    foreign_class = client.post(f"/classes/{other_class_id}/enrollments", json={"student_ids": student_ids}, headers=teacher.headers)
+    foreign_source = client.post(f"/classes/{class_id}/enrollments", json={"student_ids": student_ids, "from_class_id": other_class_id}, headers=teacher.headers)
+
+    assert [foreign_student.status_code, foreign_class.status_code, foreign_source.status_code] == [403, 403, 403]
+    assert _roster(client, teacher, class_id) == []
+    assert _roster(client, other_teacher, other_class_id) == []
+
+def test_migrate_adds_unique_enrollment_index_to_existing_table(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    migrate.migrate(engine)
+    with engine.begin() as connection:
+        connection.execute(text("DROP INDEX uq_enrollments_class_student"))
+
+    _, created, _ = migrate.migrate(engine)
+
+    assert "uq_enrollments_class_student" in created
+    indexes = {index["name"]: index for index in inspect(engine).get_indexes("enrollments")}
+    assert indexes["uq_enrollments_class_student"]["unique"]
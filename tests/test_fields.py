@@ -0,0 +1,44 @@
+from backend.core.config import settings
+
+def _student(client, teacher, **data):
+    response = client.post("/students/", json={"name": "Ana", "phone": "1199", **data}, headers=teacher.headers)
+    return response.json()
+
+def test_students_fields_returns_only_the_requested_columns(client, teacher, other_teacher):
+    ana = _student(client, teacher)
+    _student(client, other_teacher, name="Bia")
+
+    response = client.get("/students/?fields=name", headers=teacher.headers)
+
+    assert response.status_code == 200
+    assert response.json() == [{"name": "Ana", "id": ana["id"]}]
+
+def test_unknown_fields_are_rejected(client, teacher):
+    for url in ("/students/?fields=name,password", "/payments/?fields=status,student.secret"):
+        response = client.get(url, headers=teacher.headers)
+        assert response.status_code == 400
+        assert "Unknown fields" in response.json()["detail"]
+
+def test_payments_fields_nest_student_columns(client, teacher):
+    ana = _student(client, teacher)
+    payment = client.post("/payments/", json={"student_id": ana["id"], "month": 3, "year": 2026, "amount": 150}, headers=teacher.headers).json()
+
+    assert client.get("/payments/?fields=amount", headers=teacher.headers).json() == [{"id": payment["id"], "amount": 150}]
+    assert client.get("/payments/?fields=status,student.name", headers=teacher.headers).json() == [
+        {"id": payment["id"], "status": "PENDING", "student": {"name": "Ana"}}
+    ]
+
+def test_lists_without_fields_keep_the_full_shape(client, teacher, monkeypatch):
+    ana = _student(client, teacher)
+    client.post("/payments/", json={"student_id": ana["id"], "month": 3, "year": 2026, "amount": 150}, headers=teacher.headers)
+
+    for fast in (False, True):
+        monkeypatch.setattr(settings, "FAST_JSON_LISTS", fast)
+        assert client.get("/students/", headers=teacher.headers).json() == [ana]
+        [payment] = client.get("/payments/", headers=teacher.headers).json()
+        assert payment["student"]["name"] == "Ana" and payment["paid_at"] is None
+
+def test_openapi_documents_the_partial_rows(client):
+    schema = client.get("/openapi.json").json()
+    items = schema["paths"]["/students/"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]["items"]
+    assert {ref["$ref"].rsplit("/", 1)[-1] for ref in items["anyOf"]} == {"Student", "StudentPartial"}
@@ -0,0 +1,57 @@
+from backend.core import idempotency
+
+def _create_student(client, teacher, key, name="Ana"):
+    return client.post("/students/", json={"name": name}, headers={**teacher.headers, "Idempotency-Key": key})
+
+def _student_names(client, teacher):
+    return [student["name"] for student in client.get("/students/", headers=teacher.headers).json()]
+
+def test_retry_replays_the_first_response(client, teacher):
+    first = _create_student(client, teacher, "key-1")
+    retry = _create_student(client, teacher, "key-1")
+
+    assert retry.status_code == first.status_code == 200
+    assert retry.json() == first.json()
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert "idempotent-replayed" not in first.headers
+    assert _student_names(client, teacher) == ["Ana"]
+
+def test_new_key_writes_again(client, teacher):
+    _create_student(client, teacher, "key-1")
+    _create_student(client, teacher, "key-2")
+
+    assert _student_names(client, teacher) == ["Ana", "Ana"]
+
+def test_key_reused_for_a_different_request_is_rejected(client, teacher):
+    _create_student(client, teacher, "key-1")
+
+    response = _create_student(client, teacher, "key-1", name="Bia")
+
+    assert response.status_code == 422
+    assert _student_names(client, teacher) == ["Ana"]
+
+def test_keys_are_scoped_per_user(client, teacher, other_teacher):
+    mine = _create_student(client, teacher, "shared-key")
+    theirs = _create_student(client, other_teacher, "shared-key")
+
+    assert "idempotent-replayed" not in theirs.headers
+    assert theirs.json()["id"] != mine.json()["id"]
+    assert theirs.json()["owner_id"] == other_teacher.id
+    assert _student_names(client, other_teacher) == ["Ana"]
+
+def test_key_of_a_running_request_conflicts(client, teacher):
+    _create_student(client, teacher, "key-1")
+    # Put the entry back in its "first attempt still running" state
+    [(key, (expires, fingerprint, _))] = idempotency.store._entries.items()
+    idempotency.store._entries[key] = (expires, fingerprint, None)
+
+    assert _create_student(client, teacher, "key-1").status_code == 409
+    assert _student_names(client, teacher) == ["Ana"]
+
+def test_errors_below_500_are_replayed_and_invalid_keys_rejected(client, teacher, other_teacher):
+    url = f"/students/{_create_student(client, other_teacher, 'other').json()['id']}"
+    headers = {**teacher.headers, "Idempotency-Key": "key-1"}
+
+    assert client.delete(url, headers=headers).status_code == 403
+    assert client.delete(url, headers=headers).headers["idempotent-replayed"] == "true"
+    assert client.post("/students/", json={"name": "Ana"}, headers={**teacher.headers, "Idempotency-Key": "x" * 256}).status_code == 400
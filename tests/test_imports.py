@@ -9,12 +9,15 @@ from backend.schemas import users as user_schemas
 from backend.schemas import classes as class_schemas
 from backend.schemas import students as student_schemas
 from backend.schemas import attendance as attendance_schemas
+from backend.schemas import enrollments as enrollment_schemas
 
 from backend.crud import users as user_crud
 from backend.crud import classes as class_crud
 from backend.crud import students as student_crud
 from backend.crud import enrollments as enrollment_crud
 from backend.crud import attendance as attendance_crud
+from backend.crud import schedules as schedule_crud
+from backend.crud import billing as billing_crud
 
 from backend.routers import auth, users, classes, students, attendance as attendance_router
 
@@ -32,13 +35,17 @@ def test_schemas_imports():
     assert hasattr(class_schemas, "Class")
     assert hasattr(student_schemas, "Student")
     assert hasattr(attendance_schemas, "AttendanceSession")
+    assert hasattr(enrollment_schemas, "EnrollmentBulk")
 
 def test_crud_imports():
     assert hasattr(user_crud, "get_user_by_email")
     assert hasattr(class_crud, "get_classes")
     assert hasattr(student_crud, "get_students")
     assert hasattr(enrollment_crud, "enroll_student")
+    assert hasattr(enrollment_crud, "enroll_students")
     assert hasattr(attendance_crud, "get_attendance_session")
+    assert hasattr(schedule_crud, "generate_sessions")
+    assert hasattr(billing_crud, "generate_monthly_payments")
 
 def test_routers_imports():
     assert hasattr(auth, "router")
@@ -0,0 +1,96 @@
+from datetime import date
+from types import SimpleNamespace
+from backend.commands import overdue
+from backend.core import scheduler
+from backend.crud import payments as payment_crud
+from backend.models.payments import Payment
+from backend.models.students import Student
+
+def _payments(db, owner_id, periods):
+    student = Student(name="Ana", owner_id=owner_id)
+    db.add(student)
+    db.flush()
+    payments = {
+        label: Payment(student_id=student.id, owner_id=owner_id, year=year, month=month, status=status, amount=100)
+        for label, (year, month, status) in periods.items()
+    }
+    db.add_all(payments.values())
+    db.commit()
+    return payments
+
+def _statuses(db, payments):
+    db.expire_all()
+    return {label: payment.status for label, payment in payments.items()}
+
+def test_mark_overdue_flips_pending_payments_past_the_due_day(db, teacher):
+    payments = _payments(db, teacher.id, {
+        "february": (2026, 2, "PENDING"),
+        "march": (2026, 3, "PENDING"),
+        "april": (2026, 4, "PENDING"),
+        "paid": (2026, 1, "PAID"),
+    })
+
+    # On March 11th March's payment (due on the 10th) is late too, April's is not
+    updated = payment_crud.mark_overdue_payments(db, due_day=10, today=date(2026, 3, 11))
+
+    assert updated == 2
+    assert _statuses(db, payments) == {"february": "LATE", "march": "LATE", "april": "PENDING", "paid": "PAID"}
+    assert payment_crud.mark_overdue_payments(db, due_day=10, today=date(2026, 3, 11)) == 0
+
+def test_due_day_itself_is_not_late(db, teacher):
+    payments = _payments(db, teacher.id, {"march": (2026, 3, "PENDING")})
+
+    payment_crud.mark_overdue_payments(db, due_day=10, today=date(2026, 3, 10))
+
+    assert _statuses(db, payments) == {"march": "PENDING"}
+
+def test_overdue_command_covers_every_owner(db, teacher, other_teacher):
+    mine = _payments(db, teacher.id, {"old": (2020, 1, "PENDING")})
+    theirs = _payments(db, other_teacher.id, {"old": (2020, 1, "PENDING")})
+
+    assert overdue.run(due_day=10) == 2
+    assert _statuses(db, mine) == _statuses(db, theirs) == {"old": "LATE"}
+
+def test_overdue_list_includes_payments_the_job_has_not_flipped(client, db, teacher, other_teacher):
+    _payments(db, teacher.id, {"old": (2020, 1, "PENDING"), "late": (2020, 2, "LATE"), "paid": (2020, 3, "PAID")})
+    _payments(db, other_teacher.id, {"old": (2020, 1, "PENDING")})
+
+    overdue_list = client.get("/payments/overdue", headers=teacher.headers).json()
+
+    assert [(payment["month"], payment["status"]) for payment in overdue_list] == [(1, "PENDING"), (2, "LATE")]
+
+def test_jobs_run_in_a_single_gunicorn_worker(monkeypatch):
+    from backend import serve
+    monkeypatch.setattr(scheduler, "_enabled", True)
+    server = SimpleNamespace()
+    first, second, third = (SimpleNamespace(age=age) for age in (1, 2, 3))
+
+    for worker in (first, second):
+        serve.pre_fork(server, worker)
+    assert (first.runs_jobs, second.runs_jobs) == (True, False)
+
+    # The replacement of an ordinary worker does not take the jobs; the one of the job worker does
+    serve.child_exit(server, second)
+    serve.pre_fork(server, third)
+    assert third.runs_jobs is False
+    serve.child_exit(server, first)
+    replacement = SimpleNamespace(age=4)
+    serve.pre_fork(server, replacement)
+    assert replacement.runs_jobs is True
+
+    serve.post_fork(server, third)
+    scheduler.start_jobs()
+    assert scheduler._jobs == []
+
+def test_server_lifespan_starts_and_stops_the_background_work(monkeypatch):
+    from fastapi.testclient import TestClient
+    from backend import server
+    calls = []
+    monkeypatch.setattr(scheduler, "start_jobs", lambda: calls.append("start jobs"))
+    monkeypatch.setattr(scheduler, "stop_jobs", lambda: calls.append("stop jobs"))
+    monkeypatch.setattr(server.export, "shutdown_pool", lambda: calls.append("stop pdf pool"))
+
+    with TestClient(server.app):
+        assert calls == ["start jobs"]
+
+    assert calls == ["start jobs", "stop jobs", "stop pdf pool"]
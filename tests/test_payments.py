@@ -0,0 +1,57 @@
+from contextlib import contextmanager
+from sqlalchemy import event
+from backend.crud import payments as payment_crud
+from backend.models.payments import Payment
+from backend.models.students import Student
+
+@contextmanager
+def _statements(db):
+    statements = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+def _payments(db, owner_id):
+    students = [Student(name=name, owner_id=owner_id) for name in ("Ana", "Bia", "Caio")]
+    db.add_all(students)
+    db.flush()
+    db.add_all(Payment(student_id=student.id, owner_id=owner_id, year=2026, month=3, amount=100) for student in students)
+    db.commit()
+    db.expunge_all()
+
+def test_listing_without_search_does_not_join_students(db, teacher):
+    _payments(db, teacher.id)
+
+    with _statements(db) as statements:
+        payments = payment_crud.get_payments(db, user_id=teacher.id, year=2026, month=3)
+        names = [payment.student.name for payment in payments]
+
+    assert names == ["Ana", "Bia", "Caio"]
+    # Payments, then every student in one IN query; no lazy load per row
+    assert len(statements) == 2
+    assert "JOIN" not in statements[0]
+
+def test_search_filters_through_the_join_and_fills_student(db, teacher):
+    _payments(db, teacher.id)
+
+    with _statements(db) as statements:
+        payments = payment_crud.get_payments(db, user_id=teacher.id, search="bi")
+        names = [payment.student.name for payment in payments]
+
+    assert names == ["Bia"]
+    assert len(statements) == 1 and "JOIN" in statements[0]
+
+def test_rows_join_students_only_for_student_columns(db, teacher):
+    _payments(db, teacher.id)
+
+    with _statements(db) as statements:
+        plain = payment_crud.get_payment_rows(db, user_id=teacher.id, student_columns=())
+        nested = payment_crud.get_payment_rows(db, user_id=teacher.id)
+
+    assert "student" not in plain[0] and nested[0]["student"]["name"] == "Ana"
+    assert ["JOIN" in statement for statement in statements] == [False, True]
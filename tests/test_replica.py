@@ -0,0 +1,70 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from backend.core import database, security
+from backend.core.router_loader import include_routers
+from backend.models import users, classes, students, enrollments, attendance, payments, schedules, billing, sync
+from backend.models.students import Student
+from backend.models.users import User
+
+@pytest.fixture
+def replicated(tmp_path, monkeypatch):
+    """Primary and replica SQLite files that hold different rosters for the same teacher,
+    and a client for an app wired like backend.server when a replica is configured."""
+    primary = database.sqlite_engine(str(tmp_path / "primary.db"))
+    replica = database.sqlite_engine(str(tmp_path / "replica.db"))
+    for engine, name in ((primary, "Ana (primary)"), (replica, "Ana (replica)")):
+        database.Base.metadata.create_all(bind=engine)
+        with Session(engine) as db:
+            db.add(User(id=1, email="teacher@test.com", hashed_password="x"))
+            db.add(Student(name=name, owner_id=1))
+            db.commit()
+    monkeypatch.setattr(database, "engine", primary)
+    monkeypatch.setattr(database, "read_engine", primary)
+    monkeypatch.setattr(database, "replica_engine", replica)
+
+    def get_db():
+        db = database.ReplicaSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.middleware("http")(database.stick_to_primary_after_write)
+    include_routers(app)
+    app.dependency_overrides[database.get_db] = get_db
+    client = TestClient(app)
+    client.headers["Authorization"] = f"Bearer {security.create_access_token({'sub': 'teacher@test.com'})}"
+    yield client
+    primary.dispose()
+    replica.dispose()
+
+def _names(client):
+    return [student["name"] for student in client.get("/students/").json()]
+
+def test_list_reads_go_to_the_replica_until_the_client_writes(replicated):
+    assert _names(replicated) == ["Ana (replica)"]
+    assert database.PRIMARY_COOKIE not in replicated.get("/students/").cookies
+
+    response = replicated.post("/students/", json={"name": "Bia"})
+
+    assert response.status_code == 200
+    assert response.cookies[database.PRIMARY_COOKIE] == "1"
+    assert _names(replicated) == ["Ana (primary)", "Bia"]
+
+def test_failed_writes_do_not_set_the_cookie(replicated):
+    assert replicated.post("/students/", json={}).status_code == 422
+    assert replicated.delete("/students/999").status_code == 404
+
+    assert database.PRIMARY_COOKIE not in replicated.cookies
+    assert _names(replicated) == ["Ana (replica)"]
+
+def test_writes_always_go_to_the_primary(replicated):
+    [student] = replicated.get("/students/").json()
+
+    assert replicated.put(f"/students/{student['id']}", json={"name": "Ana"}).json()["name"] == "Ana"
+    assert _names(replicated) == ["Ana"]
+    replicated.cookies.clear()
+    assert _names(replicated) == ["Ana (replica)"]
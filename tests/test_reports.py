@@ -0,0 +1,89 @@
+import io
+import pytest
+from docx import Document
+from backend.core.config import settings
+from backend.reports import export
+
+@pytest.fixture
+def report_urls(client, teacher):
+    """One student with a graded session and a March payment; the URL of each report."""
+    klass = client.post("/classes/", json={"name": "Turma", "schedule": "Seg 10h"}, headers=teacher.headers).json()
+    student = client.post("/students/", json={"name": "João Conceição"}, headers=teacher.headers).json()
+    client.post(f"/classes/{klass['id']}/enroll/{student['id']}", headers=teacher.headers)
+    session = client.post(f"/classes/{klass['id']}/attendance", json={
+        "date": "2026-03-02", "logs": [{"student_id": student["id"], "status": "present", "grade": 8.5}],
+    }, headers=teacher.headers).json()
+    client.post("/payments/", json={"student_id": student["id"], "month": 3, "year": 2026, "amount": 150}, headers=teacher.headers)
+    return {
+        "session": ("get", f"/attendance-sessions/{session['id']}/report/docx"),
+        "student": ("post", f"/students/{student['id']}/report/docx?month=3&year=2026"),
+        "financial": ("post", "/payments/report/docx?month=3&year=2026"),
+    }
+
+def _report(client, teacher, report_urls, report, output_format=None):
+    method, url = report_urls[report]
+    if output_format:
+        url += ("&" if "?" in url else "?") + f"format={output_format}"
+    return getattr(client, method)(url, headers=teacher.headers)
+
+@pytest.mark.parametrize("report", ["session", "student", "financial"])
+def test_reports_default_to_docx(client, teacher, report_urls, report):
+    response = _report(client, teacher, report_urls, report)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/vnd.openxmlformats-officedocument.wordprocessingml")
+    assert ".docx" in response.headers["content-disposition"]
+    document = Document(io.BytesIO(response.content))
+    cells = [cell.text for table in document.tables for row in table.rows for cell in row.cells]
+    assert "João Conceição" in "\n".join([paragraph.text for paragraph in document.paragraphs] + cells)
+
+@pytest.mark.parametrize("report", ["session", "student", "financial"])
+def test_reports_render_pdf_in_process(client, teacher, report_urls, report, monkeypatch):
+    monkeypatch.setattr(settings, "REPORT_PDF_WORKERS", 0)
+
+    response = _report(client, teacher, report_urls, report, "pdf")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.content.startswith(b"%PDF-")
+    assert ".pdf" in response.headers["content-disposition"]
+
+def test_pdf_renders_in_the_process_pool(client, teacher, report_urls, monkeypatch):
+    monkeypatch.setattr(settings, "REPORT_PDF_WORKERS", 1)
+    try:
+        response = _report(client, teacher, report_urls, "financial", "pdf")
+    finally:
+        export.shutdown_pool()
+
+    assert response.status_code == 200
+    assert response.content.startswith(b"%PDF-")
+
+def test_pdf_requests_beyond_the_queue_get_503(client, teacher, report_urls, monkeypatch):
+    monkeypatch.setattr(settings, "REPORT_PDF_WORKERS", 1)
+    monkeypatch.setattr(settings, "REPORT_QUEUE_TIMEOUT", 0)
+    monkeypatch.setattr(export, "_slots", export.threading.BoundedSemaphore(1))
+    export._slots.acquire()
+
+    assert _report(client, teacher, report_urls, "financial", "pdf").status_code == 503
+
+def test_unknown_format_and_foreign_owner_are_rejected(client, teacher, other_teacher, report_urls):
+    assert _report(client, teacher, report_urls, "session", "odt").status_code == 422
+    method, url = report_urls["student"]
+    assert getattr(client, method)(url, headers=other_teacher.headers).status_code == 403
+
+def test_evolution_chart_is_cached_by_the_points_themselves(monkeypatch):
+    import builtins
+    from datetime import date
+    from backend.reports import charts
+    rendered = []
+    monkeypatch.setattr(charts, "chart_cache", charts.LRUCache())
+    monkeypatch.setattr(charts, "render_evolution_chart", lambda points: rendered.append(points) or repr(points).encode())
+    # Even if every series hashed the same, another series must not get this chart
+    monkeypatch.setattr(builtins, "hash", lambda value: 0)
+    first = [(date(2026, 3, 2), 8.0)]
+    second = [(date(2026, 3, 2), 5.0)]
+
+    assert charts.evolution_chart(1, first) == charts.evolution_chart(1, list(first))
+    assert charts.evolution_chart(1, second) != charts.evolution_chart(1, first)
+    assert rendered == [tuple(first), tuple(second)]
+    assert charts.evolution_chart(1, []) is None
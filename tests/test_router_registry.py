@@ -0,0 +1,4 @@
+from backend.core.router_loader import ROUTER_MODULES, discover_router_modules
+
+def test_registry_matches_routers_directory():
+    assert sorted(ROUTER_MODULES) == discover_router_modules()
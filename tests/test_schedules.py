@@ -0,0 +1,61 @@
+MARCH = {"start_date": "2026-03-01", "end_date": "2026-03-31"}
+
+def _class_with_student(client, teacher, schedule="Segunda 19:00"):
+    class_id = client.post("/classes/", json={"name": "Turma A", "schedule": schedule}, headers=teacher.headers).json()["id"]
+    student_id = client.post("/students/", json={"name": "Ana"}, headers=teacher.headers).json()["id"]
+    client.post(f"/classes/{class_id}/enrollments", json={"student_ids": [student_id]}, headers=teacher.headers)
+    return class_id, student_id
+
+def _sessions(client, teacher, class_id):
+    return client.get(f"/classes/{class_id}/attendance", headers=teacher.headers).json()
+
+def test_generate_skips_existing_dates_and_reports_them(client, teacher):
+    class_id, student_id = _class_with_student(client, teacher)
+    client.post(f"/classes/{class_id}/attendance", json={"date": "2026-03-09", "logs": []}, headers=teacher.headers)
+
+    result = client.post(f"/classes/{class_id}/attendance/generate", json=MARCH, headers=teacher.headers).json()
+
+    assert result["conflicts"] == ["2026-03-09"]
+    assert [(s["date"], s["lesson_number"]) for s in result["created"]] == [
+        ("2026-03-02", 2), ("2026-03-16", 3), ("2026-03-23", 4), ("2026-03-30", 5)
+    ]
+    sessions = _sessions(client, teacher, class_id)
+    assert len(sessions) == 5
+    generated = client.get(f"/attendance-sessions/{result['created'][0]['id']}", headers=teacher.headers).json()
+    assert [(log["student_id"], log["status"]) for log in generated["logs"]] == [(student_id, "present")]
+
+def test_generate_twice_only_reports_conflicts(client, teacher):
+    class_id, _ = _class_with_student(client, teacher)
+    client.post(f"/classes/{class_id}/attendance/generate", json=MARCH, headers=teacher.headers)
+
+    again = client.post(f"/classes/{class_id}/attendance/generate", json=MARCH, headers=teacher.headers).json()
+
+    assert again["created"] == []
+    assert len(again["conflicts"]) == 5
+    assert len(_sessions(client, teacher, class_id)) == 5
+
+def test_dry_run_previews_without_writing(client, teacher):
+    class_id, _ = _class_with_student(client, teacher, schedule="Ter e Qui 18h30")
+
+    preview = client.post(f"/classes/{class_id}/attendance/generate", json={**MARCH, "dry_run": True}, headers=teacher.headers).json()
+
+    assert len(preview["created"]) == 9 # 5 Tuesdays + 4 Thursdays
+    assert all(session["id"] is None for session in preview["created"])
+    assert _sessions(client, teacher, class_id) == []
+
+def test_structured_rules_replace_the_free_text_schedule(client, teacher):
+    class_id, _ = _class_with_student(client, teacher)
+    client.put(f"/classes/{class_id}/schedule", json=[{"weekday": 4, "start_time": "08:00:00"}], headers=teacher.headers)
+
+    result = client.post(f"/classes/{class_id}/attendance/generate", json=MARCH, headers=teacher.headers).json()
+
+    assert [s["date"] for s in result["created"]] == ["2026-03-06", "2026-03-13", "2026-03-20", "2026-03-27"]
+
+def test_generate_validates_range_and_owner(client, teacher, other_teacher):
+    class_id, _ = _class_with_student(client, teacher)
+
+    backwards = client.post(f"/classes/{class_id}/attendance/generate", json={"start_date": "2026-03-31", "end_date": "2026-03-01"}, headers=teacher.headers)
+    too_long = client.post(f"/classes/{class_id}/attendance/generate", json={"start_date": "2026-01-01", "end_date": "2027-06-01"}, headers=teacher.headers)
+    foreign = client.post(f"/classes/{class_id}/attendance/generate", json=MARCH, headers=other_teacher.headers)
+
+    assert [backwards.status_code, too_long.status_code, foreign.status_code] == [400, 400, 403]
@@ -0,0 +1,44 @@
+import pytest
+
+def _observe(client, teacher, observations):
+    """One session with a log per observation; returns the student ids in order."""
+    klass = client.post("/classes/", json={"name": "Turma", "schedule": "Seg 10h"}, headers=teacher.headers).json()
+    logs = []
+    for index, observation in enumerate(observations):
+        student = client.post("/students/", json={"name": f"Aluno {index}"}, headers=teacher.headers).json()
+        logs.append({"student_id": student["id"], "status": "present", "observation": observation})
+    client.post(f"/classes/{klass['id']}/attendance", json={"date": "2026-03-02", "logs": logs}, headers=teacher.headers)
+    return [log["student_id"] for log in logs]
+
+def _search(client, teacher, q):
+    response = client.get("/search/observations", params={"q": q}, headers=teacher.headers)
+    assert response.status_code == 200
+    return response.json()
+
+def test_matches_every_term_as_a_prefix(client, teacher):
+    ids = _observe(client, teacher, ["Entregou a redação atrasada", "Redação excelente", "Faltou"])
+
+    [hit] = _search(client, teacher, "entreg redação")
+
+    assert hit["student_id"] == ids[0]
+    assert hit["snippet"] == "<mark>Entregou</mark> a <mark>redação</mark> atrasada"
+    assert {hit["student_id"] for hit in _search(client, teacher, "redação")} == set(ids[:2])
+
+def test_snippet_escapes_the_observation(client, teacher):
+    _observe(client, teacher, ['Nota <img src=x onerror="alert(1)"> & redação'])
+
+    [hit] = _search(client, teacher, "redação")
+
+    assert "<img" not in hit["snippet"]
+    assert hit["snippet"] == "Nota &lt;img src=x onerror=&quot;alert(1)&quot;&gt; &amp; <mark>redação</mark>"
+
+def test_search_only_sees_the_owners_logs(client, teacher, other_teacher):
+    mine = _observe(client, teacher, ["Participou bem"])
+    _observe(client, other_teacher, ["Participou pouco"])
+
+    assert [hit["student_id"] for hit in _search(client, teacher, "participou")] == mine
+
+@pytest.mark.parametrize("q", ["OR", "\"*:", "NEAR(a b)"])
+def test_query_syntax_is_not_interpreted(client, teacher, q):
+    _observe(client, teacher, ["Participou bem"])
+    assert _search(client, teacher, q) == []
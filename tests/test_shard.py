@@ -0,0 +1,117 @@
+import hashlib
+import os
+from datetime import date
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+from backend.commands import shard
+from backend.core import database
+from backend.models.attendance import AttendanceLog, AttendanceSession
+from backend.models.classes import Class
+from backend.models.enrollments import Enrollment
+from backend.models.payments import Payment
+from backend.models.students import Student
+from backend.models.users import User
+
+def _digest(path):
+    return hashlib.sha256(open(path, "rb").read()).hexdigest()
+
+@pytest.fixture
+def source(tmp_path):
+    """Single-file database of two owners, with payment owners still to backfill."""
+    path = str(tmp_path / "single.db")
+    engine = create_engine(f"sqlite:///{path}")
+    database.Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        for owner_id, name in ((1, "Ana"), (2, "Bia")):
+            db.add(User(id=owner_id, email=f"owner{owner_id}@test.com", hashed_password="x"))
+            db.add(Class(id=owner_id, name=f"Turma {owner_id}", schedule="Seg 10h", owner_id=owner_id))
+            db.add(Student(id=owner_id, name=name, owner_id=owner_id))
+            db.flush()
+            db.add(Enrollment(class_id=owner_id, student_id=owner_id))
+            db.add(AttendanceSession(id=owner_id, class_id=owner_id, owner_id=owner_id, date=date(2026, 3, 2), logs=[
+                AttendanceLog(student_id=owner_id, owner_id=owner_id, status="present")
+            ]))
+            db.add(Payment(student_id=owner_id, year=2026, month=3, amount=100))
+        db.commit()
+    engine.dispose()
+    return path
+
+def _count(engine, model, *where):
+    with engine.connect() as connection:
+        return connection.execute(select(func.count()).select_from(model).where(*where)).scalar()
+
+def test_split_puts_every_row_in_its_owners_shard_and_leaves_the_source_alone(source, tmp_path):
+    target = str(tmp_path / "shards")
+    before = _digest(source)
+
+    owner_ids, copied, left_behind = shard.split(source, target)
+
+    assert owner_ids == [1, 2] and left_behind == {}
+    assert copied["payments"] == copied["enrollments"] == copied["attendance_logs"] == 2
+    assert _digest(source) == before
+    assert sorted(os.listdir(target)) == ["catalog.db", "owner_1.db", "owner_2.db"]
+    catalog = create_engine(f"sqlite:///{database.catalog_path(target)}")
+    assert _count(catalog, User) == 2
+    catalog.dispose()
+    for owner_id in owner_ids:
+        owner = create_engine(f"sqlite:///{database.shard_path(owner_id, target)}")
+        for model in (Class, Student, AttendanceSession, AttendanceLog):
+            assert _count(owner, model) == _count(owner, model, model.owner_id == owner_id) == 1
+        # Backfilled on the way: the source payments had no owner_id
+        assert _count(owner, Payment, Payment.owner_id == owner_id) == 1
+        assert _count(owner, Enrollment, Enrollment.class_id == owner_id) == 1
+        owner.dispose()
+
+def test_split_refuses_a_directory_that_already_holds_a_catalog(source, tmp_path):
+    target = str(tmp_path / "shards")
+    shard.split(source, target)
+
+    with pytest.raises(SystemExit):
+        shard.split(source, target)
+
+@pytest.fixture
+def sharded(source, tmp_path, monkeypatch):
+    target = str(tmp_path / "shards")
+    shard.split(source, target)
+    catalog = database.sqlite_engine(database.catalog_path(target))
+    monkeypatch.setattr(database, "DB_SHARD_DIR", target)
+    monkeypatch.setattr(database, "engine", catalog)
+    monkeypatch.setattr(database, "read_engine", catalog)
+    monkeypatch.setattr(database, "_shard_engines", {})
+    yield target
+    database.dispose_engines()
+
+def test_tenant_session_routes_users_to_the_catalog_and_data_to_the_owners_shard(sharded):
+    db = database.TenantSession()
+    database.bind_tenant(db, 2)
+    try:
+        assert [student.name for student in db.query(Student)] == ["Bia"]
+        assert db.query(User).count() == 2
+        db.add(Student(name="Caio", owner_id=2))
+        db.commit()
+    finally:
+        db.close()
+
+    owner = create_engine(f"sqlite:///{database.shard_path(2, sharded)}")
+    assert _count(owner, Student) == 2
+    owner.dispose()
+
+def test_shard_of_a_new_owner_is_created_on_first_use(sharded):
+    db = database.TenantSession()
+    database.bind_tenant(db, 3)
+    try:
+        assert db.query(Student).count() == 0
+    finally:
+        db.close()
+
+    assert os.path.exists(database.shard_path(3, sharded))
+    assert database.shard_owner_ids() == [1, 2, 3]
+
+def test_tenant_data_needs_a_bound_owner(sharded):
+    db = database.TenantSession()
+    try:
+        with pytest.raises(RuntimeError):
+            db.query(Student).all()
+    finally:
+        db.close()
@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from backend.commands import prune_tombstones
+from backend.core.config import settings
+from backend.models.students import Student
+from backend.models.sync import Tombstone
+
+def _sync(client, teacher, since=None):
+    response = client.get("/sync", params={"since": since} if since else None, headers=teacher.headers)
+    assert response.status_code == 200
+    return response.json()
+
+def _student(client, teacher, name):
+    return client.post("/students/", json={"name": name}, headers=teacher.headers).json()
+
+def test_full_snapshot_is_scoped_to_the_owner(client, teacher, other_teacher):
+    ana = _student(client, teacher, "Ana")
+    _student(client, other_teacher, "Bia")
+    client.post("/classes/", json={"name": "Outra", "schedule": "Seg 10h"}, headers=other_teacher.headers)
+
+    snapshot = _sync(client, teacher)
+
+    assert snapshot["full"] is True and snapshot["deleted"] == []
+    assert [student["id"] for student in snapshot["changes"]["students"]] == [ana["id"]]
+    assert snapshot["changes"]["classes"] == []
+
+def test_incremental_sync_skips_rows_older_than_the_token(client, db, teacher):
+    old = _student(client, teacher, "Ana")
+    db.query(Student).filter(Student.id == old["id"]).update({"updated_at": datetime(2020, 1, 1)}, synchronize_session=False)
+    db.commit()
+    token = _sync(client, teacher)["token"]
+    new = _student(client, teacher, "Bia")
+
+    changes = _sync(client, teacher, since=token)
+
+    assert changes["full"] is False
+    assert [student["id"] for student in changes["changes"]["students"]] == [new["id"]]
+
+def test_deletions_come_back_as_tombstones_for_their_owner_only(client, teacher, other_teacher):
+    ana = _student(client, teacher, "Ana")
+    bia = _student(client, other_teacher, "Bia")
+    klass = client.post("/classes/", json={"name": "Turma", "schedule": "Seg 10h"}, headers=teacher.headers).json()
+    client.post(f"/classes/{klass['id']}/enroll/{ana['id']}", headers=teacher.headers)
+    mine = _sync(client, teacher)["token"]
+    theirs = _sync(client, other_teacher)["token"]
+
+    assert client.delete(f"/students/{ana['id']}", headers=teacher.headers).status_code == 200
+    assert client.delete(f"/students/{bia['id']}", headers=other_teacher.headers).status_code == 200
+
+    assert {row["entity"] for row in _sync(client, teacher, since=mine)["deleted"]} == {"students", "enrollments"}
+    assert {"entity": "students", "entity_id": ana["id"]} in _sync(client, teacher, since=mine)["deleted"]
+    assert _sync(client, other_teacher, since=theirs)["deleted"] == [{"entity": "students", "entity_id": bia["id"]}]
+
+def test_invalid_token_is_rejected(client, teacher):
+    response = client.get("/sync", params={"since": "yesterday"}, headers=teacher.headers)
+    assert response.status_code == 400
+
+def _tombstone(db, owner_id, entity_id, deleted_at):
+    db.add(Tombstone(owner_id=owner_id, entity="students", entity_id=entity_id, deleted_at=deleted_at))
+    db.commit()
+
+def test_pruning_drops_only_tombstones_past_the_retention(db, teacher, other_teacher, monkeypatch):
+    now = db.query(func.now()).scalar()
+    _tombstone(db, teacher.id, 1, now - timedelta(days=40))
+    _tombstone(db, other_teacher.id, 2, now - timedelta(days=31))
+    _tombstone(db, teacher.id, 3, now - timedelta(days=5))
+    monkeypatch.setattr(settings, "SYNC_TOMBSTONE_RETENTION_DAYS", 30)
+
+    assert prune_tombstones.run() == 2
+    assert [row.entity_id for row in db.query(Tombstone)] == [3]
+    assert prune_tombstones.run(days=1) == 1
+
+def test_token_older_than_the_retention_gets_a_full_snapshot(client, db, teacher, monkeypatch):
+    ana = _student(client, teacher, "Ana")
+    monkeypatch.setattr(settings, "SYNC_TOMBSTONE_RETENTION_DAYS", 30)
+    now = db.query(func.now()).scalar()
+
+    recent = _sync(client, teacher, since=(now - timedelta(days=29)).isoformat())
+    expired = _sync(client, teacher, since=(now - timedelta(days=31)).isoformat())
+
+    assert recent["full"] is False
+    assert expired["full"] is True and [student["id"] for student in expired["changes"]["students"]] == [ana["id"]]
+
+def test_pruning_runs_as_a_background_job(monkeypatch):
+    from backend.core import scheduler
+    monkeypatch.setattr(scheduler, "_enabled", True)
+    monkeypatch.setattr(scheduler.PeriodicJob, "start", lambda self: None)
+    monkeypatch.setattr(settings, "SYNC_TOMBSTONE_RETENTION_DAYS", 30)
+    try:
+        scheduler.start_jobs()
+        assert "prune-tombstones" in [job.name for job in scheduler._jobs]
+    finally:
+        scheduler.stop_jobs()